@@ -0,0 +1,316 @@
+"""Packed sessions, idempotent answers, archives and review states
+
+Brings a database created from the original models up to date:
+
+- sessions: multi-deck columns, packed word indices (word_indices is kept,
+  nullable, for rows written before packing), review and grading options,
+  and the version column used by write-backs
+- answers: request_id and response for idempotent submits
+- wrong_stats: per-user partial unique indexes replace the (word, deck_id)
+  constraint
+- new tables session_summaries, session_archives and review_states
+- SQLite: sessions and answers are rebuilt with AUTOINCREMENT so ids of
+  archived sessions are never reused
+
+The server creates missing tables at startup (create_all) but never alters
+existing ones, so every step checks what is already there: the revision
+applies to databases from before it, whether or not the new server has
+already started on them, and is a no-op on databases create_all made
+from the current models.
+
+Revision ID: 3b1f0c9a7d2e
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3b1f0c9a7d2e"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+SESSION_COLUMNS = [
+    ("deck_ids", sa.JSON()),
+    ("deck_offsets", sa.JSON()),
+    ("index_start", sa.Integer()),
+    ("index_count", sa.Integer()),
+    ("index_blob", sa.LargeBinary()),
+    ("is_review", sa.Boolean()),
+    ("max_typo_distance", sa.Integer()),
+    ("retry_wrong", sa.Boolean()),
+]
+
+# Defaults of the new session options, for rows written before them
+SESSION_DEFAULTS = {"is_review": False, "max_typo_distance": 0, "retry_wrong": False}
+
+ANSWER_COLUMNS = [
+    ("request_id", sa.String(length=64)),
+    ("response", sa.JSON()),
+]
+
+
+def _is_sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def _needs_autoincrement(table: str) -> bool:
+    """Whether a SQLite table still lets deleted ids be reused."""
+    if not _is_sqlite():
+        return False
+    sql = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ),
+            {"name": table},
+        )
+        .scalar()
+    )
+    return "AUTOINCREMENT" not in sql.upper()
+
+
+def _batch(table: str, rebuild: bool):
+    """Batch alter; rebuild=True copies a SQLite table to add AUTOINCREMENT."""
+    if rebuild:
+        return op.batch_alter_table(
+            table, recreate="always", table_kwargs={"sqlite_autoincrement": True}
+        )
+    return op.batch_alter_table(table)
+
+
+def upgrade():
+    if context.is_offline_mode():
+        raise RuntimeError(
+            "This revision inspects the schema; run it against a live database"
+        )
+
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "session_summaries" not in tables:
+        op.create_table(
+            "session_summaries",
+            sa.Column("session_id", sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column("deck_name", sa.String(), nullable=False),
+            sa.Column("score", sa.Integer(), nullable=False),
+            sa.Column("total_questions", sa.Integer(), nullable=False),
+            sa.Column("percentage", sa.Float(), nullable=False),
+            sa.Column("wrong_words", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("session_id"),
+        )
+
+    if "session_archives" not in tables:
+        op.create_table(
+            "session_archives",
+            sa.Column("session_id", sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column("deck_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("answer_count", sa.Integer(), nullable=False),
+            sa.Column("payload", sa.LargeBinary(), nullable=False),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column(
+                "archived_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("session_id"),
+        )
+        op.create_index("ix_session_archives_deck_id", "session_archives", ["deck_id"])
+        op.create_index("ix_session_archives_user_id", "session_archives", ["user_id"])
+
+    if "review_states" not in tables:
+        op.create_table(
+            "review_states",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("word_id", sa.Integer(), nullable=False),
+            sa.Column("deck_id", sa.Integer(), nullable=False),
+            sa.Column("repetitions", sa.Integer(), nullable=False),
+            sa.Column("interval_days", sa.Integer(), nullable=False),
+            sa.Column("ease", sa.Float(), nullable=False),
+            sa.Column("due_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("last_reviewed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.ForeignKeyConstraint(["deck_id"], ["decks.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["word_id"], ["words.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("user_id", "word_id", name="unique_user_word_review"),
+        )
+        op.create_index("ix_review_states_id", "review_states", ["id"])
+        op.create_index(
+            "ix_review_states_user_due", "review_states", ["user_id", "due_at"]
+        )
+        op.create_index(
+            "ix_review_states_user_deck_due",
+            "review_states",
+            ["user_id", "deck_id", "due_at"],
+        )
+
+    # sessions
+    existing = {column["name"]: column for column in inspector.get_columns("sessions")}
+    with _batch("sessions", _needs_autoincrement("sessions")) as batch_op:
+        for name, type_ in SESSION_COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+        if "version" not in existing:
+            batch_op.add_column(
+                sa.Column("version", sa.Integer(), server_default="0", nullable=False)
+            )
+        if not existing["word_indices"]["nullable"]:
+            batch_op.alter_column(
+                "word_indices", existing_type=sa.JSON(), nullable=True
+            )
+
+    sessions = sa.table("sessions", *(sa.column(name) for name in SESSION_DEFAULTS))
+    for name, value in SESSION_DEFAULTS.items():
+        op.execute(
+            sessions.update().where(sessions.c[name].is_(None)).values({name: value})
+        )
+
+    if _is_sqlite():
+        # Never hand out the id of a session archived before the rebuild
+        bind = op.get_bind()
+        last_id = bind.execute(
+            sa.text(
+                "SELECT MAX(id) FROM ("
+                " SELECT MAX(id) AS id FROM sessions"
+                " UNION ALL SELECT MAX(session_id) FROM session_archives"
+                " UNION ALL SELECT MAX(session_id) FROM session_summaries"
+                " UNION ALL SELECT MAX(seq) FROM sqlite_sequence WHERE name = 'sessions')"
+            )
+        ).scalar()
+        if last_id is not None:
+            bind.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = 'sessions'"))
+            bind.execute(
+                sa.text(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('sessions', :seq)"
+                ),
+                {"seq": last_id},
+            )
+
+    # answers
+    existing = {column["name"] for column in inspector.get_columns("answers")}
+    constraints = {c["name"] for c in inspector.get_unique_constraints("answers")}
+    with _batch("answers", _needs_autoincrement("answers")) as batch_op:
+        for name, type_ in ANSWER_COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+        if "unique_session_request" not in constraints:
+            batch_op.create_unique_constraint(
+                "unique_session_request", ["session_id", "request_id"]
+            )
+
+    # wrong_stats
+    constraints = {c["name"] for c in inspector.get_unique_constraints("wrong_stats")}
+    if "unique_word_deck" in constraints:
+        with op.batch_alter_table("wrong_stats") as batch_op:
+            batch_op.drop_constraint("unique_word_deck", type_="unique")
+
+    indexes = {
+        index["name"] for index in sa.inspect(op.get_bind()).get_indexes("wrong_stats")
+    }
+    if "unique_word_deck" not in indexes:
+        op.create_index(
+            "unique_word_deck",
+            "wrong_stats",
+            ["word", "deck_id"],
+            unique=True,
+            sqlite_where=sa.text("user_id IS NULL"),
+            postgresql_where=sa.text("user_id IS NULL"),
+        )
+    if "unique_user_word_deck" not in indexes:
+        op.create_index(
+            "unique_user_word_deck",
+            "wrong_stats",
+            ["user_id", "deck_id", "word"],
+            unique=True,
+            sqlite_where=sa.text("user_id IS NOT NULL"),
+            postgresql_where=sa.text("user_id IS NOT NULL"),
+        )
+    if "ix_wrong_stats_user_deck_count" not in indexes:
+        op.create_index(
+            "ix_wrong_stats_user_deck_count",
+            "wrong_stats",
+            ["user_id", "deck_id", "wrong_count"],
+        )
+
+
+def downgrade():
+    """
+    Revert to the original schema.
+
+    Packed word indices are unpacked back into word_indices first. SQLite
+    tables keep AUTOINCREMENT, and anonymous and signed-in wrong counts of
+    the same word must not both exist (the old constraint covers both).
+    """
+    if context.is_offline_mode():
+        raise RuntimeError(
+            "This revision inspects the schema; run it against a live database"
+        )
+
+    from app.core.word_indices import unpack_indices
+
+    bind = op.get_bind()
+    sessions = sa.table(
+        "sessions",
+        sa.column("id"),
+        sa.column("index_start"),
+        sa.column("index_count"),
+        sa.column("index_blob"),
+        sa.column("word_indices", sa.JSON()),
+    )
+    packed = bind.execute(
+        sa.select(
+            sessions.c.id,
+            sessions.c.index_start,
+            sessions.c.index_count,
+            sessions.c.index_blob,
+        ).where(sessions.c.index_count.is_not(None))
+    ).all()
+    for session_id, start, count, blob in packed:
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id == session_id)
+            .values(word_indices=list(unpack_indices(start, count, blob)))
+        )
+
+    op.drop_index("ix_wrong_stats_user_deck_count", table_name="wrong_stats")
+    op.drop_index("unique_user_word_deck", table_name="wrong_stats")
+    op.drop_index("unique_word_deck", table_name="wrong_stats")
+    with op.batch_alter_table("wrong_stats") as batch_op:
+        batch_op.create_unique_constraint("unique_word_deck", ["word", "deck_id"])
+
+    with op.batch_alter_table("answers") as batch_op:
+        batch_op.drop_constraint("unique_session_request", type_="unique")
+        for name, _ in reversed(ANSWER_COLUMNS):
+            batch_op.drop_column(name)
+
+    with op.batch_alter_table("sessions") as batch_op:
+        batch_op.alter_column("word_indices", existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column("version")
+        for name, _ in reversed(SESSION_COLUMNS):
+            batch_op.drop_column(name)
+
+    op.drop_index("ix_review_states_user_deck_due", table_name="review_states")
+    op.drop_index("ix_review_states_user_due", table_name="review_states")
+    op.drop_index("ix_review_states_id", table_name="review_states")
+    op.drop_table("review_states")
+    op.drop_index("ix_session_archives_user_id", table_name="session_archives")
+    op.drop_index("ix_session_archives_deck_id", table_name="session_archives")
+    op.drop_table("session_archives")
+    op.drop_table("session_summaries")
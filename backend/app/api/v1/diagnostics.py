@@ -0,0 +1,18 @@
+"""
+Diagnostics API Router
+"""
+
+from fastapi import APIRouter
+
+from app.core.engine_selection import get_engine_selection
+from app.schemas.diagnostics import EngineDiagnosticsResponse
+
+router = APIRouter()
+
+
+@router.get("/diagnostics/engine", response_model=EngineDiagnosticsResponse)
+async def get_engine_diagnostics():
+    """
+    Report which grading engine this process selected and why.
+    """
+    return get_engine_selection().to_dict()
@@ -2,12 +2,19 @@
 Session API Router
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.core.security import get_current_user, get_current_user_required
 from app.database import get_db
+from app.models.user import User
 from app.schemas.session import (
     SessionStartRequest,
+    WrongOnlySessionRequest,
+    ReviewSessionRequest,
+    MultiDeckSessionRequest,
     SessionResponse,
     PromptResponse,
     SubmitRequest,
@@ -15,6 +22,7 @@ from app.schemas.session import (
     SummaryResponse,
 )
 from app.services.session_service import SessionService
+from app.services.session_state import StaleSessionError
 
 router = APIRouter()
 
@@ -22,14 +30,73 @@ router = APIRouter()
 @router.post("/session/start", response_model=SessionResponse)
 async def start_session(
     request: SessionStartRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user),
 ):
     """
     Start a new quiz session.
     """
     try:
         service = SessionService(db)
-        return service.start_session(request)
+        return service.start_session(request, current_user.id if current_user else None)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start session: {str(e)}")
+
+
+@router.post("/session/start-wrong-only", response_model=SessionResponse)
+async def start_wrong_only_session(
+    request: WrongOnlySessionRequest,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user),
+):
+    """
+    Start a session over the words the current user got wrong in a deck.
+    """
+    try:
+        service = SessionService(db)
+        return service.start_wrong_only_session(
+            request, current_user.id if current_user else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start session: {str(e)}")
+
+
+@router.post("/session/start-multi", response_model=SessionResponse)
+async def start_multi_deck_session(
+    request: MultiDeckSessionRequest,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user),
+):
+    """
+    Start a quiz session over several decks.
+    """
+    try:
+        service = SessionService(db)
+        return service.start_multi_deck_session(
+            request, current_user.id if current_user else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start session: {str(e)}")
+
+
+@router.post("/session/start-review", response_model=SessionResponse)
+async def start_review_session(
+    request: ReviewSessionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_required),
+):
+    """
+    Start a spaced repetition review of the current user's due cards.
+    """
+    try:
+        service = SessionService(db)
+        return service.start_review_session(request, current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -39,14 +106,18 @@ async def start_session(
 @router.get("/session/{session_id}/prompt", response_model=PromptResponse)
 async def get_prompt(
     session_id: int,
+    hint_level: int = Query(0, ge=0, le=4, description="Hint level to include, or 0 for none"),
     db: Session = Depends(get_db)
 ):
     """
-    Get current question for the session.
+    Get current question for the session, with a precomputed hint if requested.
+
+    The highest hint level served for a question counts as its hints used
+    when it is submitted (2 or more forfeit it).
     """
     try:
         service = SessionService(db)
-        return service.get_prompt(session_id)
+        return service.get_prompt(session_id, hint_level)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -57,14 +128,17 @@ async def get_prompt(
 async def submit_answer(
     session_id: int,
     request: SubmitRequest,
+    include_next: bool = Query(False, description="Return the next prompt in the same response"),
     db: Session = Depends(get_db)
 ):
     """
-    Submit answer for current question.
+    Submit answer for current question, optionally with the next prompt.
     """
     try:
         service = SessionService(db)
-        return service.submit_answer(session_id, request)
+        return service.submit_answer(session_id, request, include_next)
+    except StaleSessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -104,7 +178,11 @@ async def get_wrong_words(
             raise ValueError(f"Session {session_id} not found")
 
         service = SessionService(db)
-        wrong_words = service.get_wrong_words(session.deck_id, min_wrong_count=1)
+        wrong_words = []
+        for deck_id in session.deck_ids or [session.deck_id]:
+            wrong_words += service.get_wrong_words(
+                deck_id, min_wrong_count=1, user_id=session.user_id
+            )
 
         return {"wrong_words": wrong_words}
     except ValueError as e:
@@ -25,6 +25,27 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expire_hours: int = 24
 
+    # Grading
+    answer_key_cache_size: int = 4096
+    grading_engine: str = "auto"  # "auto", "python" or "cpp"
+    engine_probe_cases: int = 2000
+
+    # Session state (write-behind; cache size 0 writes through)
+    session_state_cache_size: int = 10000
+    session_flush_interval: float = 5.0
+
+    # Live VocaSessions of retry sessions, per worker
+    session_pool_size: int = 1000
+    session_pool_max_bytes: int = 64 * 1024 * 1024
+
+    # Archival of completed sessions (python -m app.services.archive_service)
+    archive_after_days: int = 90
+    archive_batch_size: int = 500
+
+    # Wrong stats buffer (pending wrong answers before a flush; 0 writes through)
+    wrong_stats_buffer_size: int = 0
+    wrong_stats_flush_interval: float = 5.0
+
     @cached_property
     def cors_origins(self) -> list[str]:
         """Parse comma-separated CORS origins into a list."""
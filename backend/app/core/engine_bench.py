@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+Grading Engine Parity and Microbenchmark Suite
+
+Generates Korean/English answer corpora from docs/words/*.csv, checks that
+every available VocaTestEngine backend grades them identically, and reports
+throughput (ops/sec) and p99 latency per backend.
+
+Also plays identical quizzes through the Python and C++ VocaSession and
+compares their transcripts and sessions/sec.
+
+Run with: python -m app.core.engine_bench [--cases N] [--seed S] [--sessions N]
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core import voca_engine
+from app.core.voca_engine import CppVocaSession, CppVocaTestEngine, VocaTestEngine
+from app.core.voca_session import VocaSession
+
+# docs/words lives at the repository root, next to backend/
+WORDS_DIR = Path(__file__).resolve().parents[3] / "docs" / "words"
+
+# Used when the word lists are not shipped (e.g. in the backend image)
+FALLBACK_WORDS = [
+    ("escape", "탈출하다, 도망가다"),
+    ("abandon", "버리다"),
+    ("achieve", "성취하다, 달성하다"),
+    ("acquire", "얻다, 습득하다"),
+    ("adapt", "적응하다"),
+    ("grow accustomed to", "~에 익숙하다"),
+    ("virtually", "사실상"),
+    ("apple", "apple"),
+]
+
+
+def load_corpus_words(words_dir: Optional[Path] = None) -> list[tuple[str, str]]:
+    """
+    Load (word, meaning) pairs from every CSV in the word list directory.
+
+    Args:
+        words_dir: Directory with CSV files, defaults to docs/words
+
+    Returns:
+        List of (word, meaning) pairs with non-empty meanings
+    """
+    words_dir = Path(words_dir) if words_dir else WORDS_DIR
+    words = []
+
+    for path in sorted(words_dir.glob("*.csv")):
+        raw = path.read_bytes()
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            # A few older lists were saved by Excel in CP949
+            text = raw.decode("cp949", errors="replace")
+
+        for row in csv.reader(io.StringIO(text)):
+            if len(row) < 2:
+                continue
+            word = row[0].strip()
+            meaning = ",".join(row[1:]).strip()
+            if word and meaning:
+                words.append((word, meaning))
+
+    return words or list(FALLBACK_WORDS)
+
+
+# Non-ASCII spaces that mobile keyboards and IMEs type
+UNICODE_SPACES = ["\u00a0", "\u3000", "\u2009", "\u202f", "\u2028"]
+
+# Meanings whose letters have non-ASCII case
+CASED_WORDS = [
+    ("school", "École"),
+    ("street", "Straße"),
+    ("road", "Οδός, ΟΔΟΣ"),
+    ("peace", "Мир"),
+    ("istanbul", "İstanbul"),
+]
+
+
+def _respace(text: str, rng: random.Random, space: str = " ") -> str:
+    """Insert or drop spaces at random positions."""
+    chars = [ch for ch in text if ch != " "]
+    out = []
+    for ch in chars:
+        if rng.random() < 0.2:
+            out.append(space)
+        out.append(ch)
+    return "".join(out)
+
+
+def generate_cases(
+    words: list[tuple[str, str]], size: int = 2000, seed: int = 0
+) -> list[tuple[str, str]]:
+    """
+    Generate (answer, correct) grading cases from a word list.
+
+    Mixes correct answers with cosmetic variations (spacing, including
+    non-ASCII spaces, quotes, case, including non-ASCII letters, several
+    meanings at once) and wrong answers (truncations, other words'
+    meanings, alone or listed with the right one, empty input).
+
+    Args:
+        words: List of (word, meaning) pairs
+        size: Number of cases to generate
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        List of (answer, correct) pairs
+    """
+    rng = random.Random(seed)
+    cases = []
+
+    for _ in range(size):
+        kind = rng.randrange(12)
+        _, correct = rng.choice(CASED_WORDS if kind == 11 else words)
+        meanings = [m.strip() for m in correct.split(",") if m.strip()] or [correct]
+        meaning = rng.choice(meanings)
+
+        if kind == 0:
+            answer = meaning
+        elif kind == 1:
+            answer = _respace(meaning, rng)
+        elif kind == 2:
+            answer = rng.choice(["'", '"']) + meaning + rng.choice(["'", '"', ""])
+        elif kind == 3:
+            answer = meaning.upper() if rng.random() < 0.5 else meaning.swapcase()
+        elif kind == 4:
+            picked = rng.sample(meanings, k=min(len(meanings), rng.randint(1, 2)))
+            answer = ", ".join(picked)
+        elif kind == 5:
+            answer = meaning[: max(0, len(meaning) - 1)]
+        elif kind == 6:
+            answer = rng.choice(words)[1].split(",")[0]
+            if rng.random() < 0.5:
+                answer = ", ".join(rng.sample([answer, meaning], k=2))
+        elif kind == 7:
+            answer = rng.choice(["", " ", ","])
+        elif kind == 8:
+            answer = meaning + rng.choice(["다", "s", "!"])
+        elif kind == 9:
+            answer = "  " + meaning + "\t"
+        elif kind == 10:
+            answer = _respace(meaning, rng, rng.choice(UNICODE_SPACES))
+        else:
+            answer = rng.choice([str.upper, str.lower, str.swapcase, str.casefold])(
+                meaning
+            )
+
+        cases.append((answer, correct))
+
+    return cases
+
+
+def available_engines() -> dict:
+    """Get an instance of every grading backend importable in this process."""
+    engines = {"python": VocaTestEngine()}
+    if CppVocaTestEngine is not None:
+        engines["cpp"] = CppVocaTestEngine()
+    return engines
+
+
+def check_parity(engines: dict, cases: list[tuple[str, str]]) -> list[dict]:
+    """
+    Grade every case with every engine and collect disagreements.
+
+    Args:
+        engines: Mapping of backend name to engine instance
+        cases: List of (answer, correct) pairs
+
+    Returns:
+        List of mismatches, each with the case and the per-engine results
+    """
+    mismatches = []
+    for answer, correct in cases:
+        results = {
+            name: bool(engine.is_correct(answer, correct))
+            for name, engine in engines.items()
+        }
+        if len(set(results.values())) > 1:
+            mismatches.append(
+                {"answer": answer, "correct": correct, "results": results}
+            )
+    return mismatches
+
+
+def benchmark(engine, cases: list[tuple[str, str]], rounds: int = 3) -> dict:
+    """
+    Measure throughput and per-call latency of one engine.
+
+    Args:
+        engine: Engine instance with is_correct
+        cases: List of (answer, correct) pairs
+        rounds: Number of passes over the cases
+
+    Returns:
+        Dict with ops_per_sec, p50_us and p99_us
+    """
+    is_correct = engine.is_correct
+    clock = time.perf_counter_ns
+    samples = []
+
+    # Warm up caches before timing
+    for answer, correct in cases[:100]:
+        is_correct(answer, correct)
+
+    start = clock()
+    for _ in range(rounds):
+        for answer, correct in cases:
+            t0 = clock()
+            is_correct(answer, correct)
+            samples.append(clock() - t0)
+    elapsed = clock() - start
+
+    samples.sort()
+    count = len(samples)
+    return {
+        "ops_per_sec": round(count / (elapsed / 1e9), 1) if elapsed else 0.0,
+        "p50_us": round(samples[count // 2] / 1000, 3) if count else 0.0,
+        "p99_us": round(samples[min(count - 1, int(count * 0.99))] / 1000, 3)
+        if count
+        else 0.0,
+    }
+
+
+def native_benchmark(
+    cases: list[tuple[str, str]], iterations: int = 3
+) -> Optional[dict]:
+    """
+    Time the C++ engine inside C++, without per-call boundary overhead.
+
+    Returns:
+        Dict with ops_per_sec and ns_per_op, or None if voca_cpp isn't built
+    """
+    if not voca_engine.is_using_cpp():
+        return None
+    stats = voca_engine.voca_cpp.bench_is_correct(cases, iterations)
+    return {
+        "ops_per_sec": round(stats["ops_per_sec"], 1),
+        "ns_per_op": round(stats["ns_per_op"], 1),
+    }
+
+
+def available_sessions() -> dict:
+    """Get every VocaSession implementation importable in this process."""
+    sessions = {"python": VocaSession}
+    if CppVocaSession is not None:
+        sessions["cpp"] = CppVocaSession
+    return sessions
+
+
+def play_session(session, words: list[tuple[str, str]]) -> list[str]:
+    """
+    Play one deterministic quiz and record every JSON response.
+
+    Every third question is first answered wrong, so the retry queue and
+    hints are exercised.
+
+    Returns:
+        Transcript of prompts, feedback and the final summary
+    """
+    meanings = dict(words)
+    session.set_words(words)
+    session.start()
+    transcript = []
+    step = 0
+
+    while not session.is_finished():
+        prompt = session.get_prompt_json()
+        transcript.append(prompt)
+        data = json.loads(prompt)
+        if step % 3 == 0 and data["attempt"] == 1:
+            answer = "\x00"
+        else:
+            answer = meanings[data["question_text"]]
+        transcript.append(session.submit_answer(answer))
+        step += 1
+
+    transcript.append(session.summary_json())
+    transcript.append(session.export_wrong_csv())
+    return transcript
+
+
+def play_session_native(session, words: list[tuple[str, str]]) -> list[tuple]:
+    """
+    Play the play_session() quiz through prompt()/submit()/summary().
+
+    Returns:
+        Transcript of the native results as plain tuples
+    """
+    meanings = dict(words)
+    session.set_words(words)
+    session.start()
+    transcript = []
+    step = 0
+
+    while (prompt := session.prompt()) is not None:
+        transcript.append(
+            (
+                prompt.question_id,
+                prompt.question_text,
+                prompt.hint,
+                prompt.attempt,
+                prompt.progress.done,
+                prompt.progress.total,
+            )
+        )
+        if step % 3 == 0 and prompt.attempt == 1:
+            answer = "\x00"
+        else:
+            answer = meanings[prompt.question_text]
+        feedback = session.submit(answer)
+        transcript.append(
+            (
+                feedback.is_correct,
+                feedback.correct_answer,
+                feedback.next_action,
+                feedback.hint_level,
+            )
+        )
+        step += 1
+
+    summary = session.summary()
+    transcript.append((summary.score, summary.total, summary.wrong_count))
+    return transcript
+
+
+def _sessions_per_sec(play, session_class, deck, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        play(session_class(), deck)
+    elapsed = time.perf_counter() - start
+    return round(count / elapsed, 1) if elapsed else 0.0
+
+
+def bench_sessions(words: list[tuple[str, str]], count: int = 50) -> dict:
+    """
+    Compare VocaSession implementations on the same quizzes.
+
+    Args:
+        words: Deck as (word, meaning) pairs
+        count: Number of quizzes to play per implementation
+
+    Returns:
+        Dict with per-implementation sessions_per_sec (JSON and native
+        results) and a parity flag
+    """
+    # Unique words, so (word -> meaning) lookups are unambiguous
+    deck = list(dict(words).items())[:200]
+    results = {}
+    transcripts = {}
+    native_transcripts = {}
+
+    for name, session_class in available_sessions().items():
+        transcripts[name] = play_session(session_class(), deck)
+        native_transcripts[name] = play_session_native(session_class(), deck)
+        results[name] = {
+            "sessions_per_sec": _sessions_per_sec(
+                play_session, session_class, deck, count
+            ),
+            "native_sessions_per_sec": _sessions_per_sec(
+                play_session_native, session_class, deck, count
+            ),
+            "words": len(deck),
+        }
+
+    first = next(iter(transcripts.values()))
+    first_native = next(iter(native_transcripts.values()))
+    return {
+        "parity": all(t == first for t in transcripts.values())
+        and all(t == first_native for t in native_transcripts.values()),
+        "implementations": results,
+    }
+
+
+def run(
+    size: int = 5000,
+    seed: int = 0,
+    rounds: int = 3,
+    words_dir: Optional[Path] = None,
+    sessions: int = 50,
+) -> dict:
+    """
+    Run the parity checks and benchmarks on every available engine.
+
+    Returns:
+        Dict with case count, mismatches, per-engine benchmark results and
+        session benchmark results
+    """
+    words = load_corpus_words(words_dir)
+    cases = generate_cases(words, size=size, seed=seed)
+    engines = available_engines()
+    return {
+        "cases": len(cases),
+        "mismatches": check_parity(engines, cases),
+        "engines": {
+            name: benchmark(engine, cases, rounds) for name, engine in engines.items()
+        },
+        "native": native_benchmark(cases, rounds),
+        "sessions": bench_sessions(words, sessions),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grading engine parity and benchmark")
+    parser.add_argument(
+        "--cases", type=int, default=5000, help="Number of generated cases"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Benchmark passes over the cases"
+    )
+    parser.add_argument(
+        "--words-dir", type=Path, default=None, help="Directory of word CSVs"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=50, help="Quizzes per VocaSession"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.cases, args.seed, args.rounds, args.words_dir, args.sessions)
+
+    print(f"Cases: {report['cases']}")
+    for name, stats in report["engines"].items():
+        print(
+            f"  {name:<8} {stats['ops_per_sec']:>12,.0f} ops/sec"
+            f"   p50 {stats['p50_us']:>8.3f} us   p99 {stats['p99_us']:>8.3f} us"
+        )
+    native = report["native"]
+    if native:
+        print(
+            f"  {'cpp loop':<8} {native['ops_per_sec']:>12,.0f} ops/sec"
+            f"   {native['ns_per_op']:.1f} ns/op inside C++"
+        )
+
+    sessions = report["sessions"]
+    print("Sessions:")
+    for name, stats in sessions["implementations"].items():
+        print(
+            f"  {name:<8} {stats['sessions_per_sec']:>12,.1f} sessions/sec JSON"
+            f"   {stats['native_sessions_per_sec']:>12,.1f} native ({stats['words']} words)"
+        )
+    print(f"  transcripts match: {sessions['parity']}")
+
+    mismatches = report["mismatches"]
+    print(f"Mismatches: {len(mismatches)}")
+    for item in mismatches[:20]:
+        print(f"  {item['answer']!r} vs {item['correct']!r}: {item['results']}")
+
+    return 1 if mismatches or not sessions["parity"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
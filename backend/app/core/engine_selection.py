@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Process-wide Grading Engine Selection
+
+Picks one VocaTestEngine backend at startup: every available backend is
+checked for conformance against the Python reference and probed for
+throughput, and the fastest conforming one wins. The choice can be pinned
+with the GRADING_ENGINE setting ("auto", "python" or "cpp").
+"""
+
+import threading
+from typing import Optional
+
+from app.config import settings
+from app.core import engine_bench
+from app.core.voca_engine import VocaTestEngine
+
+# Cases every backend must grade like the reference, on top of the fuzz corpus
+GOLDEN_CASES = [
+    ("apple", "apple"),
+    ("b,a", "a,b"),
+    (" dog ", '"dog"'),
+    ("cat", "dog"),
+    ("ESCAPE", "escape"),
+    ("탈출 하다", "탈출하다, 도망가다"),
+    ("'도망가다'", "탈출하다,도망가다"),
+    ("나,가", "가"),
+    ("탈출하다,버리다", "탈출하다,도망가다"),
+    ("탈출", "탈출하다"),
+    ("", ""),
+    ("", "버리다,"),
+    ("탈출\u00a0하다", "탈출하다"),
+    ("탈출\u3000하다", "탈출하다"),
+    ("\x1cdog", "dog"),
+    ("ÉCOLE", "école"),
+    ("ΟΔΟΣ", "οδος"),
+    ("İstanbul", "istanbul"),
+    ("STRASSE", "straße"),
+]
+
+
+class _CompiledKeyGrader:
+    """Python grading path as SessionService runs it, with warm answer keys."""
+
+    def __init__(self, engine: VocaTestEngine):
+        self.engine = engine
+        self._keys = {}
+
+    def is_correct(self, answer: str, correct: str) -> bool:
+        key = self._keys.get(correct)
+        if key is None:
+            key = self._keys[correct] = self.engine.compile_answer_key(correct)
+        return self.engine.is_correct_key(answer, key)
+
+
+class EngineSelection:
+    """Outcome of engine selection, reported on the diagnostics endpoint."""
+
+    def __init__(self, name: str, engine, reason: str, override: str, candidates: dict):
+        self.name = name
+        self.engine = engine
+        self.reason = reason
+        self.override = override
+        self.candidates = candidates
+
+    def to_dict(self) -> dict:
+        return {
+            "engine": self.name,
+            "reason": self.reason,
+            "override": self.override,
+            "candidates": self.candidates,
+        }
+
+
+def select_engine(override: str = "auto", probe_cases: int = 2000) -> EngineSelection:
+    """
+    Choose the grading backend for this process.
+
+    Args:
+        override: "auto" to benchmark, or a backend name to pin
+        probe_cases: Number of generated cases for conformance and throughput
+
+    Returns:
+        EngineSelection with the chosen engine and the reason
+    """
+    engines = engine_bench.available_engines()
+    words = engine_bench.load_corpus_words()
+    cases = GOLDEN_CASES + engine_bench.generate_cases(words, size=probe_cases)
+
+    candidates = {}
+    for name, engine in engines.items():
+        if name == "python":
+            conforms = True  # The Python engine is the reference
+            grader = _CompiledKeyGrader(engine)
+        else:
+            conforms = not engine_bench.check_parity(
+                {"python": engines["python"], name: engine}, cases
+            )
+            grader = engine
+        stats = engine_bench.benchmark(grader, cases, rounds=1)
+        candidates[name] = {"conforms": conforms, **stats}
+
+    if override != "auto":
+        if override in engines:
+            note = "" if candidates[override]["conforms"] else " (fails conformance)"
+            return EngineSelection(
+                override,
+                engines[override],
+                f"pinned by GRADING_ENGINE{note}",
+                override,
+                candidates,
+            )
+        reason_prefix = f"GRADING_ENGINE={override} is not available; "
+    else:
+        reason_prefix = ""
+
+    conforming = [name for name, info in candidates.items() if info["conforms"]]
+    name = max(conforming, key=lambda n: candidates[n]["ops_per_sec"])
+
+    if len(engines) == 1:
+        reason = "only backend available"
+    elif len(conforming) == 1:
+        failed = ", ".join(n for n in candidates if n not in conforming)
+        reason = f"{failed} failed conformance"
+    else:
+        reason = f"fastest conforming backend ({candidates[name]['ops_per_sec']:,.0f} ops/sec)"
+
+    return EngineSelection(
+        name, engines[name], reason_prefix + reason, override, candidates
+    )
+
+
+_selection: Optional[EngineSelection] = None
+_selection_lock = threading.Lock()
+
+
+def get_engine_selection() -> EngineSelection:
+    """Get the process-wide engine selection, running it on first use."""
+    global _selection
+    if _selection is None:
+        with _selection_lock:
+            if _selection is None:
+                _selection = select_engine(
+                    settings.grading_engine, settings.engine_probe_cases
+                )
+                print(f"Grading engine: {_selection.name} ({_selection.reason})")
+    return _selection
+
+
+def get_grading_engine():
+    """Get the process-wide grading engine instance."""
+    return get_engine_selection().engine
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Progressive Hint Ladders
+
+Builds the hints shown after 1, 2, 3 and 4+ wrong attempts in one pass
+over the meaning, so they can be cached per word and served by lookup.
+Matches VocaSession::buildHintLadder_ (src/voca_session.cpp).
+"""
+
+from functools import lru_cache
+
+HINT_LEVELS = 4
+
+_HINT_SKIP = frozenset(", \t\n\r")
+
+
+def _strip_quotes(text: str) -> str:
+    """Remove a surrounding or dangling double quote."""
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1]
+    if text.startswith('"'):
+        return text[1:]
+    if text.endswith('"'):
+        return text[:-1]
+    return text
+
+
+def build_hint_ladder(correct: str) -> tuple[str, str, str, str]:
+    """
+    Build every hint level for a meaning.
+
+    Args:
+        correct: Correct answer(s)
+
+    Returns:
+        Hints for 1, 2, 3 and 4+ wrong attempts
+    """
+    hint = _strip_quotes(correct)
+    letters = [ch for ch in hint if ch not in _HINT_SKIP]
+    length = len(letters)
+    if length == 0:
+        return ("Hint: (no letters)",) * HINT_LEVELS
+
+    reveal = min(2, length - 1)
+    return (
+        f"Hint: {'_' * length} ({length} 글자)",
+        "Hint: " + letters[0] + "_" * (length - 1),
+        "Hint: " + "".join(letters[:reveal]) + "_" * (length - reveal),
+        f"Hint: {hint} (type it again)",
+    )
+
+
+@lru_cache(maxsize=4096)
+def hint_ladder(correct: str) -> tuple[str, str, str, str]:
+    """Memoized build_hint_ladder, for callers without a deck-level cache."""
+    return build_hint_ladder(correct)
+
+
+def make_hint(correct: str, wrong_count: int) -> str:
+    """
+    Get the progressive hint shown after wrong attempts.
+
+    Args:
+        correct: Correct answer(s)
+        wrong_count: Number of wrong attempts so far (1-4+)
+
+    Returns:
+        Hint text
+    """
+    level = wrong_count if 1 <= wrong_count < HINT_LEVELS else HINT_LEVELS
+    return hint_ladder(correct)[level - 1]
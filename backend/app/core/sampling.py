@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Word Sampling for Short Sessions
+
+Picks k word indices without materializing the deck: uniform samples come
+straight from the index range, weighted samples stream (index, weight)
+pairs through a k-sized heap using Efraimidis-Spirakis reservoir sampling
+(each item keyed by u ** (1 / weight), keeping the k largest keys).
+"""
+
+import heapq
+import math
+import random
+from typing import Iterable, Sequence
+
+
+def sample_indices(
+    indices: Sequence[int], k: int, rng: random.Random = None
+) -> list[int]:
+    """
+    Draw k indices uniformly without replacement.
+
+    Args:
+        indices: Candidate indices, e.g. range(word_count)
+        k: Sample size; all indices (shuffled) if larger
+        rng: Random source (defaults to the random module)
+
+    Returns:
+        Sampled indices in random order
+    """
+    rng = rng or random
+    return rng.sample(indices, min(k, len(indices)))
+
+
+def weighted_sample(
+    items: Iterable[tuple[int, float]], k: int, rng: random.Random = None
+) -> list[int]:
+    """
+    Draw k indices without replacement, each with probability proportional
+    to its weight, in one pass with O(k) memory.
+
+    Args:
+        items: (index, weight) pairs; weights must be positive
+        k: Sample size
+        rng: Random source (defaults to the random module)
+
+    Returns:
+        Sampled indices, heaviest keys (most likely picks) first
+    """
+    rng = rng or random
+    heap: list[tuple[float, int]] = []
+    for index, weight in items:
+        # log(u) / w orders items like u ** (1 / w) without underflow
+        key = math.log(1.0 - rng.random()) / weight
+        if len(heap) < k:
+            heapq.heappush(heap, (key, index))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, index))
+    return [index for _, index in sorted(heap, reverse=True)]
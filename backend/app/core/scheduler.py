@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+SM-2 Spaced Repetition Scheduling
+
+Computes the next review interval of a card from how well it was just
+recalled, following SuperMemo's SM-2: intervals of 1 and 6 days for the
+first two successful reviews, then the previous interval times the ease
+factor (rounded half up), which drifts with answer quality and never drops
+below 1.3. A failed card starts over with its ease unchanged.
+
+SessionService mirrors next_schedule in SQL to update review state in one
+statement; keep the two in step.
+"""
+
+from typing import NamedTuple
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# Intervals after the first and second successful review, in days
+FIRST_INTERVAL = 1
+SECOND_INTERVAL = 6
+
+# Answer quality on SM-2's 0-5 scale; below PASSING_QUALITY the card restarts
+PERFECT = 5
+TYPO = 4
+HINTED = 3
+WRONG = 1
+PASSING_QUALITY = 3
+
+
+class ReviewSchedule(NamedTuple):
+    repetitions: int
+    interval_days: int
+    ease: float
+
+
+def answer_quality(is_correct: bool, is_typo: bool = False, hint_used: int = 0) -> int:
+    """
+    Rate an answer on the SM-2 quality scale.
+
+    Args:
+        is_correct: Whether the answer was accepted
+        is_typo: Accepted only as a near-miss
+        hint_used: Number of hints shown for the question
+
+    Returns:
+        Quality from 0 (blackout) to 5 (perfect)
+    """
+    if not is_correct:
+        return WRONG
+    if hint_used:
+        return HINTED
+    if is_typo:
+        return TYPO
+    return PERFECT
+
+
+def ease_change(quality: int) -> float:
+    """Change of the ease factor after a passing answer of this quality."""
+    return 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+
+
+def next_schedule(
+    repetitions: int, interval_days: int, ease: float, quality: int
+) -> ReviewSchedule:
+    """
+    Schedule a card after a review.
+
+    Args:
+        repetitions: Successful reviews in a row so far
+        interval_days: Current interval
+        ease: Current ease factor
+        quality: Answer quality (0-5)
+
+    Returns:
+        New repetitions, interval in days and ease factor
+    """
+    if quality < PASSING_QUALITY:
+        return ReviewSchedule(0, FIRST_INTERVAL, ease)
+
+    ease = max(MIN_EASE, ease + ease_change(quality))
+    repetitions += 1
+    if repetitions == 1:
+        interval_days = FIRST_INTERVAL
+    elif repetitions == 2:
+        interval_days = SECOND_INTERVAL
+    else:
+        interval_days = max(1, int(interval_days * ease + 0.5))
+    return ReviewSchedule(repetitions, interval_days, ease)
@@ -7,12 +7,23 @@ If pybind11 bindings are not available, it falls back to a pure Python implement
 """
 
 import re
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.core.hangul import BitPattern, decompose
+from app.core.hints import build_hint_ladder
+
+# Whitespace and quote characters ignored when comparing answers
+_NORMALIZE_PATTERN = re.compile(r'[\s\'""]')
+_FINAL_SIGMA = "ς"
 
 
 class VocaTestEngine:
     """
     Test engine for vocabulary quiz.
-    Implements the same logic as C++ VocaTestEngine.
+    Implements the same logic as C++ VocaTestEngine
+    (checked by app.core.engine_bench).
     """
 
     @staticmethod
@@ -27,13 +38,74 @@ class VocaTestEngine:
             Normalized text
         """
         # Remove spaces and quotes, convert to lowercase
-        normalized = re.sub(r'[\s\'""]', "", text)
-        return normalized.lower()
+        normalized = _NORMALIZE_PATTERN.sub("", text).lower()
+        # lower() picks the final sigma by context; fold it so the C++
+        # engine's per-character tables (src/unicode_tables.inc) agree
+        if _FINAL_SIGMA in normalized:
+            normalized = normalized.replace(_FINAL_SIGMA, "σ")
+        return normalized
+
+    def split_normalized(self, text: str) -> list[str]:
+        """
+        Split comma-separated text into normalized, non-empty parts.
+
+        Args:
+            text: Comma-separated text
+
+        Returns:
+            Normalized parts, or [""] if every part is empty
+        """
+        normalize = self.normalize
+        parts = [p for p in (normalize(m) for m in text.split(",")) if p]
+        return parts or [""]
+
+    def compile_answer_key(self, correct: str) -> frozenset:
+        """
+        Precompute the set of normalized meanings for a correct answer.
+
+        Args:
+            correct: Correct answer(s), comma-separated
+
+        Returns:
+            Frozenset of normalized meanings
+        """
+        return frozenset(self.split_normalized(correct))
+
+    def is_correct_key(self, answer: str, key: frozenset) -> bool:
+        """
+        Check an answer against a key built by compile_answer_key.
+
+        Args:
+            answer: User's answer
+            key: Compiled answer key
+
+        Returns:
+            True if answer is correct, False otherwise
+        """
+        if "," not in answer:
+            return self.normalize(answer) in key
+        return all(part in key for part in self.split_normalized(answer))
+
+    def grade_many(self, pairs) -> bytearray:
+        """
+        Grade many (answer, correct) pairs in one call.
+
+        Args:
+            pairs: Iterable of (answer, correct) tuples
+
+        Returns:
+            Bytearray with 1 for each correct answer and 0 otherwise
+        """
+        is_correct = self.is_correct
+        return bytearray(is_correct(answer, correct) for answer, correct in pairs)
 
     def is_correct(self, answer: str, correct: str) -> bool:
         """
         Check if the answer is correct.
-        Supports comma-separated multiple correct answers.
+
+        Both sides are split on commas; the answer is correct if every one
+        of its parts matches a correct meaning after normalization, so
+        listing guesses never helps.
 
         Args:
             answer: User's answer
@@ -42,17 +114,190 @@ class VocaTestEngine:
         Returns:
             True if answer is correct, False otherwise
         """
-        norm_answer = self.normalize(answer)
+        return self.is_correct_key(answer, self.compile_answer_key(correct))
+
+    def compile_fuzzy_key(self, correct: str) -> tuple:
+        """
+        Precompute bit-parallel patterns for typo-tolerant grading.
+
+        Args:
+            correct: Correct answer(s), comma-separated
+
+        Returns:
+            Tuple of BitPattern, one per jamo-decomposed meaning
+        """
+        return tuple(
+            BitPattern(decompose(m)) for m in self.split_normalized(correct) if m
+        )
+
+    def is_close_key(self, answer: str, fuzzy_key: tuple, max_distance: int) -> bool:
+        """
+        Check if an answer is within max_distance jamo edits of a meaning.
+
+        A near-miss must still get most of the meaning right: the distance
+        has to be less than half the meaning's jamo length. Every part of a
+        comma-separated answer must be close to (or match) some meaning.
+
+        Args:
+            answer: User's answer
+            fuzzy_key: Patterns built by compile_fuzzy_key
+            max_distance: Largest accepted edit distance
+
+        Returns:
+            True if every answer part is close enough to some meaning
+        """
+        if max_distance <= 0:
+            return False
+        for part in self.split_normalized(answer):
+            if not part:
+                return False
+            text = decompose(part)
+            for pattern in fuzzy_key:
+                limit = max(min(max_distance, (pattern.length - 1) // 2), 0)
+                if pattern.distance(text, limit) <= limit:
+                    break
+            else:
+                return False
+        return True
+
+    def is_close(self, answer: str, correct: str, max_distance: int) -> bool:
+        """
+        Check if the answer is correct or a near-miss of a correct meaning.
+
+        Args:
+            answer: User's answer
+            correct: Correct answer(s), comma-separated
+            max_distance: Largest accepted edit distance, in jamo
+
+        Returns:
+            True if answer is correct or within the distance
+        """
+        return self.is_correct(answer, correct) or self.is_close_key(
+            answer, self.compile_fuzzy_key(correct), max_distance
+        )
+
+
+class _AnswerKeyEntry:
+    """Compiled keys of one word; fuzzy key and hints are built on first use."""
+
+    __slots__ = ("correct", "key", "fuzzy", "hints")
+
+    def __init__(self, correct: str, key: frozenset):
+        self.correct = correct
+        self.key = key
+        self.fuzzy = None
+        self.hints = None
+
+
+class AnswerKeyCache:
+    """
+    Bounded LRU of compiled answer keys.
+
+    Entries are keyed by (word id, deck version) and remember the meaning
+    they were compiled from, so a reused word id never serves a stale key.
+    """
+
+    def __init__(self, engine: Optional[VocaTestEngine] = None, maxsize: int = 4096):
+        self.engine = engine or VocaTestEngine()
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(
+        self, word_id: int, deck_version: Hashable, correct: str
+    ) -> _AnswerKeyEntry:
+        cache_key = (word_id, deck_version)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.correct == correct:
+                self._entries.move_to_end(cache_key)
+                return entry
+
+        entry = _AnswerKeyEntry(correct, self.engine.compile_answer_key(correct))
+
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def get(self, word_id: int, deck_version: Hashable, correct: str) -> frozenset:
+        """
+        Get the compiled key for a word, compiling it on a miss.
+
+        Args:
+            word_id: Word ID
+            deck_version: Token that changes whenever the deck is modified
+            correct: Correct answer(s), comma-separated
+
+        Returns:
+            Compiled answer key
+        """
+        return self._entry(word_id, deck_version, correct).key
 
-        # Split by comma for multiple correct answers
-        meanings = [m.strip() for m in correct.split(",")]
+    def get_fuzzy(self, word_id: int, deck_version: Hashable, correct: str) -> tuple:
+        """Get the typo-tolerant key for a word, compiling it on a miss."""
+        entry = self._entry(word_id, deck_version, correct)
+        if entry.fuzzy is None:
+            entry.fuzzy = self.engine.compile_fuzzy_key(correct)
+        return entry.fuzzy
 
-        # Check if any normalized meaning matches the normalized answer
-        for meaning in meanings:
-            if self.normalize(meaning) == norm_answer:
-                return True
+    def get_hints(self, word_id: int, deck_version: Hashable, correct: str) -> tuple:
+        """Get the hint ladder (levels 1-4) for a word, building it on a miss."""
+        entry = self._entry(word_id, deck_version, correct)
+        if entry.hints is None:
+            entry.hints = build_hint_ladder(correct)
+        return entry.hints
 
-        return False
+    def is_correct(
+        self, word_id: int, deck_version: Hashable, answer: str, correct: str
+    ) -> bool:
+        """Grade an answer using the cached key for a word."""
+        return self.engine.is_correct_key(
+            answer, self.get(word_id, deck_version, correct)
+        )
+
+    def is_close(
+        self,
+        word_id: int,
+        deck_version: Hashable,
+        answer: str,
+        correct: str,
+        max_distance: int,
+    ) -> bool:
+        """Check for a near-miss using the cached typo-tolerant key for a word."""
+        fuzzy = self.get_fuzzy(word_id, deck_version, correct)
+        return self.engine.is_close_key(answer, fuzzy, max_distance)
+
+    def warm(
+        self, words, deck_version: Hashable, fuzzy: bool = False, hints: bool = False
+    ):
+        """
+        Precompile keys for a whole deck.
+
+        Args:
+            words: Iterable of (word id, correct) pairs
+            deck_version: Deck version token
+            fuzzy: Also build typo-tolerant keys
+            hints: Also build hint ladders
+        """
+        for word_id, correct in words:
+            if fuzzy:
+                self.get_fuzzy(word_id, deck_version, correct)
+            if hints:
+                self.get_hints(word_id, deck_version, correct)
+            if not fuzzy and not hints:
+                self.get(word_id, deck_version, correct)
+
+    def clear(self):
+        """Drop all compiled keys."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class VocaRepository:
@@ -115,5 +360,23 @@ def get_session():
     """Get the appropriate session class (C++ or Python fallback)."""
     if _USING_CPP:
         return CppVocaSession()
-    # Python fallback would need a VocaSession implementation
-    raise NotImplementedError("Python VocaSession fallback not implemented")
+    from app.core.voca_session import VocaSession
+
+    return VocaSession()
+
+
+def load_csv_bytes(data):
+    """
+    Parse an uploaded CSV deck for get_session().set_repository().
+
+    Uses the C++ loader when available, so the rows never become Python
+    objects; otherwise parses in Python with the same rules.
+
+    Returns:
+        Tuple of (repository, row count)
+    """
+    if _USING_CPP:
+        return voca_cpp.load_csv_bytes(data)
+    from app.core.voca_session import load_csv_bytes as parse_csv_bytes
+
+    return parse_csv_bytes(data)
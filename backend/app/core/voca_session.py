@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Pure-Python VocaSession Fallback
+
+Mirrors voca::VocaSession (src/voca_session.cpp) for deployments where the
+voca_cpp extension isn't built: same API, same retry queue and progressive
+hints, byte-identical JSON output and interchangeable snapshots.
+"""
+
+from collections import deque
+from typing import NamedTuple, Optional
+
+from app.core.hints import make_hint
+from app.core.voca_engine import VocaTestEngine
+
+_JSON_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+# Snapshot header, see VocaSession::snapshot in src/voca_session.cpp
+_SNAPSHOT_MAGIC = b"VSS\x01"
+
+
+class SessionProgress(NamedTuple):
+    done: int
+    total: int
+
+
+class SessionPrompt(NamedTuple):
+    question_id: str
+    question_text: str
+    direction: str
+    hint: str
+    attempt: int
+    progress: SessionProgress
+
+
+class SessionFeedback(NamedTuple):
+    is_correct: bool
+    correct_answer: str
+    next_action: str
+    hint_level: int
+
+
+class SessionSummary(NamedTuple):
+    score: int
+    total: int
+    wrong_count: int
+
+
+_FINISHED_FEEDBACK = SessionFeedback(True, "", "show_summary", 0)
+
+
+def _escape_json(text: str) -> str:
+    """Escape a string the way VocaSession::escapeJson_ does."""
+    return "".join(_JSON_ESCAPES.get(ch, ch) for ch in text)
+
+
+def _put_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_string(out: bytearray, text: str):
+    data = text.encode("utf-8")
+    _put_varint(out, len(data))
+    out += data
+
+
+class _SnapshotReader:
+    """Decoder for the snapshot format; raises ValueError on bad input."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def take(self, n: int) -> bytes:
+        if n > len(self.data) - self.pos:
+            raise ValueError("invalid snapshot: truncated")
+        chunk = self.data[self.pos : self.pos + n]
+        self.pos += n
+        return chunk
+
+    def varint(self) -> int:
+        value = 0
+        for shift in range(0, 64, 7):
+            byte = self.take(1)[0]
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+        raise ValueError("invalid snapshot: varint too long")
+
+    def integer(self) -> int:
+        value = self.varint()
+        if value > 0x7FFFFFFF:
+            raise ValueError("invalid snapshot: integer out of range")
+        return value
+
+    def string(self) -> str:
+        return self.take(self.varint()).decode("utf-8")
+
+    def flag(self) -> bool:
+        return self.take(1) != b"\x00"
+
+
+def load_csv_bytes(data) -> tuple[list[tuple[str, str]], int]:
+    """
+    Parse CSV bytes with the rules of VocaLoader::loadCSV.
+
+    Lines without a comma are skipped; the word and the rest of the line
+    each lose one pair of surrounding double quotes.
+
+    Args:
+        data: CSV as bytes, bytearray or memoryview (UTF-8)
+
+    Returns:
+        Tuple of (list of (word, meaning) pairs, row count)
+    """
+    words = []
+    for line in bytes(data).split(b"\n"):
+        word, sep, correct = line.partition(b",")
+        if not sep:
+            continue
+        words.append(
+            (_strip_pair(word).decode("utf-8"), _strip_pair(correct).decode("utf-8"))
+        )
+    return words, len(words)
+
+
+def _strip_pair(field: bytes) -> bytes:
+    if len(field) >= 2 and field[:1] == b'"' and field[-1:] == b'"':
+        return field[1:-1]
+    return field
+
+
+class VocaSession:
+    """
+    Quiz session with a retry queue and progressive hints.
+
+    Wrong answers are retried immediately and counted once per word;
+    wrong counts live in a dict keyed by (word, correct) instead of the
+    C++ linear scan over VocaResult.
+    """
+
+    __slots__ = (
+        "_words",
+        "_main_queue",
+        "_retry_queue",
+        "_wrong_counts",
+        "_score",
+        "_answered",
+        "_total",
+        "_current",
+        "_engine",
+    )
+
+    def __init__(self):
+        self._words = []
+        self._main_queue = deque()
+        self._retry_queue = deque()
+        self._wrong_counts = {}
+        self._score = 0
+        self._answered = 0  # First attempts, as counted by VocaResult::total
+        self._total = 0
+        self._current = None  # (word, correct, question_id, from_retry)
+        self._engine = VocaTestEngine()
+
+    def set_words(self, words):
+        """Set words as list of (word, meaning) pairs."""
+        self._words = [(word, meaning) for word, meaning in words]
+
+    def set_repository(self, repository):
+        """Set words from load_csv_bytes() output."""
+        self.set_words(repository)
+
+    def start(self):
+        """Start quiz with all words in order."""
+        self.start_indices(range(len(self._words)))
+
+    def start_indices(self, indices):
+        """Start quiz with specific word indices."""
+        count = len(self._words)
+        self._main_queue = deque(i for i in indices if 0 <= i < count)
+        self._retry_queue.clear()
+        self._wrong_counts.clear()
+        self._score = 0
+        self._answered = 0
+        self._current = None
+        self._total = len(self._main_queue)
+
+    def prompt(self) -> Optional[SessionPrompt]:
+        """Get current question, or None when the quiz is finished."""
+        current = self._ensure_current()
+        if current is None:
+            return None
+
+        word, correct, question_id, _ = current
+        wrong_count = self._wrong_counts.get((word, correct), 0)
+        return SessionPrompt(
+            question_id=question_id,
+            question_text=word,
+            direction="en_to_kr",
+            hint=make_hint(correct, wrong_count) if wrong_count > 0 else "",
+            attempt=wrong_count + 1,
+            progress=SessionProgress(self._score, self._total),
+        )
+
+    def submit(self, answer: str) -> SessionFeedback:
+        """Submit answer and get the feedback."""
+        current = self._ensure_current()
+        if current is None:
+            return _FINISHED_FEEDBACK
+
+        word, correct, _, from_retry = current
+        key = (word, correct)
+        wrong_count = self._wrong_counts.get(key, 0)
+        self._current = None
+
+        if not from_retry:
+            self._answered += 1
+
+        if not self._engine.is_correct(answer, correct):
+            next_count = wrong_count + 1
+            self._wrong_counts[key] = next_count
+            self._retry_queue.appendleft(key)
+            return SessionFeedback(False, correct, "retry_same", min(next_count, 4))
+
+        if not from_retry:
+            self._score += 1
+
+        next_action = (
+            "next_question" if self._main_queue or self._retry_queue else "show_summary"
+        )
+        return SessionFeedback(True, correct, next_action, wrong_count)
+
+    def summary(self) -> SessionSummary:
+        """Get session summary."""
+        return SessionSummary(self._score, self._total, len(self._wrong_counts))
+
+    def get_prompt_json(self) -> str:
+        """Get current question as JSON string."""
+        prompt = self.prompt()
+        if prompt is None:
+            return self.summary_json()
+
+        return (
+            f'{{"question_id":"{_escape_json(prompt.question_id)}",'
+            f'"question_text":"{_escape_json(prompt.question_text)}",'
+            f'"direction":"{prompt.direction}",'
+            f'"hint":"{_escape_json(prompt.hint)}",'
+            f'"attempt":{prompt.attempt},'
+            f'"progress":{{"done":{prompt.progress.done},"total":{prompt.progress.total}}}}}'
+        )
+
+    def submit_answer(self, answer: str) -> str:
+        """Submit answer and get result as JSON string."""
+        feedback = self.submit(answer)
+        return (
+            f'{{"is_correct":{"true" if feedback.is_correct else "false"},'
+            f'"correct_answer":"{_escape_json(feedback.correct_answer)}",'
+            f'"next_action":"{feedback.next_action}",'
+            f'"hint_level":{feedback.hint_level}}}'
+        )
+
+    def summary_json(self) -> str:
+        """Get session summary as JSON string."""
+        summary = self.summary()
+        return (
+            f'{{"score":{summary.score},"total":{summary.total},'
+            f'"wrong_count":{summary.wrong_count}}}'
+        )
+
+    def export_wrong_csv(self) -> str:
+        """Export wrong answers as CSV string."""
+        return "".join(f"{word},{correct}\n" for word, correct in self._wrong_counts)
+
+    def is_finished(self) -> bool:
+        """Check if quiz is finished."""
+        return self._current is None and not self._main_queue and not self._retry_queue
+
+    def snapshot(self) -> bytes:
+        """Serialize the full session state to compact bytes."""
+        out = bytearray(_SNAPSHOT_MAGIC)
+
+        _put_varint(out, len(self._words))
+        for word, meaning in self._words:
+            _put_string(out, word)
+            _put_string(out, meaning)
+
+        _put_varint(out, len(self._main_queue))
+        for idx in self._main_queue:
+            _put_varint(out, idx)
+
+        _put_varint(out, len(self._retry_queue))
+        for word, correct in self._retry_queue:
+            _put_string(out, word)
+            _put_string(out, correct)
+
+        _put_varint(out, self._score)
+        _put_varint(out, self._answered)
+        _put_varint(out, len(self._wrong_counts))
+        for (word, correct), count in self._wrong_counts.items():
+            _put_string(out, word)
+            _put_string(out, correct)
+            _put_varint(out, count)
+
+        _put_varint(out, self._total)
+
+        if self._current is None:
+            out.append(0)
+        else:
+            word, correct, question_id, from_retry = self._current
+            out.append(1)
+            _put_string(out, word)
+            _put_string(out, correct)
+            _put_string(out, question_id)
+            out.append(1 if from_retry else 0)
+
+        return bytes(out)
+
+    @classmethod
+    def restore(cls, data: bytes) -> "VocaSession":
+        """
+        Rebuild a session from snapshot() bytes.
+
+        Raises:
+            ValueError: If the snapshot is malformed
+        """
+        reader = _SnapshotReader(bytes(data))
+        if reader.take(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+            raise ValueError("invalid snapshot: bad header")
+
+        session = cls()
+        session._words = [
+            (reader.string(), reader.string()) for _ in range(reader.varint())
+        ]
+
+        for _ in range(reader.varint()):
+            idx = reader.integer()
+            if idx >= len(session._words):
+                raise ValueError("invalid snapshot: word index out of range")
+            session._main_queue.append(idx)
+
+        for _ in range(reader.varint()):
+            session._retry_queue.append((reader.string(), reader.string()))
+
+        session._score = reader.integer()
+        session._answered = reader.integer()
+        for _ in range(reader.varint()):
+            key = (reader.string(), reader.string())
+            session._wrong_counts[key] = reader.integer()
+
+        session._total = reader.integer()
+
+        if reader.flag():
+            session._current = (
+                reader.string(),
+                reader.string(),
+                reader.string(),
+                reader.flag(),
+            )
+
+        if reader.pos != len(reader.data):
+            raise ValueError("invalid snapshot: trailing data")
+
+        return session
+
+    def _ensure_current(self):
+        if self._current is not None:
+            return self._current
+
+        if self._retry_queue:
+            word, correct = self._retry_queue.popleft()
+            self._current = (word, correct, word, True)
+        elif self._main_queue:
+            idx = self._main_queue.popleft()
+            word, correct = self._words[idx]
+            self._current = (word, correct, str(idx), False)
+
+        return self._current
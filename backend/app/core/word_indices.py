@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Compact Session Word Indices
+
+A session's word indices are stored either as a range (start, count) when
+they are contiguous, which covers every "all words" session, or as packed
+little-endian int32 otherwise. Both decode to a sequence with O(1) indexing
+that never materializes the whole list.
+
+Sessions over several decks number their words in one virtual index, the
+decks laid end to end; locate_index maps it back to a deck and a word.
+"""
+
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Optional, Sequence
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def pack_indices(indices: Sequence[int]) -> tuple[Optional[int], int, Optional[bytes]]:
+    """
+    Encode word indices compactly.
+
+    Args:
+        indices: Word indices in quiz order
+
+    Returns:
+        Tuple of (range start, count, packed blob); the start is None when
+        the indices aren't contiguous and the blob is None when they are
+    """
+    count = len(indices)
+    if isinstance(indices, range) and indices.step == 1:
+        return indices.start, count, None
+
+    start = indices[0] if count else 0
+    if all(value == start + i for i, value in enumerate(indices)):
+        return start, count, None
+
+    packed = array("i", indices)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return None, count, packed.tobytes()
+
+
+def unpack_indices(
+    start: Optional[int], count: int, blob: Optional[bytes]
+) -> Sequence[int]:
+    """
+    Decode indices stored by pack_indices without copying them into a list.
+
+    Returns:
+        A range or an int32 view supporting len() and O(1) indexing
+    """
+    if blob is None:
+        return range(start or 0, (start or 0) + count)
+
+    if _LITTLE_ENDIAN:
+        return memoryview(blob).cast("i")
+    packed = array("i", blob)
+    packed.byteswap()
+    return packed
+
+
+def locate_index(deck_offsets: Sequence[int], index: int) -> tuple[int, int]:
+    """
+    Map a virtual index of a multi-deck session to its deck.
+
+    Args:
+        deck_offsets: First virtual index of each deck, ascending from 0
+        index: Virtual word index
+
+    Returns:
+        Tuple of (deck position in the session, index_in_deck)
+    """
+    slot = bisect_right(deck_offsets, index) - 1
+    return slot, index - deck_offsets[slot]
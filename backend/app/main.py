@@ -1,18 +1,41 @@
 # -*- coding: utf-8 -*-
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.core.engine_selection import get_engine_selection
+from app.database import engine, Base, SessionLocal
+from app.services.session_state import session_state_cache
+from app.services.wrong_stats_buffer import wrong_stats_buffer
 
 # Import all models before create_all so tables are registered
-from app.models import user, deck, session, cache, wrong_stats  # noqa: F401
+from app.models import user, deck, session, cache, wrong_stats, review  # noqa: F401
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick the grading engine once per process before serving requests
+    get_engine_selection()
+    yield
+    # Write back session state and wrong counts still held in memory
+    db = SessionLocal()
+    try:
+        written = session_state_cache.flush(db)
+        written += wrong_stats_buffer.flush(db)
+        if written:
+            db.commit()
+    finally:
+        db.close()
+
+
 app = FastAPI(
     title=settings.app_name,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -36,10 +59,11 @@ async def health_check():
 
 
 # Import and include routers
-from app.api.v1 import tts, image, session, decks, auth
+from app.api.v1 import tts, image, session, decks, auth, diagnostics
 
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(tts.router, prefix="/api/v1", tags=["tts"])
 app.include_router(image.router, prefix="/api/v1", tags=["image"])
 app.include_router(session.router, prefix="/api/v1", tags=["session"])
 app.include_router(decks.router, prefix="/api/v1", tags=["decks"])
+app.include_router(diagnostics.router, prefix="/api/v1", tags=["diagnostics"])
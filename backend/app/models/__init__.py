@@ -1,7 +1,8 @@
 from app.models.user import User
 from app.models.deck import Deck, Word
-from app.models.session import Session, Answer
+from app.models.session import Session, Answer, SessionSummary, SessionArchive
 from app.models.wrong_stats import WrongStats
+from app.models.review import ReviewState
 from app.models.cache import AudioCache, ImageCache
 
 __all__ = [
@@ -10,7 +11,10 @@ __all__ = [
     "Word",
     "Session",
     "Answer",
+    "SessionSummary",
+    "SessionArchive",
     "WrongStats",
+    "ReviewState",
     "AudioCache",
     "ImageCache",
 ]
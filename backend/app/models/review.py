@@ -0,0 +1,42 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ReviewState(Base):
+    """Spaced repetition state of one word for one user (see app.core.scheduler)."""
+
+    __tablename__ = "review_states"
+    __table_args__ = (
+        UniqueConstraint("user_id", "word_id", name="unique_user_word_review"),
+        # Due cards: range scans by due date, across decks or within one
+        Index("ix_review_states_user_due", "user_id", "due_at"),
+        Index("ix_review_states_user_deck_due", "user_id", "deck_id", "due_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    word_id = Column(Integer, ForeignKey("words.id"), nullable=False)
+    deck_id = Column(Integer, ForeignKey("decks.id"), nullable=False)
+
+    # SM-2 state
+    repetitions = Column(Integer, nullable=False, default=0)
+    interval_days = Column(Integer, nullable=False, default=0)
+    ease = Column(Float, nullable=False, default=2.5)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    last_reviewed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User")
+    word = relationship("Word")
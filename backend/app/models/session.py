@@ -1,18 +1,31 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, LargeBinary, Float, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.word_indices import pack_indices, unpack_indices
 from app.database import Base
 
 
 class Session(Base):
     __tablename__ = "sessions"
+    # Never reuse ids of archived (deleted) sessions: summaries and archives
+    # are keyed by session id
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     deck_id = Column(Integer, ForeignKey("decks.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
-    # Session state
-    word_indices = Column(JSON, nullable=False)  # List of word indices to quiz
+    # Multi-deck sessions: all decks in order (deck_id is the first) and
+    # the first virtual word index of each; None for single-deck sessions
+    deck_ids = Column(JSON, nullable=True)
+    deck_offsets = Column(JSON, nullable=True)
+
+    # Session state: word indices to quiz, as a range (start, count) when
+    # contiguous or packed int32 otherwise; see app.core.word_indices
+    index_start = Column(Integer, nullable=True)
+    index_count = Column(Integer, nullable=True)
+    index_blob = Column(LargeBinary, nullable=True)
+    legacy_word_indices = Column("word_indices", JSON, nullable=True)  # Rows written before packing
     current_index = Column(Integer, default=0)
     score = Column(Integer, default=0)
     total_questions = Column(Integer, nullable=False)
@@ -20,6 +33,14 @@ class Session(Base):
     # Session status
     is_completed = Column(Boolean, default=False)
     is_wrong_only = Column(Boolean, default=False)  # True if this is a "wrong only" session
+    is_review = Column(Boolean, default=False)  # True if this is a spaced repetition review
+
+    # Grading options
+    max_typo_distance = Column(Integer, default=0)  # Jamo edits accepted as a typo (0 = exact)
+    retry_wrong = Column(Boolean, default=False)  # Retry wrong answers at once, with hints
+
+    # Optimistic concurrency: bumped by every write-back of the quiz state
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -28,10 +49,40 @@ class Session(Base):
     deck = relationship("Deck")
     user = relationship("User")
     answers = relationship("Answer", back_populates="session", cascade="all, delete-orphan")
+    summary = relationship(
+        "SessionSummary",
+        primaryjoin="Session.id == foreign(SessionSummary.session_id)",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def index_sequence(self):
+        """Word indices with O(1) access, without building a list."""
+        if self.index_count is None:
+            return self.legacy_word_indices or []
+        return unpack_indices(self.index_start, self.index_count, self.index_blob)
+
+    @property
+    def word_indices(self) -> list[int]:
+        """Word indices as a list."""
+        return list(self.index_sequence)
+
+    @word_indices.setter
+    def word_indices(self, indices):
+        self.index_start, self.index_count, self.index_blob = pack_indices(
+            indices if isinstance(indices, range) else list(indices)
+        )
+        self.legacy_word_indices = None
 
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        # Each idempotency key is answered once per session (NULLs never conflict)
+        UniqueConstraint('session_id', 'request_id', name='unique_session_request'),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)
@@ -42,8 +93,50 @@ class Answer(Base):
     is_correct = Column(Boolean, nullable=False)
     hint_used = Column(Integer, default=0)  # Number of hints used
 
+    # Idempotent submits: client key and the response to replay on retry
+    request_id = Column(String(64), nullable=True)
+    response = Column(JSON, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     session = relationship("Session", back_populates="answers")
     word = relationship("Word")
+
+
+class SessionSummary(Base):
+    """Summary of a completed session, written once when it completes."""
+
+    __tablename__ = "session_summaries"
+
+    # No foreign key: summaries stay live after their session is archived
+    session_id = Column(Integer, primary_key=True)
+    deck_name = Column(String, nullable=False)
+    score = Column(Integer, nullable=False)
+    total_questions = Column(Integer, nullable=False)
+    percentage = Column(Float, nullable=False)
+    wrong_words = Column(JSON, nullable=False)
+
+    # Timestamps (copied from the session)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class SessionArchive(Base):
+    """
+    A completed session and its answers, moved out of the live tables.
+
+    The payload is zlib-compressed JSON; see app.services.archive_service.
+    """
+
+    __tablename__ = "session_archives"
+
+    session_id = Column(Integer, primary_key=True)
+    deck_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=True, index=True)
+    answer_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+
+    # Timestamps
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
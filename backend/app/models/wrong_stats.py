@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -7,7 +7,20 @@ from app.database import Base
 class WrongStats(Base):
     __tablename__ = "wrong_stats"
     __table_args__ = (
-        UniqueConstraint('word', 'deck_id', name='unique_word_deck'),
+        # One row per word and deck for anonymous sessions, and one per
+        # user, word and deck for signed-in users (NULLs never conflict)
+        Index(
+            'unique_word_deck', 'word', 'deck_id', unique=True,
+            sqlite_where=text("user_id IS NULL"),
+            postgresql_where=text("user_id IS NULL"),
+        ),
+        Index(
+            'unique_user_word_deck', 'user_id', 'deck_id', 'word', unique=True,
+            sqlite_where=text("user_id IS NOT NULL"),
+            postgresql_where=text("user_id IS NOT NULL"),
+        ),
+        # Wrong-only sessions: a user's words in a deck above a wrong count
+        Index('ix_wrong_stats_user_deck_count', 'user_id', 'deck_id', 'wrong_count'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -25,3 +38,10 @@ class WrongStats(Base):
 
     deck = relationship("Deck")
     user = relationship("User")
+
+    @staticmethod
+    def owned_by(user_id):
+        """Filter for one user's rows, or the anonymous rows when user_id is None."""
+        if user_id is None:
+            return WrongStats.user_id.is_(None)
+        return WrongStats.user_id == user_id
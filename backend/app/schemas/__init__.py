@@ -1,6 +1,7 @@
 from app.schemas.tts import TTSRequest, TTSResponse
 from app.schemas.image import ImageRequest, ImageResponse, GitHubCommitRequest, GitHubCommitResponse
 from app.schemas.deck import DeckBase, DeckCreate, DeckResponse, DeckWithWords, WordBase, WordCreate, WordResponse
+from app.schemas.diagnostics import EngineCandidate, EngineDiagnosticsResponse
 from app.schemas.session import (
     SessionStartRequest,
     SessionResponse,
@@ -30,4 +31,6 @@ __all__ = [
     "SubmitRequest",
     "SubmitResponse",
     "SummaryResponse",
+    "EngineCandidate",
+    "EngineDiagnosticsResponse",
 ]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Dict
+
+
+class EngineCandidate(BaseModel):
+    conforms: bool = Field(
+        ..., description="True if it grades like the Python reference"
+    )
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+
+class EngineDiagnosticsResponse(BaseModel):
+    engine: str = Field(..., description="Backend used for grading in this process")
+    reason: str
+    override: str = Field(..., description="Configured GRADING_ENGINE value")
+    candidates: Dict[str, EngineCandidate]
@@ -7,16 +7,58 @@ class SessionStartRequest(BaseModel):
     deck_id: int
     word_indices: Optional[List[int]] = Field(None, description="Specific word indices to quiz, or None for all")
     is_wrong_only: bool = Field(False, description="True if this is a wrong-only session")
+    max_typo_distance: int = Field(
+        0, ge=0, le=3, description="Jamo edits to accept as a typo, or 0 for exact grading"
+    )
+    sample_size: Optional[int] = Field(
+        None, ge=1, le=500, description="Quiz this many randomly sampled words (of word_indices, if given)"
+    )
+    weight_by_wrong: bool = Field(
+        False, description="Sample words the user got wrong more often (weight 1 + wrong count)"
+    )
+    retry_wrong: bool = Field(
+        False, description="Ask a missed word again at once with a growing hint, until answered"
+    )
+
+
+class WrongOnlySessionRequest(BaseModel):
+    deck_id: int
+    min_wrong_count: int = Field(1, ge=1, description="Only words answered wrong at least this often")
+    max_typo_distance: int = Field(
+        0, ge=0, le=3, description="Jamo edits to accept as a typo, or 0 for exact grading"
+    )
+
+
+class ReviewSessionRequest(BaseModel):
+    deck_id: int
+    limit: int = Field(20, ge=1, le=500, description="Maximum number of due cards to review")
+    max_typo_distance: int = Field(
+        0, ge=0, le=3, description="Jamo edits to accept as a typo, or 0 for exact grading"
+    )
+
+
+class MultiDeckSessionRequest(BaseModel):
+    deck_ids: List[int] = Field(..., min_length=1, max_length=50, description="Decks to quiz together, in order")
+    sample_size: Optional[int] = Field(
+        None, ge=1, le=500, description="Quiz this many randomly sampled words of all decks"
+    )
+    max_typo_distance: int = Field(
+        0, ge=0, le=3, description="Jamo edits to accept as a typo, or 0 for exact grading"
+    )
 
 
 class SessionResponse(BaseModel):
     id: int
     deck_id: int
+    deck_ids: Optional[List[int]] = Field(None, description="All decks of a multi-deck session")
     current_index: int
     score: int
     total_questions: int
     is_completed: bool
     is_wrong_only: bool
+    is_review: bool = False
+    retry_wrong: bool = False
+    max_typo_distance: int = 0
     created_at: datetime
     completed_at: Optional[datetime]
 
@@ -30,18 +72,34 @@ class PromptResponse(BaseModel):
     progress: str  # e.g., "1/10"
     total: int
     current: int
+    hint_level: int = Field(0, description="Hint level served, or 0 for none")
+    hint: str = Field("", description="Server-side hint for the requested level")
+    attempt: int = Field(1, description="Attempt at this word; retries start at 2")
 
 
 class SubmitRequest(BaseModel):
     answer: str
     hint_used: int = Field(0, description="Number of hints used for this question")
+    request_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=64,
+        description="Idempotency key; retrying with the same key returns the stored response",
+    )
 
 
 class SubmitResponse(BaseModel):
     is_correct: bool
+    is_typo: bool = Field(False, description="True if accepted as a near-miss of the correct answer")
     correct_answer: str
     score: int
     progress: str
+    next: Optional[PromptResponse] = Field(
+        None, description="Next question, when requested with include_next"
+    )
+    next_action: Optional[str] = Field(
+        None, description="Retry sessions: retry_same, next_question or show_summary"
+    )
 
 
 class SummaryResponse(BaseModel):
@@ -0,0 +1,269 @@
+"""
+Archive Service - Retention for Sessions and Answers
+
+Moves completed sessions older than a retention age, with their answers,
+out of the live sessions and answers tables into session_archives: one row
+per session holding zlib-compressed JSON. Summaries, wrong stats and review
+state stay live, so hot queries only ever see recent sessions; archived
+sessions stay readable through get_summary (from their summary, or from the
+archive when the summary is gone) and load().
+
+Run periodically, e.g. from cron:
+
+    python -m app.services.archive_service --days 90
+"""
+
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.config import settings
+from app.models.deck import Deck, Word
+from app.models.session import Session, Answer, SessionSummary, SessionArchive
+from app.services.session_pool import session_pool
+from app.services.session_state import session_state_cache
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class ArchiveService:
+    """Archive old completed sessions and read them back."""
+
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    def archive_completed(
+        self,
+        older_than_days: int = settings.archive_after_days,
+        batch_size: int = settings.archive_batch_size,
+    ) -> int:
+        """
+        Archive sessions completed more than older_than_days ago.
+
+        Works in batches, one transaction each, so a long run can be stopped
+        and resumed. Sessions without a materialized summary get one.
+
+        Args:
+            older_than_days: Retention age of live sessions
+            batch_size: Sessions per transaction
+
+        Returns:
+            Number of sessions archived
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        archived = 0
+
+        while True:
+            sessions = (
+                self.db.query(Session)
+                .filter(Session.is_completed == True, Session.completed_at < cutoff)
+                .order_by(Session.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not sessions:
+                return archived
+
+            ids = [session.id for session in sessions]
+            self._archive_batch(sessions)
+            self.db.commit()
+            for session in sessions:
+                self.db.expunge(session)
+
+            for session_id in ids:
+                session_state_cache.discard(session_id)
+                session_pool.discard(session_id)
+            archived += len(ids)
+
+    def _archive_batch(self, sessions: list):
+        ids = [session.id for session in sessions]
+
+        deck_ids = set()
+        for session in sessions:
+            deck_ids.update(session.deck_ids or [session.deck_id])
+        deck_names = dict(
+            self.db.query(Deck.id, Deck.name).filter(Deck.id.in_(deck_ids))
+        )
+
+        answers = {session_id: [] for session_id in ids}
+        rows = (
+            self.db.query(
+                Answer.session_id,
+                Answer.word_id,
+                Word.word,
+                Answer.user_answer,
+                Answer.is_correct,
+                Answer.hint_used,
+                Answer.created_at,
+            )
+            .outerjoin(Word, Word.id == Answer.word_id)
+            .filter(Answer.session_id.in_(ids))
+            .order_by(Answer.id)
+        )
+        for (
+            session_id,
+            word_id,
+            word,
+            user_answer,
+            is_correct,
+            hint_used,
+            created_at,
+        ) in rows:
+            answers[session_id].append(
+                [
+                    word_id,
+                    word,
+                    user_answer,
+                    is_correct,
+                    hint_used,
+                    _timestamp(created_at),
+                ]
+            )
+
+        summarized = {
+            session_id
+            for (session_id,) in self.db.query(SessionSummary.session_id).filter(
+                SessionSummary.session_id.in_(ids)
+            )
+        }
+
+        archives = []
+        for session in sessions:
+            payload = {
+                "session": {
+                    "id": session.id,
+                    "deck_id": session.deck_id,
+                    "deck_ids": session.deck_ids,
+                    "deck_offsets": session.deck_offsets,
+                    "deck_name": ", ".join(
+                        deck_names.get(deck_id, "Unknown")
+                        for deck_id in session.deck_ids or [session.deck_id]
+                    ),
+                    "user_id": session.user_id,
+                    "word_indices": session.word_indices,
+                    "score": session.score,
+                    "total_questions": session.total_questions,
+                    "is_wrong_only": session.is_wrong_only,
+                    "is_review": session.is_review,
+                    "retry_wrong": session.retry_wrong,
+                    "max_typo_distance": session.max_typo_distance,
+                    "created_at": _timestamp(session.created_at),
+                    "completed_at": _timestamp(session.completed_at),
+                },
+                "answers": answers[session.id],
+            }
+            if session.id not in summarized:
+                self.db.add(_summary_from_payload(payload))
+
+            archives.append(
+                {
+                    "session_id": session.id,
+                    "deck_id": session.deck_id,
+                    "user_id": session.user_id,
+                    "answer_count": len(payload["answers"]),
+                    "payload": zlib.compress(
+                        json.dumps(
+                            payload, ensure_ascii=False, separators=(",", ":")
+                        ).encode("utf-8"),
+                        9,
+                    ),
+                    "completed_at": session.completed_at,
+                }
+            )
+
+        self.db.flush()
+        self.db.execute(insert(SessionArchive), archives)
+        self.db.execute(
+            delete(Answer).where(Answer.session_id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.execute(
+            delete(Session).where(Session.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+
+    def load(self, session_id: int) -> Optional[dict]:
+        """
+        Read an archived session.
+
+        Returns:
+            Dict with "session" (its columns, deck name and word indices) and
+            "answers" ([word_id, word, user_answer, is_correct, hint_used,
+            created_at] in order), or None if it isn't archived
+        """
+        payload = (
+            self.db.query(SessionArchive.payload)
+            .filter(SessionArchive.session_id == session_id)
+            .scalar()
+        )
+        if payload is None:
+            return None
+        return json.loads(zlib.decompress(payload))
+
+    def summary(self, session_id: int) -> Optional[SessionSummary]:
+        """Rebuild an archived session's summary (unsaved), or None."""
+        payload = self.load(session_id)
+        return _summary_from_payload(payload) if payload is not None else None
+
+
+def _summary_from_payload(payload: dict) -> SessionSummary:
+    session = payload["session"]
+    score = session["score"]
+    total_questions = session["total_questions"]
+    percentage = (score / total_questions * 100) if total_questions > 0 else 0
+    wrong_words = [
+        word
+        for _, word, _, is_correct, _, _ in payload["answers"]
+        if not is_correct and word is not None
+    ]
+
+    return SessionSummary(
+        session_id=session["id"],
+        deck_name=session["deck_name"],
+        score=score,
+        total_questions=total_questions,
+        percentage=round(percentage, 2),
+        wrong_words=list(dict.fromkeys(wrong_words)),
+        created_at=_datetime(session["created_at"]),
+        completed_at=_datetime(session["completed_at"]),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import Base, SessionLocal, engine
+    import app.models  # noqa: F401  (register tables for create_all)
+
+    parser = argparse.ArgumentParser(description="Archive old completed quiz sessions")
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=settings.archive_after_days,
+        help="Archive sessions completed more than this many days ago",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.archive_batch_size,
+        help="Sessions per transaction",
+    )
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        count = ArchiveService(db).archive_completed(args.days, args.batch_size)
+        print(f"Archived {count} sessions")
+    finally:
+        db.close()
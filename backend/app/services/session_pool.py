@@ -0,0 +1,136 @@
+"""
+Session Pool - Live VocaSession Objects per Worker
+
+Retry sessions (retry_wrong) run on a VocaSession (C++ when built, else the
+Python fallback) with its retry queue and progressive hints, kept alive
+between requests so prompts and grading are in-memory calls. The pool is a
+bounded LRU by count and approximate memory. An evicted (or never seen)
+session is rehydrated by replaying its stored answers in order; every
+answer row is written as before, so the answers table stays the durable
+record.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+from app.core.voca_engine import get_session
+
+# Submitted for answers that must count as wrong whatever the grader says
+# (hint forfeits, replays of wrong answers); no meaning normalizes to it
+FORCED_WRONG = "\x00"
+
+# Rough per-word cost of the session's strings and bookkeeping, in bytes
+_WORD_OVERHEAD = 96
+
+
+class PooledSession:
+    """A live VocaSession with the word rows behind its questions."""
+
+    __slots__ = ("session", "words", "retry", "nbytes")
+
+    def __init__(self, words: list[tuple]):
+        """
+        Start a session over words in quiz order.
+
+        Args:
+            words: (word id, deck id, deck version, word, meaning) tuples
+        """
+        self.words = words
+        self.retry = None  # Position of the question being retried, if any
+        self.session = get_session()
+        self.session.set_words([(word, meaning) for _, _, _, word, meaning in words])
+        self.session.start()
+        self.nbytes = sum(
+            len(word.encode("utf-8")) + len(meaning.encode("utf-8")) + _WORD_OVERHEAD
+            for _, _, _, word, meaning in words
+        )
+
+    def locate(self, prompt) -> tuple[int, bool]:
+        """
+        Find the word behind a prompt.
+
+        Returns:
+            Tuple of (position in words, whether this is the first attempt)
+        """
+        # A wrong answer is retried right away until answered, so a retry
+        # always repeats the last question; its text may be shared by
+        # other words
+        if self.retry is not None:
+            return self.retry, False
+        return int(prompt.question_id), True
+
+    def submit(self, position: int, answer: str):
+        """Answer the question at position (as located) and get the feedback."""
+        feedback = self.session.submit(answer)
+        self.retry = None if feedback.is_correct else position
+        return feedback
+
+    def replay(self, outcomes):
+        """Re-submit stored answers, given as is_correct flags in order."""
+        for is_correct in outcomes:
+            prompt = self.session.prompt()
+            if prompt is None:
+                return
+            position, _ = self.locate(prompt)
+            self.submit(
+                position, self.words[position][4] if is_correct else FORCED_WRONG
+            )
+
+
+class SessionPool:
+    """Bounded LRU of live sessions, by count and approximate bytes."""
+
+    def __init__(self, maxsize: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: int) -> Optional[PooledSession]:
+        """Get a live session, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._entries.move_to_end(session_id)
+            return entry
+
+    def put(self, session_id: int, entry: PooledSession) -> PooledSession:
+        """Add a live session, evicting the least recently used over the bounds."""
+        with self._lock:
+            old = self._entries.pop(session_id, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[session_id] = entry
+            self.nbytes += entry.nbytes
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.maxsize or self.nbytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return entry
+
+    def discard(self, session_id: int):
+        """Drop a live session; it is rehydrated from its answers when needed."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self.nbytes -= entry.nbytes
+
+    def clear(self):
+        """Drop all live sessions."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide live sessions, shared by all requests
+session_pool = SessionPool(
+    maxsize=settings.session_pool_size,
+    max_bytes=settings.session_pool_max_bytes,
+)
@@ -4,17 +4,42 @@ Session Service - Vocabulary Quiz Session Management
 Manages quiz sessions using C++ engine for scoring logic.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy import DateTime, Integer, String, and_, case, cast, literal, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as DBSession
 from sqlalchemy.sql import func
 
-from app.core.voca_engine import VocaTestEngine
-from app.models.session import Session, Answer
+from app.config import settings
+from app.core.engine_selection import get_grading_engine
+from app.core.hints import HINT_LEVELS
+from app.core.sampling import sample_indices, weighted_sample
+from app.core.scheduler import (
+    DEFAULT_EASE,
+    FIRST_INTERVAL,
+    MIN_EASE,
+    PASSING_QUALITY,
+    SECOND_INTERVAL,
+    answer_quality,
+    ease_change,
+    next_schedule,
+)
+from app.core.voca_engine import AnswerKeyCache, VocaTestEngine
+from app.core.word_indices import locate_index
+from app.models.session import Session, Answer, SessionSummary
 from app.models.deck import Deck, Word
+from app.models.review import ReviewState
 from app.models.wrong_stats import WrongStats
+from app.services.archive_service import ArchiveService
+from app.services.session_pool import FORCED_WRONG, PooledSession, session_pool
+from app.services.session_state import SessionState, session_state_cache
+from app.services.wrong_stats_buffer import dialect_insert, wrong_stats_buffer
 from app.schemas.session import (
     SessionStartRequest,
+    WrongOnlySessionRequest,
+    ReviewSessionRequest,
+    MultiDeckSessionRequest,
     SessionResponse,
     PromptResponse,
     SubmitRequest,
@@ -22,20 +47,29 @@ from app.schemas.session import (
     SummaryResponse,
 )
 
+# Process-wide cache of compiled answer keys, shared by all requests
+answer_key_cache = AnswerKeyCache(maxsize=settings.answer_key_cache_size)
+
+# Questions whose answer keys are built when a session starts
+WARM_QUESTIONS = 20
+
 
 class SessionService:
     """Service for managing vocabulary quiz sessions."""
 
     def __init__(self, db: DBSession):
         self.db = db
-        self.engine = VocaTestEngine()
+        self.engine = get_grading_engine()
 
-    def start_session(self, request: SessionStartRequest) -> SessionResponse:
+    def start_session(
+        self, request: SessionStartRequest, user_id: Optional[int] = None
+    ) -> SessionResponse:
         """
         Start a new quiz session.
 
         Args:
             request: Session start request with deck_id and word_indices
+            user_id: Signed-in user taking the quiz, if any
 
         Returns:
             Session response with session info
@@ -49,147 +83,600 @@ class SessionService:
             raise ValueError(f"Deck {request.deck_id} not found")
 
         # Get word indices
-        if request.word_indices:
+        if request.sample_size and request.weight_by_wrong:
+            word_indices = self._weighted_sample(request, user_id)
+        elif request.word_indices:
             word_indices = request.word_indices
         else:
-            # Get all word indices
+            # Get all word indices (stored as a range, never as a list)
             word_count = self.db.query(Word).filter(Word.deck_id == request.deck_id).count()
-            word_indices = list(range(word_count))
+            word_indices = range(word_count)
+
+        if request.sample_size and not request.weight_by_wrong:
+            word_indices = sample_indices(word_indices, request.sample_size)
+
+        return self._create_session(
+            {deck.id: deck.updated_at or deck.created_at},
+            word_indices,
+            user_id=user_id,
+            is_wrong_only=request.is_wrong_only,
+            retry_wrong=request.retry_wrong,
+            max_typo_distance=request.max_typo_distance,
+        )
+
+    def start_wrong_only_session(
+        self, request: WrongOnlySessionRequest, user_id: Optional[int] = None
+    ) -> SessionResponse:
+        """
+        Start a session over the words a user got wrong in a deck.
+
+        The word indices and the deck version are resolved in one query
+        over the (user_id, deck_id, wrong_count) index.
+
+        Args:
+            request: Deck and minimum wrong count
+            user_id: Signed-in user, or None for anonymous wrong stats
+
+        Returns:
+            Session response with session info
+
+        Raises:
+            ValueError: If the deck has no wrong words to review
+        """
+        # Wrong answers still buffered in memory must be counted too
+        if wrong_stats_buffer.pending(request.deck_id, user_id):
+            wrong_stats_buffer.flush(self.db)
+
+        rows = (
+            self.db.query(Word.index_in_deck, func.coalesce(Deck.updated_at, Deck.created_at))
+            .join(WrongStats, and_(
+                WrongStats.deck_id == Word.deck_id,
+                WrongStats.word == Word.word,
+            ))
+            .join(Deck, Deck.id == Word.deck_id)
+            .filter(
+                WrongStats.owned_by(user_id),
+                WrongStats.deck_id == request.deck_id,
+                WrongStats.wrong_count >= request.min_wrong_count,
+            )
+            .order_by(Word.index_in_deck)
+            .all()
+        )
+        if not rows:
+            raise ValueError(f"No wrong words to review in deck {request.deck_id}")
+
+        return self._create_session(
+            {request.deck_id: rows[0][1]},
+            [index for index, _ in rows],
+            user_id=user_id,
+            is_wrong_only=True,
+            max_typo_distance=request.max_typo_distance,
+        )
+
+    def start_review_session(
+        self, request: ReviewSessionRequest, user_id: int
+    ) -> SessionResponse:
+        """
+        Start a spaced repetition review of a user's due cards in a deck.
+
+        Pulls the most overdue cards with a range scan over the
+        (user_id, deck_id, due_at) index; cards enter scheduling the first
+        time the user answers them in any session.
+
+        Args:
+            request: Deck and maximum number of cards
+            user_id: Signed-in user
+
+        Returns:
+            Session response with session info
+
+        Raises:
+            ValueError: If no cards are due
+        """
+        rows = (
+            self.db.query(Word.index_in_deck, func.coalesce(Deck.updated_at, Deck.created_at))
+            .join(ReviewState, ReviewState.word_id == Word.id)
+            .join(Deck, Deck.id == Word.deck_id)
+            .filter(
+                ReviewState.user_id == user_id,
+                ReviewState.deck_id == request.deck_id,
+                ReviewState.due_at <= datetime.utcnow(),
+            )
+            .order_by(ReviewState.due_at)
+            .limit(request.limit)
+            .all()
+        )
+        if not rows:
+            raise ValueError(f"No cards due for review in deck {request.deck_id}")
+
+        return self._create_session(
+            {request.deck_id: rows[0][1]},
+            [index for index, _ in rows],
+            user_id=user_id,
+            is_review=True,
+            max_typo_distance=request.max_typo_distance,
+        )
+
+    def _weighted_sample(
+        self, request: SessionStartRequest, user_id: Optional[int] = None
+    ) -> list[int]:
+        """
+        Sample word indices weighted by 1 + the user's wrong count.
+
+        Streams (index, wrong count) rows in batches through a reservoir of
+        sample_size entries, so the deck is never loaded at once.
+        """
+        query = (
+            self.db.query(Word.index_in_deck, WrongStats.wrong_count)
+            .outerjoin(WrongStats, and_(
+                WrongStats.deck_id == Word.deck_id,
+                WrongStats.word == Word.word,
+                WrongStats.owned_by(user_id),
+            ))
+            .filter(Word.deck_id == request.deck_id)
+        )
+        if request.word_indices:
+            query = query.filter(Word.index_in_deck.in_(request.word_indices))
 
-        # Create session
+        rows = query.yield_per(1000)
+        return weighted_sample(
+            ((index, 1 + (wrong_count or 0)) for index, wrong_count in rows),
+            request.sample_size,
+        )
+
+    def start_multi_deck_session(
+        self, request: MultiDeckSessionRequest, user_id: Optional[int] = None
+    ) -> SessionResponse:
+        """
+        Start a session over several decks without copying their words.
+
+        The decks are laid end to end as one virtual index: deck k's word i
+        is offset_k + i. Sizes and versions of all decks come from one
+        query, and the session stores only the deck list, their offsets and
+        the (usually contiguous) virtual indices.
+
+        Args:
+            request: Decks in quiz order, with optional sampling
+            user_id: Signed-in user taking the quiz, if any
+
+        Returns:
+            Session response with session info
+
+        Raises:
+            ValueError: If a deck is not found
+        """
+        deck_ids = list(dict.fromkeys(request.deck_ids))
+        rows = (
+            self.db.query(
+                Deck.id, func.coalesce(Deck.updated_at, Deck.created_at), func.count(Word.id)
+            )
+            .outerjoin(Word, Word.deck_id == Deck.id)
+            .filter(Deck.id.in_(deck_ids))
+            .group_by(Deck.id)
+            .all()
+        )
+        found = {deck_id: (deck_version, count) for deck_id, deck_version, count in rows}
+
+        decks = {}
+        deck_offsets = []
+        total = 0
+        for deck_id in deck_ids:
+            if deck_id not in found:
+                raise ValueError(f"Deck {deck_id} not found")
+            deck_version, count = found[deck_id]
+            decks[deck_id] = deck_version
+            deck_offsets.append(total)
+            total += count
+
+        word_indices = range(total)
+        if request.sample_size:
+            word_indices = sample_indices(word_indices, request.sample_size)
+
+        return self._create_session(
+            decks,
+            word_indices,
+            user_id=user_id,
+            max_typo_distance=request.max_typo_distance,
+            deck_offsets=deck_offsets,
+        )
+
+    def _create_session(
+        self,
+        decks: dict,
+        word_indices,
+        user_id: Optional[int] = None,
+        is_wrong_only: bool = False,
+        is_review: bool = False,
+        retry_wrong: bool = False,
+        max_typo_distance: int = 0,
+        deck_offsets: Optional[list[int]] = None,
+    ) -> SessionResponse:
+        """
+        Store a new session and warm the answer keys of its first questions.
+
+        Args:
+            decks: Deck versions by deck ID, in virtual index order
+            word_indices: Word indices (virtual ones for several decks)
+            deck_offsets: First virtual index of each deck, for several decks
+        """
+        deck_ids = list(decks)
         session = Session(
-            deck_id=request.deck_id,
+            deck_id=deck_ids[0],
+            deck_ids=deck_ids if len(deck_ids) > 1 else None,
+            deck_offsets=deck_offsets if len(deck_ids) > 1 else None,
+            user_id=user_id,
             word_indices=word_indices,
             current_index=0,
             score=0,
             total_questions=len(word_indices),
             is_completed=False,
-            is_wrong_only=request.is_wrong_only,
+            is_wrong_only=is_wrong_only,
+            is_review=is_review,
+            retry_wrong=retry_wrong,
+            max_typo_distance=max_typo_distance,
         )
 
         self.db.add(session)
         self.db.commit()
         self.db.refresh(session)
 
+        state = SessionState(session)
+        session_state_cache.put(self.db, state)
+
+        # Build hint ladders (and typo-tolerant keys) for the opening
+        # questions only, so a start never churns the shared cache; later
+        # words compile on their first prompt or submit
+        ahead = min(WARM_QUESTIONS, answer_key_cache.maxsize, len(state.indices))
+        rows = self._load_words(state, [state.indices[i] for i in range(ahead)]) if ahead else {}
+        words_by_version: dict = {}
+        for word, deck_version in rows.values():
+            words_by_version.setdefault(deck_version, []).append((word.id, word.meaning))
+        for deck_version, words in words_by_version.items():
+            answer_key_cache.warm(
+                words, deck_version, fuzzy=bool(max_typo_distance), hints=True
+            )
+
         return SessionResponse.from_orm(session)
 
-    def get_prompt(self, session_id: int) -> PromptResponse:
+    def get_prompt(self, session_id: int, hint_level: int = 0) -> PromptResponse:
         """
         Get current question for the session.
 
         Args:
             session_id: Session ID
+            hint_level: Hint level to include (1-4), or 0 for no hint; the
+                highest level served counts as hints used at submit
 
         Returns:
-            Prompt response with word and progress
+            Prompt response with word, progress and hint
 
         Raises:
             ValueError: If session not found or completed
         """
-        session = self.db.query(Session).filter(Session.id == session_id).first()
+        session = session_state_cache.get(self.db, session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
         if session.is_completed:
             raise ValueError("Session is already completed")
 
-        if session.current_index >= len(session.word_indices):
+        if session.retry_wrong:
+            return self._pooled_prompt(session, self._pooled(session), hint_level)
+
+        if session.current_index >= len(session.indices):
             raise ValueError("No more questions")
 
-        # Get current word
-        word_index = session.word_indices[session.current_index]
-        word = self.db.query(Word).filter(
-            Word.deck_id == session.deck_id,
-            Word.index_in_deck == word_index
-        ).first()
+        # Get current word along with its deck version
+        word_index = session.indices[session.current_index]
+        row = self._load_words(session, [word_index]).get(word_index)
 
-        if not word:
+        if not row:
             raise ValueError(f"Word at index {word_index} not found")
 
-        return PromptResponse(
-            word=word.word,
-            index=session.current_index,
-            progress=f"{session.current_index + 1}/{session.total_questions}",
-            total=session.total_questions,
-            current=session.current_index + 1,
-        )
+        word, deck_version = row
+        if hint_level:
+            session.serve_hint(session.current_index, hint_level)
+        return self._build_prompt(session, word, deck_version, hint_level)
 
-    def submit_answer(self, session_id: int, request: SubmitRequest) -> SubmitResponse:
+    def submit_answer(
+        self, session_id: int, request: SubmitRequest, include_next: bool = False
+    ) -> SubmitResponse:
         """
         Submit answer for current question.
 
+        Reads the word and its deck version in one query (the session state
+        is in memory) and writes the answer, wrong stats and session
+        progress in one transaction, without row locks: the sessions row is
+        written back with a version check.
+
+        A request with a request_id is answered at most once; retries get
+        the stored response back, from memory or from the answers table.
+
         Args:
             session_id: Session ID
-            request: Submit request with answer and hint usage
+            request: Submit request with answer, hint usage and idempotency key
+            include_next: Also return the next prompt, read in the same query
 
         Returns:
             Submit response with result and updated score
 
         Raises:
             ValueError: If session not found or completed
+            StaleSessionError: If another request moved the session on
+                first; retrying reloads it
         """
-        session = self.db.query(Session).filter(Session.id == session_id).first()
+        session = session_state_cache.get(self.db, session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
+        # Replay a retried request instead of answering twice
+        if request.request_id:
+            if session.last_request_id == request.request_id:
+                return session.last_response
+            if session.is_completed:
+                replay = self._stored_response(session_id, request.request_id)
+                if replay is not None:
+                    return replay
+
         if session.is_completed:
             raise ValueError("Session is already completed")
 
-        # Get current word
-        word_index = session.word_indices[session.current_index]
-        word = self.db.query(Word).filter(
-            Word.deck_id == session.deck_id,
-            Word.index_in_deck == word_index
-        ).first()
+        if session.retry_wrong:
+            return self._submit_pooled(session, request, include_next)
 
-        if not word:
+        # Get current (and next) word along with the deck version
+        word_index = session.indices[session.current_index]
+        wanted = [word_index]
+        next_position = session.current_index + 1
+        if include_next and next_position < len(session.indices):
+            wanted.append(session.indices[next_position])
+        rows = self._load_words(session, wanted)
+        row = rows.get(word_index)
+
+        if not row:
             raise ValueError(f"Word at index {word_index} not found")
 
-        # Check answer using C++ engine
-        is_correct = self.engine.is_correct(request.answer, word.meaning)
+        word, deck_version = row
+
+        is_correct = self._grade(word, deck_version, request.answer)
 
-        # If hint was used 2+ times, mark as incorrect
-        if request.hint_used >= 2:
+        # Accept near-misses in typo-tolerant sessions
+        is_typo = False
+        if not is_correct and session.max_typo_distance:
+            is_typo = answer_key_cache.is_close(
+                word.id, deck_version, request.answer, word.meaning, session.max_typo_distance
+            )
+            is_correct = is_typo
+
+        # If hint was used 2+ times, mark as incorrect; the server counts
+        # the hints it served, whatever the client reports
+        hint_used = max(request.hint_used, session.hints_served(session.current_index))
+        if hint_used >= 2:
             is_correct = False
+            is_typo = False
 
-        # Update score
-        if is_correct:
-            session.score += 1
-        else:
-            # Update wrong stats
-            self._update_wrong_stats(word.word, session.deck_id)
+        # Update score and move to the next question (completing the session
+        # at the end); build the response before commit expires the word
+        checkpoint = session.checkpoint()
+        session.advance(is_correct)
+        response = SubmitResponse(
+            is_correct=is_correct,
+            is_typo=is_typo,
+            correct_answer=word.meaning,
+            score=session.score,
+            progress=f"{session.current_index}/{session.total_questions}",
+        )
+        if include_next and not session.is_completed:
+            next_row = rows.get(session.indices[session.current_index])
+            if next_row:
+                response.next = self._build_prompt(session, *next_row)
+
+        return self._save_submit(
+            session, checkpoint, request, response,
+            word.id, word.word, word.deck_id, is_typo, hint_used,
+        )
+
+    def _submit_pooled(
+        self, session: SessionState, request: SubmitRequest, include_next: bool
+    ) -> SubmitResponse:
+        """
+        Submit an answer to a retry session's live VocaSession.
+
+        Grading, the retry queue and the next prompt are in-memory calls;
+        the database only receives the writes.
+        """
+        pooled = self._pooled(session)
+        prompt = pooled.session.prompt()
+        if prompt is None:
+            raise ValueError("Session is already completed")
+
+        position, first_attempt = pooled.locate(prompt)
+        word_id, deck_id, deck_version, word, meaning = pooled.words[position]
+
+        # Forfeit on 2+ hints (as requested by the client or served to it;
+        # a retry's own hint is free); accept near-misses in typo-tolerant
+        # sessions
+        hint_used = max(request.hint_used, session.hints_served((position, prompt.attempt)))
+        submitted = request.answer
+        is_typo = False
+        if hint_used >= 2:
+            submitted = FORCED_WRONG
+        elif session.max_typo_distance and not answer_key_cache.is_correct(
+            word_id, deck_version, request.answer, meaning
+        ):
+            is_typo = answer_key_cache.is_close(
+                word_id, deck_version, request.answer, meaning, session.max_typo_distance
+            )
+            if is_typo:
+                submitted = meaning
+
+        try:
+            feedback = pooled.submit(position, submitted)
+        except Exception:
+            session_pool.discard(session.id)
+            raise
+
+        # Only first attempts count towards progress and score
+        checkpoint = session.checkpoint()
+        session.record(feedback.is_correct, first_attempt, pooled.session.is_finished())
+        response = SubmitResponse(
+            is_correct=feedback.is_correct,
+            is_typo=is_typo,
+            correct_answer=meaning,
+            score=session.score,
+            progress=f"{session.current_index}/{session.total_questions}",
+            next_action=feedback.next_action,
+        )
+        if include_next and not session.is_completed:
+            response.next = self._pooled_prompt(session, pooled)
+
+        return self._save_submit(
+            session, checkpoint, request, response, word_id, word, deck_id, is_typo, hint_used,
+        )
+
+    def _save_submit(
+        self,
+        session: SessionState,
+        checkpoint: tuple,
+        request: SubmitRequest,
+        response: SubmitResponse,
+        word_id: int,
+        word: str,
+        deck_id: int,
+        is_typo: bool,
+        hint_used: int,
+    ) -> SubmitResponse:
+        """
+        Write a graded answer, its side effects and the session progress in
+        one transaction; undo the in-memory progress if that fails.
+        """
+        is_correct = response.is_correct
 
-        # Save answer
+        # Save answer; a keyed answer keeps its response for replays
         answer = Answer(
-            session_id=session_id,
-            word_id=word.id,
+            session_id=session.id,
+            word_id=word_id,
             user_answer=request.answer,
             is_correct=is_correct,
-            hint_used=request.hint_used,
+            hint_used=hint_used,
+            request_id=request.request_id,
+            response=response.model_dump(mode="json") if request.request_id else None,
         )
         self.db.add(answer)
 
-        # Move to next question
-        session.current_index += 1
-
-        # Check if session is completed
-        if session.current_index >= session.total_questions:
-            session.is_completed = True
-            session.completed_at = datetime.utcnow()
+        try:
+            if request.request_id:
+                # Claim the key before any other write
+                self.db.flush()
+
+            if not is_correct:
+                self._update_wrong_stats(word, deck_id, session.user_id)
+
+            # Signed-in users' answers feed their review schedule
+            if session.user_id is not None:
+                self._record_review(
+                    session.user_id,
+                    word_id,
+                    deck_id,
+                    answer_quality(is_correct, is_typo, hint_used),
+                )
+
+            # The sessions row is written behind (at once when completed)
+            session_state_cache.write_behind(self.db, session)
+
+            if session.is_completed:
+                # Materialize the summary in the same transaction
+                self.db.flush()
+                self.db.add(self._build_summary(session.id))
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            session.rollback(checkpoint)
+            # A live session can't be rolled back; rebuild it from its answers
+            session_pool.discard(session.id)
+            if request.request_id and isinstance(e, IntegrityError):
+                # The same request was already stored: replay it
+                replay = self._stored_response(session.id, request.request_id)
+                if replay is not None:
+                    return replay
+            raise
+
+        if request.request_id:
+            session.last_request_id = request.request_id
+            session.last_response = response
+
+        return response
+
+    def _pooled(self, session: SessionState) -> PooledSession:
+        """
+        Get a retry session's live VocaSession, rehydrating it on a miss.
 
-        self.db.commit()
+        Rehydration reads the session's words in one query and replays its
+        answers in order.
+        """
+        pooled = session_pool.get(session.id)
+        if pooled is not None:
+            return pooled
+
+        rows = self._load_words(session, list(session.indices))
+        pooled = PooledSession([
+            (word.id, word.deck_id, deck_version, word.word, word.meaning)
+            for word, deck_version in (rows[i] for i in session.indices if i in rows)
+        ])
+        answers = self.db.query(Answer.is_correct).filter(
+            Answer.session_id == session.id
+        ).order_by(Answer.id)
+        pooled.replay(is_correct for (is_correct,) in answers)
+        return session_pool.put(session.id, pooled)
+
+    def _pooled_prompt(
+        self, session: SessionState, pooled: PooledSession, hint_level: int = 0
+    ) -> PromptResponse:
+        """Build a retry session's prompt; retries carry the progressive hint."""
+        prompt = pooled.session.prompt()
+        if prompt is None:
+            raise ValueError("No more questions")
 
-        return SubmitResponse(
-            is_correct=is_correct,
-            correct_answer=word.meaning,
-            score=session.score,
-            progress=f"{session.current_index}/{session.total_questions}",
+        position, _ = pooled.locate(prompt)
+        word_id, _, deck_version, word, meaning = pooled.words[position]
+        if hint_level:
+            session.serve_hint((position, prompt.attempt), hint_level)
+        hint_level = max(hint_level, min(prompt.attempt - 1, HINT_LEVELS))
+        hint = ""
+        if hint_level:
+            hint = answer_key_cache.get_hints(word_id, deck_version, meaning)[hint_level - 1]
+
+        # Retries report the question they repeat, not the one after it
+        index = min(position, session.current_index)
+        return PromptResponse(
+            word=word,
+            index=index,
+            progress=f"{index + 1}/{session.total_questions}",
+            total=session.total_questions,
+            current=index + 1,
+            hint_level=hint_level,
+            hint=hint,
+            attempt=prompt.attempt,
         )
 
+    def _stored_response(self, session_id: int, request_id: str) -> Optional[SubmitResponse]:
+        """Get the response stored for a keyed submit, or None."""
+        stored = self.db.query(Answer.response).filter(
+            Answer.session_id == session_id,
+            Answer.request_id == request_id
+        ).scalar()
+        return SubmitResponse(**stored) if stored else None
+
     def get_summary(self, session_id: int) -> SummaryResponse:
         """
         Get summary of completed session.
 
+        Completed sessions are served from their materialized summary;
+        others (and sessions completed before summaries existed) are
+        aggregated from their answers. Archived sessions whose summary is
+        gone are rebuilt from the archive, and their summary restored.
+
         Args:
             session_id: Session ID
 
@@ -199,78 +686,277 @@ class SessionService:
         Raises:
             ValueError: If session not found
         """
-        session = self.db.query(Session).filter(Session.id == session_id).first()
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
+        summary = self.db.get(SessionSummary, session_id)
+        if summary is None:
+            if session_state_cache.flush(self.db, session_id):
+                self.db.commit()
 
-        deck = self.db.query(Deck).filter(Deck.id == session.deck_id).first()
+            summary = self._build_summary(session_id)
+            if summary is None:
+                summary = ArchiveService(self.db).summary(session_id)
+            if summary is None:
+                raise ValueError(f"Session {session_id} not found")
 
-        # Get wrong answers
-        wrong_answers = self.db.query(Answer).filter(
-            Answer.session_id == session_id,
-            Answer.is_correct == False
-        ).all()
+            if summary.completed_at is not None:
+                self.db.add(summary)
+                self.db.commit()
 
-        wrong_words = []
-        for answer in wrong_answers:
-            word = self.db.query(Word).filter(Word.id == answer.word_id).first()
-            if word:
-                wrong_words.append(word.word)
+        return SummaryResponse(
+            session_id=session_id,
+            deck_name=summary.deck_name,
+            score=summary.score,
+            total_questions=summary.total_questions,
+            percentage=summary.percentage,
+            wrong_words=summary.wrong_words,
+            created_at=summary.created_at,
+            completed_at=summary.completed_at,
+        )
 
-        percentage = (session.score / session.total_questions * 100) if session.total_questions > 0 else 0
+    def _build_summary(self, session_id: int) -> Optional[SessionSummary]:
+        """
+        Aggregate a session's summary in one joined query.
 
-        return SummaryResponse(
+        Returns:
+            Unsaved SessionSummary, or None if the session doesn't exist
+        """
+        rows = self.db.query(
+            Session.score,
+            Session.total_questions,
+            Session.created_at,
+            Session.completed_at,
+            Session.deck_ids,
+            Deck.name,
+            Word.word,
+        ).select_from(Session).outerjoin(
+            Deck, Deck.id == Session.deck_id
+        ).outerjoin(
+            Answer, and_(Answer.session_id == Session.id, Answer.is_correct == False)
+        ).outerjoin(
+            Word, Word.id == Answer.word_id
+        ).filter(
+            Session.id == session_id
+        ).order_by(Answer.id).all()
+
+        if not rows:
+            return None
+
+        score, total_questions, created_at, completed_at, deck_ids, deck_name, _ = rows[0]
+        if deck_ids:
+            names = dict(self.db.query(Deck.id, Deck.name).filter(Deck.id.in_(deck_ids)))
+            deck_name = ", ".join(names.get(deck_id, "Unknown") for deck_id in deck_ids)
+        percentage = (score / total_questions * 100) if total_questions > 0 else 0
+
+        return SessionSummary(
             session_id=session_id,
-            deck_name=deck.name if deck else "Unknown",
-            score=session.score,
-            total_questions=session.total_questions,
+            deck_name=deck_name or "Unknown",
+            score=score,
+            total_questions=total_questions,
             percentage=round(percentage, 2),
-            wrong_words=wrong_words,
-            created_at=session.created_at,
-            completed_at=session.completed_at,
+            # Retried words are listed once
+            wrong_words=list(dict.fromkeys(row.word for row in rows if row.word is not None)),
+            created_at=created_at,
+            completed_at=completed_at,
+        )
+
+    def _load_words(self, session: SessionState, indices: list[int]) -> dict:
+        """
+        Read session words by index, with their deck versions, in one query.
+
+        Indices of multi-deck sessions are split into per-deck groups and
+        resolved together.
+
+        Returns:
+            Mapping of session word index to (word, deck version)
+        """
+        if session.deck_offsets is None:
+            offsets = {session.deck_id: 0}
+            match = and_(Word.deck_id == session.deck_id, Word.index_in_deck.in_(indices))
+        else:
+            offsets = dict(zip(session.deck_ids, session.deck_offsets))
+            groups: dict[int, list[int]] = {}
+            for index in indices:
+                slot, local = locate_index(session.deck_offsets, index)
+                groups.setdefault(session.deck_ids[slot], []).append(local)
+            match = or_(*(
+                and_(Word.deck_id == deck_id, Word.index_in_deck.in_(local_indices))
+                for deck_id, local_indices in groups.items()
+            ))
+
+        rows = self.db.query(
+            Word, func.coalesce(Deck.updated_at, Deck.created_at)
+        ).join(Deck, Deck.id == Word.deck_id).filter(match).all()
+        return {
+            offsets[word.deck_id] + word.index_in_deck: (word, deck_version)
+            for word, deck_version in rows
+        }
+
+    def _build_prompt(
+        self, session: SessionState, word: Word, deck_version, hint_level: int = 0
+    ) -> PromptResponse:
+        """Build the prompt for the session's current question."""
+        hint = ""
+        if hint_level:
+            hints = answer_key_cache.get_hints(word.id, deck_version, word.meaning)
+            hint = hints[min(hint_level, len(hints)) - 1]
+
+        return PromptResponse(
+            word=word.word,
+            index=session.current_index,
+            progress=f"{session.current_index + 1}/{session.total_questions}",
+            total=session.total_questions,
+            current=session.current_index + 1,
+            hint_level=hint_level,
+            hint=hint,
         )
 
-    def _update_wrong_stats(self, word: str, deck_id: int):
+    def _grade(self, word: Word, deck_version, answer: str) -> bool:
         """
-        Update wrong statistics for a word.
+        Grade an answer with the process-wide engine.
+
+        The Python engine grades against precompiled answer keys; other
+        backends grade the raw meaning directly.
+        """
+        if isinstance(self.engine, VocaTestEngine):
+            return answer_key_cache.is_correct(word.id, deck_version, answer, word.meaning)
+        return self.engine.is_correct(answer, word.meaning)
+
+    def _update_wrong_stats(self, word: str, deck_id: int, user_id: Optional[int] = None):
+        """
+        Count a wrong answer for a word.
+
+        Goes through the wrong stats buffer, which writes it at once as an
+        atomic upsert or batches it (WRONG_STATS_BUFFER_SIZE). Runs in the
+        caller's transaction; the caller commits.
 
         Args:
             word: Word that was answered incorrectly
             deck_id: Deck ID
+            user_id: User who answered, if known
         """
-        stats = self.db.query(WrongStats).filter(
-            WrongStats.word == word,
-            WrongStats.deck_id == deck_id
-        ).first()
+        wrong_stats_buffer.add(self.db, deck_id, word, user_id)
 
-        if stats:
-            stats.wrong_count += 1
-            stats.last_wrong_at = datetime.utcnow()
-        else:
-            stats = WrongStats(
-                word=word,
-                deck_id=deck_id,
-                wrong_count=1,
-                last_wrong_at=datetime.utcnow(),
-            )
-            self.db.add(stats)
+    def _record_review(self, user_id: int, word_id: int, deck_id: int, quality: int):
+        """
+        Reschedule a word for a user after an answer (SM-2).
 
-        self.db.commit()
+        On SQLite and PostgreSQL this is one INSERT ... ON CONFLICT DO
+        UPDATE that computes the new schedule from the stored one in SQL,
+        so submits don't read review state and concurrent first answers
+        can't collide. Other databases read and write the row.
 
-    def get_wrong_words(self, deck_id: int, min_wrong_count: int = 1) -> list[str]:
+        Args:
+            user_id: User who answered
+            word_id: Word that was asked
+            deck_id: Deck of the word
+            quality: Answer quality from app.core.scheduler.answer_quality
+        """
+        now = datetime.utcnow()
+        first = next_schedule(0, 0, DEFAULT_EASE, quality)
+        row = {
+            "user_id": user_id,
+            "word_id": word_id,
+            "deck_id": deck_id,
+            "repetitions": first.repetitions,
+            "interval_days": first.interval_days,
+            "ease": first.ease,
+            "last_reviewed_at": now,
+            "due_at": now + timedelta(days=first.interval_days),
+        }
+
+        insert_stmt = dialect_insert(self.db)
+        if insert_stmt is None:
+            self._update_or_insert_review(row, quality)
+            return
+
+        stmt = insert_stmt(ReviewState).values(**row).on_conflict_do_update(
+            index_elements=[ReviewState.user_id, ReviewState.word_id],
+            set_=self._review_update(quality, now),
+        )
+        self.db.execute(stmt)
+
+    def _review_update(self, quality: int, now: datetime) -> dict:
+        """SET clause applying next_schedule to a stored review state, in SQL."""
+        if quality < PASSING_QUALITY:
+            return {
+                "repetitions": 0,
+                "interval_days": FIRST_INTERVAL,
+                "last_reviewed_at": now,
+                "due_at": now + timedelta(days=FIRST_INTERVAL),
+            }
+
+        # Every right-hand side sees the stored (old) row
+        ease = ReviewState.ease + ease_change(quality)
+        ease = case((ease < MIN_EASE, MIN_EASE), else_=ease)
+        grown = ReviewState.interval_days * ease + 0.5
+        if self.db.get_bind().dialect.name == "postgresql":
+            grown = cast(func.floor(grown), Integer)
+            grown = case((grown < 1, 1), else_=grown)
+            grown_due = literal(now, DateTime) + func.make_interval(0, 0, 0, grown)
+        else:
+            grown = cast(grown, Integer)  # Truncates: floor for positive values
+            grown = case((grown < 1, 1), else_=grown)
+            # SQLite keeps timestamps as text in SQLAlchemy's format
+            grown_due = func.strftime(
+                "%Y-%m-%d %H:%M:%S", now.strftime("%Y-%m-%d %H:%M:%S"),
+                "+" + cast(grown, String) + " days", type_=String,
+            ) + f".{now.microsecond:06d}"
+
+        return {
+            "repetitions": ReviewState.repetitions + 1,
+            "interval_days": case(
+                (ReviewState.repetitions == 0, FIRST_INTERVAL),
+                (ReviewState.repetitions == 1, SECOND_INTERVAL),
+                else_=grown,
+            ),
+            "ease": ease,
+            "last_reviewed_at": now,
+            "due_at": case(
+                (ReviewState.repetitions == 0, now + timedelta(days=FIRST_INTERVAL)),
+                (ReviewState.repetitions == 1, now + timedelta(days=SECOND_INTERVAL)),
+                else_=grown_due,
+            ),
+        }
+
+    def _update_or_insert_review(self, row: dict, quality: int):
+        state = self.db.query(ReviewState).filter(
+            ReviewState.user_id == row["user_id"],
+            ReviewState.word_id == row["word_id"]
+        ).first()
+        if state is None:
+            self.db.add(ReviewState(**row))
+            return
+
+        schedule = next_schedule(state.repetitions, state.interval_days, state.ease, quality)
+        state.repetitions, state.interval_days, state.ease = schedule
+        state.last_reviewed_at = row["last_reviewed_at"]
+        state.due_at = row["last_reviewed_at"] + timedelta(days=schedule.interval_days)
+
+    def get_wrong_words(
+        self, deck_id: int, min_wrong_count: int = 1, user_id: Optional[int] = None
+    ) -> list[str]:
         """
         Get words that were answered incorrectly.
 
+        Wrong answers still pending in the wrong stats buffer are counted.
+
         Args:
             deck_id: Deck ID
             min_wrong_count: Minimum wrong count to include
+            user_id: User whose mistakes to list, or None for anonymous sessions
 
         Returns:
             List of wrong words
         """
-        stats = self.db.query(WrongStats).filter(
-            WrongStats.deck_id == deck_id,
-            WrongStats.wrong_count >= min_wrong_count
-        ).all()
+        pending = wrong_stats_buffer.pending(deck_id, user_id)
+        query = self.db.query(WrongStats.word, WrongStats.wrong_count).filter(
+            WrongStats.owned_by(user_id),
+            WrongStats.deck_id == deck_id
+        )
+        if not pending:
+            query = query.filter(WrongStats.wrong_count >= min_wrong_count)
+
+        counts = {word: count or 0 for word, count in query}
+        for word, count in pending.items():
+            counts[word] = counts.get(word, 0) + count
 
-        return [s.word for s in stats]
+        return [word for word, count in counts.items() if count >= min_wrong_count]
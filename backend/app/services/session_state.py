@@ -0,0 +1,370 @@
+"""
+Session State Cache - Write-behind Quiz State
+
+Keeps the mutable part of each quiz session (position, score, completion)
+in process memory so prompts and submits don't re-read and re-write the
+sessions row. Dirty state is written back to the sessions table in
+batches: at most every flush interval, when a session completes, when an
+entry is evicted, and on shutdown. The sessions table stays the durable
+record.
+
+A session is assumed to be served by one process (sticky routing); other
+processes only see its progress after a flush. Write-backs are optimistic:
+each one is a conditional UPDATE ... WHERE version = ?, and a state whose
+row was moved on by another process is dropped instead of overwriting it.
+
+Write-backs are staged on the caller's transaction and only take effect in
+memory (new row version, clean flag) once it commits; if it rolls back the
+states stay dirty and are written again later. Evictions are the exception:
+they commit at once, since the request that evicts may never commit.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.orm import Session as DBSession
+
+from app.config import settings
+from app.models.session import Session
+
+
+class StaleSessionError(ValueError):
+    """The sessions row was changed by another writer since it was read."""
+
+
+class SessionState:
+    """In-memory state of one quiz session."""
+
+    __slots__ = (
+        "id",
+        "deck_id",
+        "deck_ids",
+        "deck_offsets",
+        "user_id",
+        "indices",
+        "current_index",
+        "score",
+        "total_questions",
+        "is_completed",
+        "completed_at",
+        "max_typo_distance",
+        "retry_wrong",
+        "version",
+        "last_request_id",
+        "last_response",
+        "hint_question",
+        "hint_level",
+        "dirty",
+    )
+
+    def __init__(self, session: Session):
+        self.id = session.id
+        self.deck_id = session.deck_id
+        self.deck_ids = session.deck_ids
+        self.deck_offsets = session.deck_offsets
+        self.user_id = session.user_id
+        self.indices = session.index_sequence
+        self.current_index = session.current_index or 0
+        self.score = session.score or 0
+        self.total_questions = session.total_questions
+        self.is_completed = bool(session.is_completed)
+        self.completed_at = session.completed_at
+        self.max_typo_distance = session.max_typo_distance or 0
+        self.retry_wrong = bool(session.retry_wrong)
+        self.version = session.version or 0  # Row version as last read or written
+        self.last_request_id = None  # Idempotency key of the last submit
+        self.last_response = None
+        self.hint_question = None  # Question the hint level was served for
+        self.hint_level = 0  # Highest hint level served for it
+        self.dirty = False
+
+    def advance(self, is_correct: bool):
+        """Record one answered question."""
+        if is_correct:
+            self.score += 1
+        self.current_index += 1
+        if self.current_index >= self.total_questions:
+            self.is_completed = True
+            self.completed_at = datetime.utcnow()
+        self.dirty = True
+
+    def record(self, is_correct: bool, first_attempt: bool, finished: bool):
+        """
+        Record one answer of a retry session.
+
+        Only first attempts move progress and score; the session completes
+        when its VocaSession has nothing left, retries included.
+        """
+        if first_attempt:
+            if is_correct:
+                self.score += 1
+            self.current_index += 1
+        if finished:
+            self.is_completed = True
+            self.completed_at = datetime.utcnow()
+        self.dirty = True
+
+    def serve_hint(self, question, level: int):
+        """Remember a hint level served for a question (any hashable key)."""
+        if question != self.hint_question:
+            self.hint_question = question
+            self.hint_level = 0
+        self.hint_level = max(self.hint_level, level)
+
+    def hints_served(self, question) -> int:
+        """Highest hint level served for a question, or 0."""
+        return self.hint_level if question == self.hint_question else 0
+
+    def checkpoint(self) -> tuple:
+        """Progress to go back to if the change being made is rolled back."""
+        return (
+            self.current_index,
+            self.score,
+            self.is_completed,
+            self.completed_at,
+            self.dirty,
+        )
+
+    def rollback(self, checkpoint: tuple):
+        """Undo changes made since checkpoint()."""
+        (
+            self.current_index,
+            self.score,
+            self.is_completed,
+            self.completed_at,
+            self.dirty,
+        ) = checkpoint
+
+    def progress(self) -> tuple:
+        """Progress columns, to tell whether a write-back is still current."""
+        return (self.current_index, self.score, self.is_completed)
+
+    def to_row(self, row_version: int) -> dict:
+        """Columns written back to the sessions table, keyed for _UPDATE."""
+        return {
+            "row_id": self.id,
+            "row_version": row_version,
+            "current_index": self.current_index,
+            "score": self.score,
+            "is_completed": self.is_completed,
+            "completed_at": self.completed_at,
+            "version": row_version + 1,
+        }
+
+
+# Conditional write-back: only applies if nobody wrote the row since
+_UPDATE = (
+    update(Session.__table__)
+    .where(
+        Session.__table__.c.id == bindparam("row_id"),
+        Session.__table__.c.version == bindparam("row_version"),
+    )
+    .values(
+        current_index=bindparam("current_index"),
+        score=bindparam("score"),
+        is_completed=bindparam("is_completed"),
+        completed_at=bindparam("completed_at"),
+        version=bindparam("version"),
+    )
+)
+
+
+class SessionStateCache:
+    """
+    Bounded LRU of session states with write-behind to the sessions table.
+
+    Writes are staged on the caller's DB session; the caller commits them
+    together with its own changes (except evictions; see put()).
+    """
+
+    def __init__(self, maxsize: int = 10000, flush_interval: float = 5.0):
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+        self._states: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def get(
+        self, db: DBSession, session_id: int, for_update: bool = False
+    ) -> Optional[SessionState]:
+        """
+        Get the state of a session, loading it from the database on a miss.
+
+        Args:
+            db: Database session
+            session_id: Session ID
+            for_update: Lock the row when loading it (ignored on SQLite)
+
+        Returns:
+            Session state, or None if the session doesn't exist
+        """
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+                return state
+
+        query = db.query(Session).filter(Session.id == session_id)
+        if for_update:
+            query = query.with_for_update()
+        session = query.first()
+        if not session:
+            return None
+        return self.put(db, SessionState(session))
+
+    def put(self, db: DBSession, state: SessionState) -> SessionState:
+        """
+        Cache a state, writing back any dirty entry it evicts.
+
+        Evicted states are committed here: read-only callers (prompts, or a
+        start that has already committed) never commit, and an evicted state
+        lives nowhere else. Call before staging other changes on db, which
+        would be committed with them.
+        """
+        evicted = []
+        with self._lock:
+            self._states[state.id] = state
+            self._states.move_to_end(state.id)
+            while len(self._states) > max(self.maxsize, 0):
+                _, old = self._states.popitem(last=False)
+                if old.dirty:
+                    evicted.append(old)
+        if evicted:
+            self._write(db, evicted)
+            try:
+                db.commit()
+            except Exception:
+                # Re-caches the evicted states, still dirty
+                db.rollback()
+                raise
+        return state
+
+    def write_behind(self, db: DBSession, state: SessionState):
+        """
+        Schedule a changed state for write-back.
+
+        Completed sessions are written immediately; others are batched
+        until the flush interval elapses. The caller commits.
+
+        Raises:
+            StaleSessionError: If writing the state now finds its row
+                changed by another writer; the state is dropped
+        """
+        state.dirty = True
+        if state.is_completed or self.maxsize <= 0:
+            if self._write(db, [state]):
+                raise StaleSessionError(
+                    f"Session {state.id} was changed by another request"
+                )
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush(db)
+
+    def flush(self, db: DBSession, session_id: Optional[int] = None) -> int:
+        """
+        Stage every dirty state (or just one session's) for write-back.
+
+        States whose rows were changed by another writer are dropped.
+
+        Args:
+            db: Database session; the caller commits
+            session_id: Only flush this session
+
+        Returns:
+            Number of sessions written
+        """
+        with self._lock:
+            if session_id is None:
+                dirty = [s for s in self._states.values() if s.dirty]
+                self._last_flush = time.monotonic()
+            else:
+                state = self._states.get(session_id)
+                dirty = [state] if state is not None and state.dirty else []
+        stale = self._write(db, dirty)
+        return len(dirty) - len(stale)
+
+    def _write(self, db: DBSession, states: list) -> list:
+        """Stage write-backs; returns (and drops) states that lost a race."""
+        if not states:
+            return []
+        # A state written earlier in this transaction continues from there
+        staged = db.info.setdefault(_STAGED, {})
+        rows = [s.to_row(staged[s][1] if s in staged else s.version) for s in states]
+        result = db.execute(_UPDATE, rows)
+
+        stale = []
+        if result.rowcount != len(states):
+            # Someone else moved these rows on; their stored state wins
+            expected = {
+                row["row_id"]: (row["version"], row["current_index"], row["score"])
+                for row in rows
+            }
+            current = {
+                row[0]: tuple(row[1:])
+                for row in db.execute(
+                    select(
+                        Session.id,
+                        Session.version,
+                        Session.current_index,
+                        Session.score,
+                    ).where(Session.id.in_(expected))
+                )
+            }
+            stale = [s for s in states if current.get(s.id) != expected[s.id]]
+            for state in stale:
+                self.discard(state.id)
+
+        for state, row in zip(states, rows):
+            if state not in stale:
+                staged[state] = (self, row["version"], state.progress())
+        return stale
+
+    def _restore(self, state: SessionState):
+        """Re-cache a state whose write-back was rolled back, if evicted."""
+        with self._lock:
+            if state.id not in self._states:
+                self._states[state.id] = state
+                self._states.move_to_end(state.id, last=False)
+
+    def discard(self, session_id: int):
+        """Drop a session's cached state without writing it."""
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def clear(self):
+        """Drop all cached states without writing them."""
+        with self._lock:
+            self._states.clear()
+            self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+# Write-backs staged on a DB session: state -> (cache, new version, progress)
+_STAGED = "session_state_staged"
+
+
+@event.listens_for(DBSession, "after_commit")
+def _apply_staged(db: DBSession):
+    for state, (_, version, progress) in db.info.pop(_STAGED, {}).items():
+        state.version = version
+        # Changes made after staging still need writing
+        if state.progress() == progress:
+            state.dirty = False
+
+
+@event.listens_for(DBSession, "after_rollback")
+def _restore_staged(db: DBSession):
+    for state, (cache, _, _) in db.info.pop(_STAGED, {}).items():
+        cache._restore(state)
+
+
+# Process-wide session state, shared by all requests
+session_state_cache = SessionStateCache(
+    maxsize=settings.session_state_cache_size,
+    flush_interval=settings.session_flush_interval,
+)
@@ -0,0 +1,289 @@
+"""
+Wrong Stats Buffer - Batched Wrong Answer Counters
+
+Accumulates wrong-answer increments per (deck_id, word, user_id) in process
+memory and writes them to the wrong_stats table as one batched upsert,
+every flush interval or once enough events are pending, and on shutdown.
+When a whole class takes the same deck at once this replaces one write
+(and one row lock) per wrong answer with one write per word per flush.
+
+Pending increments are lost if the process dies before a flush. Reads
+through get_wrong_words merge them in, so this process always sees fresh
+counts; other processes see them after the next flush. Increments and
+flushes follow the caller's transaction: if it rolls back, the increments
+it added are taken back and those it flushed go back into the buffer.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.sql import func
+
+from app.config import settings
+from app.models.wrong_stats import WrongStats
+
+
+def dialect_insert(db: DBSession):
+    """Get the INSERT construct with ON CONFLICT support for db, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        return pg_insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert
+    return None
+
+
+def upsert_wrong_stats(db: DBSession, rows: list[dict]):
+    """
+    Add wrong counts to wrong_stats, creating rows as needed.
+
+    One atomic INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL
+    (one per kind of row: per user, or anonymous per deck), so concurrent
+    writers can't race into the unique indexes. Other databases update in
+    place and insert on the first miss. Runs in the caller's transaction;
+    the caller commits.
+
+    Args:
+        db: Database session
+        rows: Dicts with word, deck_id, user_id, wrong_count (the increment)
+            and last_wrong_at
+    """
+    if not rows:
+        return
+
+    insert_stmt = dialect_insert(db)
+    if insert_stmt is None:
+        for row in rows:
+            _update_or_insert(db, row)
+        return
+
+    user_rows = [row for row in rows if row["user_id"] is not None]
+    anonymous_rows = [row for row in rows if row["user_id"] is None]
+    for batch, index_elements, index_where in (
+        (
+            user_rows,
+            [WrongStats.user_id, WrongStats.deck_id, WrongStats.word],
+            WrongStats.user_id.isnot(None),
+        ),
+        (
+            anonymous_rows,
+            [WrongStats.word, WrongStats.deck_id],
+            WrongStats.user_id.is_(None),
+        ),
+    ):
+        if not batch:
+            continue
+        stmt = insert_stmt(WrongStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            index_where=index_where,
+            set_={
+                "wrong_count": WrongStats.wrong_count + stmt.excluded.wrong_count,
+                "last_wrong_at": stmt.excluded.last_wrong_at,
+                "updated_at": func.now(),
+            },
+        )
+        if len(batch) == 1:
+            db.execute(stmt.values(**batch[0]))
+        else:
+            db.execute(stmt, batch)
+
+
+def _update_or_insert(db: DBSession, row: dict):
+    updated = (
+        db.query(WrongStats)
+        .filter(
+            WrongStats.owned_by(row["user_id"]),
+            WrongStats.deck_id == row["deck_id"],
+            WrongStats.word == row["word"],
+        )
+        .update(
+            {
+                WrongStats.wrong_count: WrongStats.wrong_count + row["wrong_count"],
+                WrongStats.last_wrong_at: row["last_wrong_at"],
+            },
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        db.execute(insert(WrongStats).values(**row))
+
+
+class WrongStatsBuffer:
+    """
+    Pending wrong-answer increments with periodic batched write-back.
+
+    Writes are staged on the caller's DB session; the caller commits them
+    together with its own changes.
+    """
+
+    def __init__(self, max_pending: int = 0, flush_interval: float = 5.0):
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._pending: dict = {}  # (deck_id, word, user_id) -> [count, last_wrong_at]
+        self._events = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(
+        self, db: DBSession, deck_id: int, word: str, user_id: Optional[int] = None
+    ):
+        """
+        Record one wrong answer.
+
+        With max_pending 0 the increment is written through at once;
+        otherwise it is buffered until max_pending events are pending or
+        the flush interval elapses, and taken back if the caller's
+        transaction rolls back.
+        """
+        now = datetime.utcnow()
+        if self.max_pending <= 0:
+            upsert_wrong_stats(
+                db,
+                [
+                    {
+                        "word": word,
+                        "deck_id": deck_id,
+                        "user_id": user_id,
+                        "wrong_count": 1,
+                        "last_wrong_at": now,
+                    }
+                ],
+            )
+            return
+
+        key = (deck_id, word, user_id)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [1, now]
+            else:
+                entry[0] += 1
+                entry[1] = now
+            self._events += 1
+            due = (
+                self._events >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        # Begin the transaction even if no SQL ran yet, so rolling it back
+        # fires after_rollback
+        if not db.in_transaction():
+            db.begin()
+        db.info.setdefault(_ADDED, []).append((self, key))
+        if due:
+            self.flush(db)
+
+    def pending(self, deck_id: int, user_id: Optional[int] = None) -> dict[str, int]:
+        """Get unflushed wrong counts of one user (or of anonymous sessions) by word."""
+        with self._lock:
+            return {
+                word: count
+                for (pending_deck, word, pending_user), (
+                    count,
+                    _,
+                ) in self._pending.items()
+                if pending_deck == deck_id and pending_user == user_id
+            }
+
+    def flush(self, db: DBSession) -> int:
+        """
+        Stage every pending increment as one batched upsert.
+
+        Args:
+            db: Database session; the caller commits
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._events = 0
+            self._last_flush = time.monotonic()
+
+        rows = [
+            {
+                "word": word,
+                "deck_id": deck_id,
+                "user_id": user_id,
+                "wrong_count": count,
+                "last_wrong_at": last_wrong_at,
+            }
+            for (deck_id, word, user_id), (count, last_wrong_at) in pending.items()
+        ]
+        if rows:
+            db.info.setdefault(_STAGED, []).append((self, pending))
+        upsert_wrong_stats(db, rows)
+        return len(rows)
+
+    def _restore(self, pending: dict):
+        """Put back increments whose flush was rolled back."""
+        with self._lock:
+            for key, (count, last_wrong_at) in pending.items():
+                entry = self._pending.get(key)
+                if entry is None:
+                    self._pending[key] = [count, last_wrong_at]
+                else:
+                    entry[0] += count
+                    entry[1] = max(entry[1], last_wrong_at)
+                self._events += count
+
+    def _retract(self, key: tuple):
+        """Take back one increment whose transaction was rolled back."""
+        with self._lock:
+            entry = self._pending.get(key)
+            # Gone if another transaction already flushed and committed it
+            if entry is None:
+                return
+            entry[0] -= 1
+            self._events = max(self._events - 1, 0)
+            if entry[0] <= 0:
+                del self._pending[key]
+
+    def clear(self):
+        """Drop all pending increments without writing them."""
+        with self._lock:
+            self._pending.clear()
+            self._events = 0
+            self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+# Flushes staged on a DB session: [(buffer, increments)]
+_STAGED = "wrong_stats_staged"
+
+# Increments buffered by a DB session's transaction: [(buffer, key)]
+_ADDED = "wrong_stats_added"
+
+
+@event.listens_for(DBSession, "after_commit")
+def _drop_staged(db: DBSession):
+    db.info.pop(_STAGED, None)
+    db.info.pop(_ADDED, None)
+
+
+@event.listens_for(DBSession, "after_rollback")
+def _restore_staged(db: DBSession):
+    # Flushed increments go back first, so ones this transaction added
+    # and flushed itself can then be taken back
+    for buffer, pending in db.info.pop(_STAGED, []):
+        buffer._restore(pending)
+    for buffer, key in db.info.pop(_ADDED, []):
+        buffer._retract(key)
+
+
+# Process-wide wrong answer counters, shared by all requests
+wrong_stats_buffer = WrongStatsBuffer(
+    max_pending=settings.wrong_stats_buffer_size,
+    flush_interval=settings.wrong_stats_flush_interval,
+)
@@ -9,7 +9,11 @@ import pytest
 import io
 from unittest.mock import patch, AsyncMock
 
+from fastapi.testclient import TestClient
+
+from app.main import app
 from app.models.deck import Deck, Word
+from app.models.session import Session
 
 
 class TestHealthEndpoints:
@@ -33,6 +37,21 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
 
 
+class TestDiagnosticsAPI:
+    """Test diagnostics endpoints."""
+
+    @pytest.mark.api
+    def test_engine_diagnostics(self, client):
+        """Test the selected grading engine is reported with a reason."""
+        response = client.get("/api/v1/diagnostics/engine")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["engine"] in data["candidates"]
+        assert data["candidates"][data["engine"]]["conforms"] is True
+        assert data["reason"]
+        assert data["override"] == "auto"
+
+
 class TestDecksAPI:
     """Test decks API endpoints."""
 
@@ -211,6 +230,21 @@ class TestSessionAPI:
         assert data["total"] == 3
         assert data["progress"] == "1/3"
 
+    @pytest.mark.api
+    def test_get_prompt_with_hint(self, client, create_test_deck):
+        """Test requesting a hint level with the prompt."""
+        session_response = client.post(
+            "/api/v1/session/start", json={"deck_id": create_test_deck.id}
+        )
+        session_id = session_response.json()["id"]
+
+        response = client.get(f"/api/v1/session/{session_id}/prompt?hint_level=1")
+        assert response.status_code == 200
+        assert response.json()["hint"] == "Hint: ____ (4 글자)"
+
+        response = client.get(f"/api/v1/session/{session_id}/prompt?hint_level=5")
+        assert response.status_code == 422
+
     @pytest.mark.api
     def test_submit_answer(self, client, create_test_deck):
         """Test submitting an answer."""
@@ -233,6 +267,30 @@ class TestSessionAPI:
         assert data["is_correct"] is True
         assert data["score"] == 1
 
+    @pytest.mark.api
+    def test_submit_answer_include_next(self, client, create_test_deck):
+        """Test submitting with the next prompt in the response."""
+        session_response = client.post(
+            "/api/v1/session/start", json={"deck_id": create_test_deck.id}
+        )
+        session_id = session_response.json()["id"]
+
+        response = client.post(
+            f"/api/v1/session/{session_id}/submit?include_next=true",
+            json={"answer": "탈출하다", "hint_used": 0},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["is_correct"] is True
+        assert data["next"]["word"] == "abandon"
+        assert data["next"]["current"] == 2
+
+        response = client.post(
+            f"/api/v1/session/{session_id}/submit",
+            json={"answer": "버리다", "hint_used": 0},
+        )
+        assert response.json()["next"] is None
+
     @pytest.mark.api
     def test_submit_wrong_answer(self, client, create_test_deck):
         """Test submitting wrong answer."""
@@ -309,6 +367,118 @@ class TestSessionAPI:
         data = response.json()
         assert "escape" in data["wrong_words"]
 
+    @pytest.mark.api
+    def test_start_wrong_only_session(self, client, create_test_deck, auth_headers):
+        """Test starting a review of the signed-in user's mistakes."""
+        session_response = client.post(
+            "/api/v1/session/start",
+            json={"deck_id": create_test_deck.id, "word_indices": [1]},
+            headers=auth_headers,
+        )
+        session_id = session_response.json()["id"]
+        client.post(
+            f"/api/v1/session/{session_id}/submit",
+            json={"answer": "wrong", "hint_used": 0},
+        )
+
+        response = client.post(
+            "/api/v1/session/start-wrong-only",
+            json={"deck_id": create_test_deck.id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["is_wrong_only"] is True
+        assert data["total_questions"] == 1
+
+        prompt = client.get(f"/api/v1/session/{data['id']}/prompt").json()
+        assert prompt["word"] == "abandon"
+
+        # Anonymous users have no mistakes of their own yet
+        response = client.post(
+            "/api/v1/session/start-wrong-only", json={"deck_id": create_test_deck.id}
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.api
+    def test_submit_retry_with_request_id(self, client, create_test_deck):
+        """Test retrying a submit with its request_id doesn't skip a question."""
+        session_id = client.post(
+            "/api/v1/session/start", json={"deck_id": create_test_deck.id}
+        ).json()["id"]
+        submit = {"answer": "탈출하다", "hint_used": 0, "request_id": "tap-1"}
+
+        first = client.post(f"/api/v1/session/{session_id}/submit", json=submit)
+        retry = client.post(f"/api/v1/session/{session_id}/submit", json=submit)
+
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        prompt = client.get(f"/api/v1/session/{session_id}/prompt").json()
+        assert prompt["word"] == "abandon"
+
+    @pytest.mark.api
+    def test_shutdown_writes_back_progress(self, client, db_session, create_test_deck):
+        """Test stopping the app saves progress still held in memory."""
+        session_id = client.post(
+            "/api/v1/session/start", json={"deck_id": create_test_deck.id}
+        ).json()["id"]
+        client.post(f"/api/v1/session/{session_id}/submit", json={"answer": "탈출하다"})
+
+        # Run the app's startup and shutdown once more
+        with TestClient(app):
+            pass
+
+        db_session.expire_all()
+        session = db_session.get(Session, session_id)
+        assert (session.current_index, session.score) == (1, 1)
+
+    @pytest.mark.api
+    def test_start_multi_deck_session(self, client, create_test_deck):
+        """Test starting a session over several decks."""
+        response = client.post(
+            "/api/v1/session/start-multi",
+            json={"deck_ids": [create_test_deck.id, create_test_deck.id]},
+        )
+        assert response.status_code == 200
+        assert response.json()["total_questions"] == 3
+
+        response = client.post("/api/v1/session/start-multi", json={"deck_ids": [999]})
+        assert response.status_code == 404
+
+    @pytest.mark.api
+    def test_start_review_session(self, client, create_test_deck, auth_headers):
+        """Test reviewing due cards requires sign-in and finds answered words."""
+        response = client.post(
+            "/api/v1/session/start-review", json={"deck_id": create_test_deck.id}
+        )
+        assert response.status_code in (401, 403)
+
+        # Nothing has been answered yet
+        response = client.post(
+            "/api/v1/session/start-review",
+            json={"deck_id": create_test_deck.id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
+        session_response = client.post(
+            "/api/v1/session/start",
+            json={"deck_id": create_test_deck.id, "word_indices": [0]},
+            headers=auth_headers,
+        )
+        client.post(
+            f"/api/v1/session/{session_response.json()['id']}/submit",
+            json={"answer": "wrong", "hint_used": 0},
+        )
+
+        # A missed card is due again tomorrow, not now
+        response = client.post(
+            "/api/v1/session/start-review",
+            json={"deck_id": create_test_deck.id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
 
 class TestTTSAPI:
     """Test TTS API endpoints."""
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for archiving completed sessions.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.session import Session, Answer, SessionSummary, SessionArchive
+from app.models.wrong_stats import WrongStats
+from app.schemas.session import SessionStartRequest, SubmitRequest
+from app.services.archive_service import ArchiveService
+from app.services.session_service import SessionService
+
+
+def complete_session(
+    db_session, deck_id: int, answers: list[str], days_ago: int
+) -> int:
+    """Run a session to completion, backdated by days_ago."""
+    service = SessionService(db_session)
+    session_id = service.start_session(SessionStartRequest(deck_id=deck_id)).id
+    for answer in answers:
+        service.submit_answer(session_id, SubmitRequest(answer=answer))
+
+    session = db_session.get(Session, session_id)
+    session.completed_at = datetime.utcnow() - timedelta(days=days_ago)
+    db_session.commit()
+    return session_id
+
+
+class TestArchiveService:
+    """Test moving old sessions into the archive."""
+
+    @pytest.mark.unit
+    def test_archives_only_old_completed_sessions(self, db_session, create_test_deck):
+        """Test old completed sessions move out; recent and open ones stay live."""
+        deck_id = create_test_deck.id
+        old = complete_session(
+            db_session, deck_id, ["탈출하다", "wrong", "성취하다"], days_ago=100
+        )
+        recent = complete_session(
+            db_session, deck_id, ["탈출하다", "버리다", "성취하다"], days_ago=1
+        )
+        open_id = (
+            SessionService(db_session)
+            .start_session(SessionStartRequest(deck_id=deck_id))
+            .id
+        )
+
+        archived = ArchiveService(db_session).archive_completed(
+            older_than_days=90, batch_size=1
+        )
+
+        assert archived == 1
+        assert db_session.get(Session, old) is None
+        assert db_session.query(Answer).filter(Answer.session_id == old).count() == 0
+        assert {s.id for s in db_session.query(Session)} == {recent, open_id}
+
+        archive = db_session.get(SessionArchive, old)
+        assert (archive.deck_id, archive.answer_count) == (deck_id, 3)
+        assert db_session.get(SessionSummary, old) is not None
+        assert (
+            db_session.query(WrongStats).filter(WrongStats.word == "abandon").count()
+            == 1
+        )
+
+    @pytest.mark.unit
+    def test_load_round_trips_answers(self, db_session, create_test_deck):
+        """Test an archived session decompresses with its answers in order."""
+        session_id = complete_session(
+            db_session, create_test_deck.id, ["탈출하다", "wrong", "성취하다"], days_ago=100
+        )
+        ArchiveService(db_session).archive_completed(older_than_days=90)
+
+        payload = ArchiveService(db_session).load(session_id)
+
+        assert payload["session"]["deck_name"] == create_test_deck.name
+        assert payload["session"]["score"] == 2
+        assert [answer[1:4] for answer in payload["answers"]] == [
+            ["escape", "탈출하다", True],
+            ["abandon", "wrong", False],
+            ["achieve", "성취하다", True],
+        ]
+        assert ArchiveService(db_session).load(session_id + 1) is None
+
+    @pytest.mark.unit
+    def test_summary_survives_archival(self, db_session, create_test_deck):
+        """Test get_summary serves archived sessions, rebuilding lost summaries."""
+        session_id = complete_session(
+            db_session, create_test_deck.id, ["wrong", "버리다", "성취하다"], days_ago=100
+        )
+        service = SessionService(db_session)
+        before = service.get_summary(session_id)
+
+        ArchiveService(db_session).archive_completed(older_than_days=90)
+        assert service.get_summary(session_id) == before
+
+        db_session.query(SessionSummary).delete()
+        db_session.commit()
+
+        rebuilt = service.get_summary(session_id)
+        assert (rebuilt.score, rebuilt.wrong_words) == (2, ["escape"])
+        assert rebuilt.deck_name == before.deck_name
+        assert db_session.get(SessionSummary, session_id) is not None
+
+    @pytest.mark.unit
+    def test_archived_ids_are_not_reused(self, db_session, create_test_deck):
+        """Test a session started after archival gets a fresh id and completes."""
+        deck_id = create_test_deck.id
+        archived = complete_session(
+            db_session, deck_id, ["탈출하다", "버리다", "성취하다"], days_ago=100
+        )
+        ArchiveService(db_session).archive_completed(older_than_days=90)
+
+        fresh = complete_session(
+            db_session, deck_id, ["wrong", "버리다", "성취하다"], days_ago=0
+        )
+
+        assert fresh > archived
+        service = SessionService(db_session)
+        assert service.get_summary(fresh).score == 2
+        assert service.get_summary(archived).score == 3
@@ -11,14 +11,30 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import main
 from app.database import Base, get_db
 from app.main import app
+from app.services.session_pool import session_pool
+from app.services.session_state import session_state_cache
+from app.services.wrong_stats_buffer import wrong_stats_buffer
 
 
 # In-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 
+@pytest.fixture(autouse=True)
+def reset_session_state():
+    """Drop in-memory session state; every test starts with a fresh database."""
+    session_state_cache.clear()
+    session_pool.clear()
+    wrong_stats_buffer.clear()
+    yield
+    session_state_cache.clear()
+    session_pool.clear()
+    wrong_stats_buffer.clear()
+
+
 @pytest.fixture(scope="function")
 def db_engine():
     """Create a fresh database engine for each test."""
@@ -46,7 +62,7 @@ def db_session(db_engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, db_engine, monkeypatch):
     """Create a test client with dependency overrides."""
 
     def override_get_db():
@@ -56,6 +72,10 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Shutdown writes back in-memory state; keep it in the test database
+    monkeypatch.setattr(
+        main, "SessionLocal", sessionmaker(autoflush=False, bind=db_engine)
+    )
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the grading engine parity and benchmark suite.
+
+The C++ parity check only runs when the voca_cpp extension is built.
+"""
+
+import pytest
+
+from app.core import engine_bench
+from app.core.voca_engine import CppVocaTestEngine, VocaTestEngine
+
+
+class TestCorpus:
+    """Test corpus loading and case generation."""
+
+    @pytest.mark.unit
+    def test_load_corpus_words(self):
+        """Test word lists load as non-empty (word, meaning) pairs."""
+        words = engine_bench.load_corpus_words()
+
+        assert len(words) > 0
+        assert all(word and meaning for word, meaning in words)
+
+    @pytest.mark.unit
+    def test_load_corpus_words_fallback(self, tmp_path):
+        """Test an empty directory falls back to built-in words."""
+        words = engine_bench.load_corpus_words(tmp_path)
+
+        assert words == engine_bench.FALLBACK_WORDS
+
+    @pytest.mark.unit
+    def test_load_corpus_words_cp949(self, tmp_path):
+        """Test CP949-encoded word lists are decoded."""
+        (tmp_path / "legacy.csv").write_bytes("decline,거절하다\n".encode("cp949"))
+
+        assert engine_bench.load_corpus_words(tmp_path) == [("decline", "거절하다")]
+
+    @pytest.mark.unit
+    def test_generate_cases_is_deterministic(self):
+        """Test the same seed yields the same cases."""
+        words = engine_bench.FALLBACK_WORDS
+
+        first = engine_bench.generate_cases(words, size=200, seed=7)
+        second = engine_bench.generate_cases(words, size=200, seed=7)
+
+        assert first == second
+        assert len(first) == 200
+
+    @pytest.mark.unit
+    def test_generate_cases_covers_unicode(self):
+        """Test cases include non-ASCII spaces and non-ASCII case variants."""
+        cases = engine_bench.generate_cases(engine_bench.FALLBACK_WORDS, size=500)
+
+        assert any(
+            space in answer
+            for answer, _ in cases
+            for space in engine_bench.UNICODE_SPACES
+        )
+        assert any(
+            correct == "École" and answer != correct for answer, correct in cases
+        )
+
+
+class TestParityAndBenchmark:
+    """Test parity checking and benchmark reporting."""
+
+    @pytest.mark.unit
+    def test_check_parity_reports_disagreement(self):
+        """Test a disagreeing engine shows up as a mismatch."""
+
+        class AlwaysWrong:
+            def is_correct(self, answer, correct):
+                return False
+
+        engines = {"python": VocaTestEngine(), "broken": AlwaysWrong()}
+        mismatches = engine_bench.check_parity(engines, [("버리다", "버리다"), ("x", "y")])
+
+        assert len(mismatches) == 1
+        assert mismatches[0]["answer"] == "버리다"
+        assert mismatches[0]["results"] == {"python": True, "broken": False}
+
+    @pytest.mark.unit
+    def test_benchmark_reports_stats(self):
+        """Test benchmark returns throughput and latency percentiles."""
+        cases = engine_bench.generate_cases(engine_bench.FALLBACK_WORDS, size=50)
+
+        stats = engine_bench.benchmark(VocaTestEngine(), cases, rounds=1)
+
+        assert stats["ops_per_sec"] > 0
+        assert 0 <= stats["p50_us"] <= stats["p99_us"]
+
+    @pytest.mark.unit
+    def test_native_benchmark(self):
+        """Test the in-C++ benchmark reports only when voca_cpp is built."""
+        cases = engine_bench.generate_cases(engine_bench.FALLBACK_WORDS, size=50)
+
+        stats = engine_bench.native_benchmark(cases, iterations=1)
+
+        if CppVocaTestEngine is None:
+            assert stats is None
+        else:
+            assert stats["ops_per_sec"] > 0
+            assert stats["ns_per_op"] > 0
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(
+        CppVocaTestEngine is None, reason="voca_cpp extension not built"
+    )
+    def test_cpp_engine_matches_python(self):
+        """Test the C++ and Python engines agree on the whole corpus."""
+        cases = engine_bench.generate_cases(engine_bench.load_corpus_words(), size=5000)
+        engines = {"python": VocaTestEngine(), "cpp": CppVocaTestEngine()}
+
+        assert engine_bench.check_parity(engines, cases) == []
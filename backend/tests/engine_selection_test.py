@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for process-wide grading engine selection.
+"""
+
+import pytest
+
+from app.core import engine_bench, engine_selection
+from app.core.voca_engine import VocaTestEngine
+
+
+class FakeCppEngine(VocaTestEngine):
+    """Conforming stand-in for the C++ backend."""
+
+
+class CaseSensitiveEngine:
+    """Non-conforming backend that forgets to lowercase."""
+
+    def is_correct(self, answer, correct):
+        return answer.strip() == correct.strip()
+
+
+class AsciiOnlyEngine(VocaTestEngine):
+    """Non-conforming backend that only knows ASCII spaces and case."""
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        kept = "".join(ch for ch in text if ch not in " \t\n\v\f\r'\"")
+        return "".join(chr(ord(ch) + 32) if "A" <= ch <= "Z" else ch for ch in kept)
+
+
+class TestSelectEngine:
+    """Test engine selection outcomes."""
+
+    @pytest.fixture
+    def engines(self, monkeypatch):
+        """Replace the available backends with the given mapping."""
+
+        def install(mapping):
+            monkeypatch.setattr(
+                engine_bench, "available_engines", lambda: dict(mapping)
+            )
+
+        return install
+
+    @pytest.mark.unit
+    def test_only_python_available(self, engines):
+        """Test the Python engine is chosen when it is the only backend."""
+        engines({"python": VocaTestEngine()})
+
+        selection = engine_selection.select_engine(probe_cases=100)
+
+        assert selection.name == "python"
+        assert selection.reason == "only backend available"
+        assert selection.candidates["python"]["conforms"] is True
+
+    @pytest.mark.unit
+    def test_non_conforming_backend_is_skipped(self, engines):
+        """Test a backend that disagrees with the reference is never picked."""
+        engines({"python": VocaTestEngine(), "cpp": CaseSensitiveEngine()})
+
+        selection = engine_selection.select_engine(probe_cases=100)
+
+        assert selection.name == "python"
+        assert selection.candidates["cpp"]["conforms"] is False
+        assert "cpp failed conformance" in selection.reason
+
+    @pytest.mark.unit
+    def test_golden_cases_catch_ascii_only_backend(self, engines):
+        """Test the golden cases alone reject non-ASCII space or case mistakes."""
+        engines({"python": VocaTestEngine(), "cpp": AsciiOnlyEngine()})
+
+        selection = engine_selection.select_engine(probe_cases=0)
+
+        assert selection.name == "python"
+        assert selection.candidates["cpp"]["conforms"] is False
+
+    @pytest.mark.unit
+    def test_fastest_conforming_backend_wins(self, engines, monkeypatch):
+        """Test throughput decides between conforming backends."""
+        engines({"python": VocaTestEngine(), "cpp": FakeCppEngine()})
+        speeds = {True: 1000.0, False: 5000.0}
+        monkeypatch.setattr(
+            engine_bench,
+            "benchmark",
+            lambda grader, cases, rounds=1: {
+                "ops_per_sec": speeds[
+                    isinstance(grader, engine_selection._CompiledKeyGrader)
+                ],
+                "p50_us": 1.0,
+                "p99_us": 2.0,
+            },
+        )
+
+        selection = engine_selection.select_engine(probe_cases=100)
+
+        assert selection.name == "cpp"
+        assert selection.reason.startswith("fastest conforming backend")
+
+    @pytest.mark.unit
+    def test_override_pins_backend(self, engines):
+        """Test GRADING_ENGINE pins a backend even if it is slower."""
+        engines({"python": VocaTestEngine(), "cpp": FakeCppEngine()})
+
+        selection = engine_selection.select_engine("python", probe_cases=100)
+
+        assert selection.name == "python"
+        assert selection.reason == "pinned by GRADING_ENGINE"
+        assert selection.override == "python"
+
+    @pytest.mark.unit
+    def test_override_unavailable_falls_back(self, engines):
+        """Test pinning a backend that isn't built falls back to auto."""
+        engines({"python": VocaTestEngine()})
+
+        selection = engine_selection.select_engine("cpp", probe_cases=100)
+
+        assert selection.name == "python"
+        assert selection.reason.startswith("GRADING_ENGINE=cpp is not available")
+
+
+class TestProcessWideSelection:
+    """Test the cached process-wide selection."""
+
+    @pytest.mark.unit
+    def test_selection_is_cached(self):
+        """Test repeated calls return the same selection and engine."""
+        first = engine_selection.get_engine_selection()
+
+        assert engine_selection.get_engine_selection() is first
+        assert engine_selection.get_grading_engine() is first.engine
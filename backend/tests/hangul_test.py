@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for Hangul jamo decomposition and bit-parallel edit distance.
+"""
+
+import random
+
+import pytest
+
+from app.core.hangul import BitPattern, decompose
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Reference dynamic-programming edit distance."""
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[:], i
+        for j, cb in enumerate(b, 1):
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (ca != cb))
+    return row[-1]
+
+
+class TestDecompose:
+    """Test Hangul syllable decomposition."""
+
+    @pytest.mark.unit
+    def test_decompose_syllables(self):
+        """Test syllables split into lead, vowel and optional tail jamo."""
+        assert decompose("가") == "가"
+        assert decompose("한") == "한"
+        assert len(decompose("버리다")) == 6
+
+    @pytest.mark.unit
+    def test_decompose_keeps_other_characters(self):
+        """Test non-Hangul characters pass through unchanged."""
+        assert decompose("apple") == "apple"
+        assert decompose("~에") == "~에"
+
+
+class TestBitPattern:
+    """Test bounded bit-parallel edit distance."""
+
+    @pytest.mark.unit
+    def test_one_wrong_vowel_costs_one(self):
+        """Test a wrong vowel is one jamo edit, not a whole syllable."""
+        pattern = BitPattern(decompose("버리다"))
+
+        assert pattern.distance(decompose("버라다"), 2) == 1
+        assert pattern.distance(decompose("버리다"), 2) == 0
+
+    @pytest.mark.unit
+    def test_distance_is_bounded(self):
+        """Test distances above the bound collapse to bound + 1."""
+        pattern = BitPattern("kitten")
+
+        assert pattern.distance("sitting", 3) == 3
+        assert pattern.distance("sitting", 2) == 3
+        assert pattern.distance("xyz", 1) == 2
+
+    @pytest.mark.unit
+    def test_matches_reference_distance(self):
+        """Test against dynamic programming on random strings."""
+        rng = random.Random(0)
+        for _ in range(2000):
+            a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 80)))
+            b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 80)))
+            bound = rng.randint(0, 5)
+            expected = levenshtein(a, b)
+
+            assert BitPattern(a).distance(b, bound) == min(expected, bound + 1)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for precomputed hint ladders.
+"""
+
+import pytest
+
+from app.core.hints import build_hint_ladder, make_hint
+
+
+class TestHintLadder:
+    """Test hint ladders against the per-level hint builder."""
+
+    @pytest.mark.unit
+    def test_ladder_levels(self):
+        """Test every level of a ladder."""
+        assert build_hint_ladder("탈출하다") == (
+            "Hint: ____ (4 글자)",
+            "Hint: 탈___",
+            "Hint: 탈출__",
+            "Hint: 탈출하다 (type it again)",
+        )
+
+    @pytest.mark.unit
+    def test_ladder_matches_make_hint(self):
+        """Test make_hint is a lookup into the ladder."""
+        for correct in ["a", "ab", '"a, b"', "탈출하다, 도망가다", "", " , "]:
+            ladder = build_hint_ladder(correct)
+            for level in range(1, 6):
+                assert make_hint(correct, level) == ladder[min(level, 4) - 1]
+
+    @pytest.mark.unit
+    def test_short_meanings(self):
+        """Test one-letter and empty meanings."""
+        assert build_hint_ladder("a")[2] == "Hint: _"
+        assert set(build_hint_ladder(" , ")) == {"Hint: (no letters)"}
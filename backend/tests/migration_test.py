@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Alembic migrations.
+"""
+
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect, text
+
+from app.database import Base
+from app.schemas.session import SubmitRequest
+from app.services.session_service import SessionService
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def alembic_config(connection) -> Config:
+    """Alembic config that migrates over the given connection."""
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    config.attributes["connection"] = connection
+    return config
+
+
+def schema_drift(connection) -> list:
+    """Differences between the database and the models."""
+    return compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+
+class TestMigrations:
+    """Test migrating databases created from older models."""
+
+    @pytest.mark.unit
+    def test_upgrades_original_schema(self, db_engine, db_session, create_test_deck):
+        """Test a database from before the revision upgrades and keeps its sessions."""
+        with db_engine.connect() as connection:
+            config = alembic_config(connection)
+            command.stamp(config, "head")
+            command.downgrade(config, "base")
+            columns = {c["name"] for c in inspect(connection).get_columns("sessions")}
+            assert "deck_ids" not in columns
+            session_id = connection.execute(
+                text(
+                    "INSERT INTO sessions (deck_id, word_indices, current_index, score,"
+                    " total_questions, is_completed, is_wrong_only)"
+                    " VALUES (:deck_id, '[0, 1, 2]', 0, 0, 3, 0, 0)"
+                ),
+                {"deck_id": create_test_deck.id},
+            ).lastrowid
+            connection.commit()
+
+            command.upgrade(config, "head")
+            connection.commit()
+            assert schema_drift(connection) == []
+
+        service = SessionService(db_session)
+        assert service.submit_answer(
+            session_id, SubmitRequest(answer="탈출하다")
+        ).is_correct
+        assert service.get_prompt(session_id).word == "abandon"
+
+    @pytest.mark.unit
+    def test_current_schema_is_unchanged(self, db_engine):
+        """Test upgrading a database create_all made from the current models is a no-op."""
+        with db_engine.connect() as connection:
+            command.upgrade(alembic_config(connection), "head")
+            connection.commit()
+            assert schema_drift(connection) == []
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for uniform and weighted word sampling.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from app.core.sampling import sample_indices, weighted_sample
+
+
+class TestSampling:
+    """Test sample sizes, distinctness and weighting."""
+
+    @pytest.mark.unit
+    def test_uniform_sample(self):
+        """Test a uniform sample is distinct and within range."""
+        picked = sample_indices(range(5000), 15, random.Random(1))
+
+        assert len(picked) == 15
+        assert len(set(picked)) == 15
+        assert all(0 <= i < 5000 for i in picked)
+
+    @pytest.mark.unit
+    def test_sample_larger_than_population(self):
+        """Test asking for more than there is returns everything."""
+        assert sorted(sample_indices([3, 1, 2], 10)) == [1, 2, 3]
+        assert sorted(weighted_sample([(3, 1), (1, 1)], 10)) == [1, 3]
+
+    @pytest.mark.unit
+    def test_weighted_sample_is_distinct(self):
+        """Test a weighted sample never repeats an index."""
+        items = ((i, 1 + i % 7) for i in range(5000))
+
+        picked = weighted_sample(items, 20, random.Random(2))
+
+        assert len(picked) == 20
+        assert len(set(picked)) == 20
+
+    @pytest.mark.unit
+    def test_weights_bias_the_sample(self):
+        """Test heavier items are picked proportionally more often."""
+        rng = random.Random(3)
+        counts = Counter()
+        for _ in range(4000):
+            counts.update(weighted_sample([(0, 1), (1, 3)], 1, rng))
+
+        assert counts[1] / 4000 == pytest.approx(0.75, abs=0.03)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for SM-2 review scheduling.
+"""
+
+import pytest
+
+from app.core.scheduler import (
+    DEFAULT_EASE,
+    MIN_EASE,
+    answer_quality,
+    next_schedule,
+)
+
+
+class TestScheduler:
+    """Test intervals, ease drift and answer quality."""
+
+    @pytest.mark.unit
+    def test_intervals_grow(self):
+        """Test the 1, 6, then interval times ease progression."""
+        first = next_schedule(0, 0, DEFAULT_EASE, 5)
+        second = next_schedule(*first, 5)
+        third = next_schedule(*second, 5)
+
+        assert (first.repetitions, first.interval_days) == (1, 1)
+        assert (second.repetitions, second.interval_days) == (2, 6)
+        assert third.repetitions == 3
+        assert third.interval_days == round(6 * third.ease)
+        assert first.ease == pytest.approx(2.6)
+
+    @pytest.mark.unit
+    def test_failure_restarts_card(self):
+        """Test a failed review resets repetitions and keeps the ease."""
+        schedule = next_schedule(4, 40, 2.5, 1)
+
+        assert schedule.repetitions == 0
+        assert schedule.interval_days == 1
+        assert schedule.ease == 2.5
+
+    @pytest.mark.unit
+    def test_ease_floor(self):
+        """Test ease never drops below the minimum."""
+        assert next_schedule(0, 1, MIN_EASE, 3).ease == MIN_EASE
+        assert next_schedule(0, 1, 2.5, 3).ease == pytest.approx(2.36)
+
+    @pytest.mark.unit
+    def test_answer_quality(self):
+        """Test answers map onto the 0-5 quality scale."""
+        assert answer_quality(True) == 5
+        assert answer_quality(True, is_typo=True) == 4
+        assert answer_quality(True, hint_used=1) == 3
+        assert answer_quality(False) < 3
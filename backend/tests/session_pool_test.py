@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for pooled VocaSessions behind retry sessions.
+"""
+
+import pytest
+
+from app.models.deck import Word
+from app.models.session import Answer
+from app.schemas.session import SessionStartRequest, SubmitRequest
+from app.services.session_pool import (
+    FORCED_WRONG,
+    PooledSession,
+    SessionPool,
+    session_pool,
+)
+from app.services.session_service import SessionService
+from tests.session_service_test import count_queries
+
+WORDS = [
+    (1, 1, None, "escape", "탈출하다"),
+    (2, 1, None, "abandon", "버리다"),
+    (3, 1, None, "achieve", "성취하다"),
+]
+
+
+def transcript(pooled: PooledSession) -> tuple:
+    """Current question of a live session."""
+    prompt = pooled.session.prompt()
+    return prompt.question_id, prompt.attempt, pooled.session.summary().score
+
+
+class TestPooledSession:
+    """Test locating prompts and replaying stored answers."""
+
+    @pytest.mark.unit
+    def test_locate_first_attempt_and_retry(self):
+        """Test first attempts map by position and retries by word."""
+        pooled = PooledSession(WORDS)
+
+        assert pooled.locate(pooled.session.prompt()) == (0, True)
+        pooled.submit(0, "wrong")
+        assert pooled.locate(pooled.session.prompt()) == (0, False)
+        pooled.submit(0, "탈출하다")
+        assert pooled.locate(pooled.session.prompt()) == (1, True)
+
+    @pytest.mark.unit
+    def test_locate_retry_of_repeated_word(self):
+        """Test a retry maps to the missed question, not the word's first row."""
+        pooled = PooledSession(
+            [
+                (1, 1, None, "bank", "은행"),
+                (2, 1, None, "bank", "둑"),
+                (3, 1, None, "0", "영"),
+            ]
+        )
+        pooled.submit(0, "은행")
+        pooled.submit(1, "wrong")
+
+        assert pooled.locate(pooled.session.prompt()) == (1, False)
+        assert pooled.submit(1, "둑").correct_answer == "둑"
+        assert pooled.locate(pooled.session.prompt()) == (2, True)
+
+    @pytest.mark.unit
+    def test_replay_restores_state(self):
+        """Test replaying outcomes reaches the same question and score."""
+        live = PooledSession(WORDS)
+        for answer in ["wrong", "탈출하다", "버리다", "wrong"]:
+            position, _ = live.locate(live.session.prompt())
+            live.submit(position, answer)
+
+        replayed = PooledSession(WORDS)
+        replayed.replay([False, True, True, False])
+
+        assert transcript(replayed) == transcript(live) == ("achieve", 2, 1)
+        assert replayed.retry == live.retry == 2
+
+    @pytest.mark.unit
+    def test_forced_wrong_never_matches(self):
+        """Test the forfeit answer is wrong even for an empty meaning."""
+        pooled = PooledSession([(1, 1, None, "blank", '""')])
+
+        assert pooled.session.submit(FORCED_WRONG).is_correct is False
+
+
+class TestSessionPool:
+    """Test LRU eviction by count and bytes."""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        """Test the count bound evicts the oldest untouched session."""
+        pool = SessionPool(maxsize=2)
+        pool.put(1, PooledSession(WORDS))
+        pool.put(2, PooledSession(WORDS))
+        pool.get(1)
+        pool.put(3, PooledSession(WORDS))
+
+        assert pool.get(2) is None
+        assert pool.get(1) is not None
+        assert len(pool) == 2
+
+    @pytest.mark.unit
+    def test_evicts_over_byte_budget(self):
+        """Test the byte bound evicts but always keeps the newest session."""
+        one = PooledSession(WORDS)
+        pool = SessionPool(maxsize=10, max_bytes=one.nbytes + 1)
+        pool.put(1, one)
+        pool.put(2, PooledSession(WORDS))
+
+        assert pool.get(1) is None
+        assert len(pool) == 1
+        assert pool.nbytes == one.nbytes
+
+        pool.discard(2)
+        assert pool.nbytes == 0
+
+
+class TestRetrySessions:
+    """Test SessionService running retry sessions on the pool."""
+
+    @pytest.mark.unit
+    def test_wrong_answer_is_retried_with_hint(self, db_session, create_test_deck):
+        """Test a missed word comes back at once with a hint until answered."""
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, retry_wrong=True)
+        )
+        assert started.retry_wrong is True
+
+        result = service.submit_answer(started.id, SubmitRequest(answer="wrong"))
+        assert result.next_action == "retry_same"
+        assert result.progress == "1/3"
+
+        prompt = service.get_prompt(started.id)
+        assert (prompt.word, prompt.attempt, prompt.hint_level) == ("escape", 2, 1)
+        assert prompt.hint.startswith("Hint:")
+
+        result = service.submit_answer(
+            started.id, SubmitRequest(answer="탈출하다"), include_next=True
+        )
+        assert result.is_correct is True
+        assert result.next_action == "next_question"
+        assert result.score == 0
+        assert result.next.word == "abandon"
+
+        service.submit_answer(started.id, SubmitRequest(answer="버리다", hint_used=2))
+        service.submit_answer(started.id, SubmitRequest(answer="버리다"))
+        result = service.submit_answer(started.id, SubmitRequest(answer="성취하다"))
+        assert result.next_action == "show_summary"
+
+        summary = service.get_summary(started.id)
+        assert summary.score == 1
+        assert summary.completed_at is not None
+        assert summary.wrong_words == ["escape", "abandon"]
+
+    @pytest.mark.unit
+    def test_served_hints_forfeit_retries(self, db_session, create_test_deck):
+        """Test hints asked for count at submit; a retry's own hint doesn't."""
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, retry_wrong=True)
+        )
+
+        service.get_prompt(started.id, hint_level=2)
+        result = service.submit_answer(started.id, SubmitRequest(answer="탈출하다"))
+        assert (result.is_correct, result.next_action) == (False, "retry_same")
+
+        # The retry shows its hint unasked and can still be answered
+        assert service.get_prompt(started.id).hint_level == 1
+        result = service.submit_answer(started.id, SubmitRequest(answer="탈출하다"))
+        assert (result.is_correct, result.next_action) == (True, "next_question")
+
+    @pytest.mark.unit
+    def test_submit_is_in_memory(self, db_session, db_engine, create_test_deck):
+        """Test a pooled submit only writes the answer."""
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, retry_wrong=True)
+        )
+        service.get_prompt(started.id)
+
+        with count_queries(db_engine) as log:
+            service.submit_answer(started.id, SubmitRequest(answer="탈출하다"))
+            service.get_prompt(started.id)
+
+        assert log == {"statements": ["INSERT"], "commits": 1}
+
+    @pytest.mark.unit
+    def test_rehydrates_from_answers(self, db_session, create_test_deck):
+        """Test an evicted session resumes from its stored answers."""
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, retry_wrong=True)
+        )
+        for answer in ["탈출하다", "wrong"]:
+            service.submit_answer(started.id, SubmitRequest(answer=answer))
+        before = service.get_prompt(started.id)
+
+        session_pool.clear()
+
+        after = service.get_prompt(started.id)
+        assert after == before
+        assert (after.word, after.attempt) == ("abandon", 2)
+        result = service.submit_answer(started.id, SubmitRequest(answer="버리다"))
+        assert (result.score, result.next_action) == (1, "next_question")
+
+    @pytest.mark.unit
+    def test_repeated_word_is_graded_as_itself(self, db_session, create_test_deck):
+        """Test a missed word that shares its text with another keeps its own row."""
+        deck_id = create_test_deck.id
+        db_session.add(
+            Word(deck_id=deck_id, word="escape", meaning="도망", index_in_deck=3)
+        )
+        db_session.commit()
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=deck_id, word_indices=[0, 3], retry_wrong=True)
+        )
+
+        service.submit_answer(started.id, SubmitRequest(answer="탈출하다"))
+        service.submit_answer(started.id, SubmitRequest(answer="wrong"))
+        prompt = service.get_prompt(started.id, hint_level=1)
+        assert (prompt.index, prompt.progress, prompt.current) == (1, "2/2", 2)
+        assert prompt.hint == "Hint: __ (2 글자)"
+
+        result = service.submit_answer(started.id, SubmitRequest(answer="도망"))
+        assert (result.is_correct, result.correct_answer) == (True, "도망")
+        answers = db_session.query(Answer.word_id).filter(
+            Answer.session_id == started.id
+        )
+        word_ids = [word_id for (word_id,) in answers.order_by(Answer.id)]
+        assert len(set(word_ids)) == 2
+        assert word_ids[1:] == [word_ids[1]] * 2
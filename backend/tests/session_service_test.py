@@ -5,14 +5,48 @@ Unit tests for Session Service.
 Tests verify session management logic without external dependencies.
 """
 
+import random
+
 import pytest
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
 
-from app.services.session_service import SessionService
+from app.services import session_service
+from app.services.session_service import SessionService, answer_key_cache
 from app.models.deck import Deck, Word
-from app.models.session import Session, Answer
+from app.models.session import Session, Answer, SessionSummary
 from app.models.wrong_stats import WrongStats
-from app.schemas.session import SessionStartRequest, SubmitRequest
+from app.models.review import ReviewState
+from app.core.scheduler import HINTED, PERFECT, TYPO, WRONG, next_schedule
+from app.schemas.session import (
+    MultiDeckSessionRequest,
+    ReviewSessionRequest,
+    SessionStartRequest,
+    SubmitRequest,
+    WrongOnlySessionRequest,
+)
+
+
+@contextmanager
+def count_queries(engine):
+    """Record SQL statements and commits issued on an engine."""
+    log = {"statements": [], "commits": 0}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        log["statements"].append(statement.split()[0])
+
+    def on_commit(conn):
+        log["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine, "commit", on_commit)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(engine, "commit", on_commit)
 
 
 class TestSessionService:
@@ -95,6 +129,23 @@ class TestSessionService:
         assert prompt.total == 3
         assert prompt.progress == "1/3"
 
+    @pytest.mark.unit
+    def test_get_prompt_with_hint(self, db_session, create_test_deck):
+        """Test prompts serve the requested precomputed hint level."""
+        service = SessionService(db_session)
+        request = SessionStartRequest(deck_id=create_test_deck.id)
+        session_response = service.start_session(request)
+
+        assert service.get_prompt(session_response.id).hint == ""
+
+        prompt = service.get_prompt(session_response.id, hint_level=2)
+        assert prompt.hint_level == 2
+        assert prompt.hint == "Hint: 탈___"
+        assert (
+            service.get_prompt(session_response.id, 4).hint
+            == "Hint: 탈출하다 (type it again)"
+        )
+
     @pytest.mark.unit
     def test_get_prompt_invalid_session(self, db_session):
         """Test getting prompt for non-existent session."""
@@ -183,6 +234,49 @@ class TestSessionService:
         assert stats is not None
         assert stats.wrong_count == 1
 
+    @pytest.mark.unit
+    def test_submit_answer_round_trips(self, db_session, db_engine, create_test_deck):
+        """Test a submit is one read plus one write transaction."""
+        service = SessionService(db_session)
+        session_response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 1, 2])
+        )
+        db_session.add(
+            WrongStats(word="abandon", deck_id=create_test_deck.id, wrong_count=1)
+        )
+        db_session.commit()
+
+        with count_queries(db_engine) as correct:
+            service.submit_answer(session_response.id, SubmitRequest(answer="탈출하다"))
+        with count_queries(db_engine) as wrong:
+            service.submit_answer(session_response.id, SubmitRequest(answer="wrong"))
+
+        assert correct == {"statements": ["SELECT", "INSERT"], "commits": 1}
+        assert wrong == {"statements": ["SELECT", "INSERT", "INSERT"], "commits": 1}
+
+    @pytest.mark.unit
+    def test_submit_answer_include_next(self, db_session, db_engine, create_test_deck):
+        """Test the next prompt comes back from the same read."""
+        service = SessionService(db_session)
+        session_response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 2])
+        )
+
+        with count_queries(db_engine) as log:
+            result = service.submit_answer(
+                session_response.id, SubmitRequest(answer="탈출하다"), include_next=True
+            )
+
+        assert log == {"statements": ["SELECT", "INSERT"], "commits": 1}
+        assert result.next == service.get_prompt(session_response.id)
+        assert result.next.word == "achieve"
+        assert result.next.progress == "2/2"
+
+        last = service.submit_answer(
+            session_response.id, SubmitRequest(answer="성취하다"), include_next=True
+        )
+        assert last.next is None
+
     @pytest.mark.unit
     def test_submit_answer_with_hints(self, db_session, create_test_deck):
         """Test that using 2+ hints marks answer as wrong."""
@@ -203,6 +297,53 @@ class TestSessionService:
         assert result.is_correct is False  # Marked wrong due to hints
         assert result.score == 0
 
+    @pytest.mark.unit
+    def test_submit_counts_served_hints(self, db_session, create_test_deck):
+        """Test hints the server served count at submit, whatever the client reports."""
+        service = SessionService(db_session)
+        session_id = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id)
+        ).id
+
+        service.get_prompt(session_id, hint_level=4)
+        result = service.submit_answer(
+            session_id, SubmitRequest(answer="탈출하다", hint_used=0)
+        )
+        assert (result.is_correct, result.score) == (False, 0)
+
+        # One hint is allowed, and hints don't carry over to the next question
+        service.get_prompt(session_id, hint_level=1)
+        result = service.submit_answer(session_id, SubmitRequest(answer="버리다"))
+        assert (result.is_correct, result.score) == (True, 1)
+
+        hints = db_session.query(Answer.hint_used).filter(
+            Answer.session_id == session_id
+        )
+        assert [hint_used for (hint_used,) in hints.order_by(Answer.id)] == [4, 1]
+
+    @pytest.mark.unit
+    def test_submit_answer_typo_tolerant(self, db_session, create_test_deck):
+        """Test near-misses count as correct only in typo-tolerant sessions."""
+        service = SessionService(db_session)
+        exact = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0])
+        )
+        tolerant = service.start_session(
+            SessionStartRequest(
+                deck_id=create_test_deck.id, word_indices=[0], max_typo_distance=1
+            )
+        )
+        assert tolerant.max_typo_distance == 1
+
+        typo = SubmitRequest(answer="탈출허다", hint_used=0)  # One wrong vowel
+        exact_result = service.submit_answer(exact.id, typo)
+        tolerant_result = service.submit_answer(tolerant.id, typo)
+
+        assert exact_result.is_correct is False
+        assert tolerant_result.is_correct is True
+        assert tolerant_result.is_typo is True
+        assert tolerant_result.score == 1
+
     @pytest.mark.unit
     def test_submit_answer_advances_session(self, db_session, create_test_deck):
         """Test that submitting answer advances to next question."""
@@ -276,6 +417,45 @@ class TestSessionService:
         assert summary.percentage == 50.0
         assert "abandon" in summary.wrong_words
 
+    @pytest.mark.unit
+    def test_summary_materialized_on_completion(
+        self, db_session, db_engine, create_test_deck
+    ):
+        """Test completing a session stores its summary for one-read views."""
+        service = SessionService(db_session)
+        session_response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 1, 2])
+        )
+        for answer in ["wrong", "버리다", "wrong"]:
+            service.submit_answer(session_response.id, SubmitRequest(answer=answer))
+
+        stored = db_session.get(SessionSummary, session_response.id)
+        assert stored.wrong_words == ["escape", "achieve"]
+        assert stored.percentage == 33.33
+
+        db_session.expire_all()
+        with count_queries(db_engine) as log:
+            summary = service.get_summary(session_response.id)
+
+        assert log == {"statements": ["SELECT"], "commits": 0}
+        assert summary.wrong_words == ["escape", "achieve"]
+        assert summary.completed_at is not None
+
+    @pytest.mark.unit
+    def test_summary_of_unfinished_session(self, db_session, create_test_deck):
+        """Test an unfinished session is summarized live and not stored."""
+        service = SessionService(db_session)
+        session_response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 1])
+        )
+        service.submit_answer(session_response.id, SubmitRequest(answer="wrong"))
+
+        summary = service.get_summary(session_response.id)
+
+        assert summary.wrong_words == ["escape"]
+        assert summary.completed_at is None
+        assert db_session.get(SessionSummary, session_response.id) is None
+
     @pytest.mark.unit
     def test_get_wrong_words(self, db_session, create_test_deck):
         """Test getting wrong words for a deck."""
@@ -312,6 +492,464 @@ class TestSessionService:
         assert "escape" in wrong_words
         assert "abandon" not in wrong_words
 
+    @pytest.mark.unit
+    def test_wrong_stats_are_per_user(self, db_session, create_test_deck, test_user):
+        """Test each user's mistakes are counted apart from anonymous ones."""
+        service = SessionService(db_session)
+        deck_id = create_test_deck.id
+
+        service._update_wrong_stats("escape", deck_id, test_user.id)
+        service._update_wrong_stats("escape", deck_id, test_user.id)
+        service._update_wrong_stats("abandon", deck_id)
+        db_session.commit()
+
+        counts = {
+            (s.user_id, s.word): s.wrong_count for s in db_session.query(WrongStats)
+        }
+        assert counts == {(test_user.id, "escape"): 2, (None, "abandon"): 1}
+        assert service.get_wrong_words(deck_id, user_id=test_user.id) == ["escape"]
+        assert service.get_wrong_words(deck_id) == ["abandon"]
+
+    @pytest.mark.unit
+    def test_start_wrong_only_session(
+        self, db_session, db_engine, create_test_deck, test_user
+    ):
+        """Test a wrong-only session resolves its word indices in one query."""
+        service = SessionService(db_session)
+        deck_id = create_test_deck.id
+        db_session.add_all(
+            [
+                WrongStats(
+                    word="achieve", deck_id=deck_id, user_id=test_user.id, wrong_count=2
+                ),
+                WrongStats(
+                    word="escape", deck_id=deck_id, user_id=test_user.id, wrong_count=1
+                ),
+                WrongStats(word="abandon", deck_id=deck_id, wrong_count=5),
+            ]
+        )
+        db_session.commit()
+        user_id = test_user.id
+
+        with count_queries(db_engine) as log:
+            response = service.start_wrong_only_session(
+                WrongOnlySessionRequest(deck_id=deck_id), user_id
+            )
+
+        assert log["statements"][:2] == ["SELECT", "INSERT"]
+        assert response.is_wrong_only is True
+        assert response.total_questions == 2
+        session = db_session.get(Session, response.id)
+        assert session.user_id == test_user.id
+        assert session.word_indices == [0, 2]
+
+        response = service.start_wrong_only_session(
+            WrongOnlySessionRequest(deck_id=deck_id, min_wrong_count=2), test_user.id
+        )
+        assert db_session.get(Session, response.id).word_indices == [2]
+
+    @pytest.mark.unit
+    def test_start_wrong_only_session_without_mistakes(
+        self, db_session, create_test_deck
+    ):
+        """Test starting a wrong-only session with nothing to review fails."""
+        service = SessionService(db_session)
+
+        with pytest.raises(ValueError, match="No wrong words"):
+            service.start_wrong_only_session(
+                WrongOnlySessionRequest(deck_id=create_test_deck.id)
+            )
+
+    @pytest.mark.unit
+    def test_submit_schedules_review(self, db_session, create_test_deck, test_user):
+        """Test signed-in answers schedule each word with SM-2."""
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 1]),
+            test_user.id,
+        )
+
+        service.submit_answer(session.id, SubmitRequest(answer="탈출하다"))
+        service.submit_answer(session.id, SubmitRequest(answer="wrong"))
+
+        states = {
+            s.word.word: s
+            for s in db_session.query(ReviewState).filter(
+                ReviewState.user_id == test_user.id
+            )
+        }
+        assert states["escape"].repetitions == 1
+        assert states["escape"].interval_days == 1
+        assert states["abandon"].repetitions == 0
+        assert states["abandon"].interval_days == 1
+        assert states["escape"].due_at > states["escape"].last_reviewed_at
+
+    @pytest.mark.unit
+    def test_signed_in_submit_round_trips(
+        self, db_session, db_engine, create_test_deck, test_user
+    ):
+        """Test scheduling a signed-in answer adds one write and no read."""
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0, 1, 0, 2]),
+            test_user.id,
+        )
+
+        with count_queries(db_engine) as first:
+            service.submit_answer(session.id, SubmitRequest(answer="탈출하다"))
+        with count_queries(db_engine) as wrong:
+            service.submit_answer(session.id, SubmitRequest(answer="wrong"))
+        with count_queries(db_engine) as again:
+            service.submit_answer(session.id, SubmitRequest(answer="탈출하다"))
+
+        assert first == {"statements": ["SELECT", "INSERT", "INSERT"], "commits": 1}
+        assert wrong == {
+            "statements": ["SELECT", "INSERT", "INSERT", "INSERT"],
+            "commits": 1,
+        }
+        assert again == first
+        escape = (
+            db_session.query(ReviewState).filter(ReviewState.interval_days == 6).one()
+        )
+        assert escape.repetitions == 2
+
+    @pytest.mark.unit
+    def test_review_update_matches_scheduler(
+        self, db_session, create_test_deck, test_user
+    ):
+        """Test the SQL review update reschedules exactly like next_schedule."""
+        service = SessionService(db_session)
+        word_id = db_session.query(Word.id).filter(Word.word == "escape").scalar()
+        state = ReviewState(
+            user_id=test_user.id,
+            word_id=word_id,
+            deck_id=create_test_deck.id,
+            repetitions=0,
+            interval_days=0,
+            ease=2.5,
+            due_at=datetime.utcnow(),
+        )
+        db_session.add(state)
+        db_session.commit()
+
+        stored_states = [
+            (0, 0, 2.5),
+            (1, 1, 2.5),
+            (2, 6, 2.5),
+            (3, 5, 2.5),
+            (6, 40, 1.3),
+            (4, 1, 1.36),
+        ]
+        for repetitions, interval_days, ease in stored_states:
+            for quality in (PERFECT, TYPO, HINTED, WRONG):
+                state.repetitions, state.interval_days, state.ease = (
+                    repetitions,
+                    interval_days,
+                    ease,
+                )
+                db_session.commit()
+
+                service._record_review(
+                    test_user.id, word_id, create_test_deck.id, quality
+                )
+                db_session.commit()
+                db_session.refresh(state)
+
+                expected = next_schedule(repetitions, interval_days, ease, quality)
+                assert (state.repetitions, state.interval_days) == expected[:2]
+                assert state.ease == pytest.approx(expected.ease)
+                assert state.due_at - state.last_reviewed_at == timedelta(
+                    days=expected.interval_days
+                )
+
+    @pytest.mark.unit
+    def test_anonymous_submit_skips_review(self, db_session, create_test_deck):
+        """Test anonymous sessions don't create review state."""
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id)
+        )
+
+        service.submit_answer(session.id, SubmitRequest(answer="탈출하다"))
+
+        assert db_session.query(ReviewState).count() == 0
+
+    @pytest.mark.unit
+    def test_start_review_session(self, db_session, create_test_deck, test_user):
+        """Test a review session takes the most overdue cards first."""
+        service = SessionService(db_session)
+        words = {
+            w.word: w
+            for w in db_session.query(Word).filter(Word.deck_id == create_test_deck.id)
+        }
+        now = datetime.utcnow()
+        for word, due_in in [("escape", -1), ("abandon", 3), ("achieve", -5)]:
+            db_session.add(
+                ReviewState(
+                    user_id=test_user.id,
+                    word_id=words[word].id,
+                    deck_id=create_test_deck.id,
+                    due_at=now + timedelta(days=due_in),
+                )
+            )
+        db_session.commit()
+
+        response = service.start_review_session(
+            ReviewSessionRequest(deck_id=create_test_deck.id), test_user.id
+        )
+
+        assert response.is_review is True
+        assert db_session.get(Session, response.id).word_indices == [2, 0]
+
+        response = service.start_review_session(
+            ReviewSessionRequest(deck_id=create_test_deck.id, limit=1), test_user.id
+        )
+        assert db_session.get(Session, response.id).word_indices == [2]
+
+    @pytest.mark.unit
+    def test_start_review_session_nothing_due(
+        self, db_session, create_test_deck, test_user
+    ):
+        """Test starting a review with no due cards fails."""
+        service = SessionService(db_session)
+
+        with pytest.raises(ValueError, match="No cards due"):
+            service.start_review_session(
+                ReviewSessionRequest(deck_id=create_test_deck.id), test_user.id
+            )
+
+    @pytest.mark.unit
+    def test_start_session_sampled(self, db_session, create_test_deck):
+        """Test a sampled session quizzes distinct words of the deck."""
+        service = SessionService(db_session)
+
+        response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, sample_size=2)
+        )
+
+        indices = db_session.get(Session, response.id).word_indices
+        assert response.total_questions == 2
+        assert len(set(indices)) == 2
+        assert set(indices) <= {0, 1, 2}
+
+        response = service.start_session(
+            SessionStartRequest(
+                deck_id=create_test_deck.id, word_indices=[0, 2], sample_size=5
+            )
+        )
+        assert sorted(db_session.get(Session, response.id).word_indices) == [0, 2]
+
+    @pytest.mark.unit
+    def test_start_session_warms_opening_questions(
+        self, db_session, create_test_deck, monkeypatch
+    ):
+        """Test a start builds answer keys for its first questions only."""
+        service = SessionService(db_session)
+        answer_key_cache.clear()
+
+        response = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[2])
+        )
+        assert response.total_questions == 1
+        assert len(answer_key_cache) == 1
+
+        answer_key_cache.clear()
+        monkeypatch.setattr(session_service, "WARM_QUESTIONS", 2)
+        service.start_session(SessionStartRequest(deck_id=create_test_deck.id))
+        assert len(answer_key_cache) == 2
+
+    @pytest.mark.unit
+    def test_start_session_weighted_by_wrong(
+        self, db_session, create_test_deck, test_user
+    ):
+        """Test weighted sampling favours the user's frequently missed words."""
+        service = SessionService(db_session)
+        db_session.add_all(
+            [
+                WrongStats(
+                    word="achieve",
+                    deck_id=create_test_deck.id,
+                    user_id=test_user.id,
+                    wrong_count=10000,
+                ),
+                WrongStats(
+                    word="escape", deck_id=create_test_deck.id, wrong_count=10000
+                ),
+            ]
+        )
+        db_session.commit()
+        random.seed(4)
+
+        picks = [
+            db_session.get(
+                Session,
+                service.start_session(
+                    SessionStartRequest(
+                        deck_id=create_test_deck.id, sample_size=1, weight_by_wrong=True
+                    ),
+                    test_user.id,
+                ).id,
+            ).word_indices[0]
+            for _ in range(5)
+        ]
+
+        assert picks == [2] * 5
+
+    @pytest.mark.unit
+    def test_multi_deck_session(self, db_session, db_engine, create_test_deck):
+        """Test a session over two decks walks both through one virtual index."""
+        other = Deck(name="Nature", is_public=True)
+        db_session.add(other)
+        db_session.commit()
+        db_session.add_all(
+            [
+                Word(deck_id=other.id, word="river", meaning="강", index_in_deck=0),
+                Word(deck_id=other.id, word="mountain", meaning="산", index_in_deck=1),
+            ]
+        )
+        db_session.commit()
+        service = SessionService(db_session)
+
+        response = service.start_multi_deck_session(
+            MultiDeckSessionRequest(deck_ids=[other.id, create_test_deck.id, other.id])
+        )
+
+        assert response.deck_id == other.id
+        assert response.deck_ids == [other.id, create_test_deck.id]
+        assert response.total_questions == 5
+        session = db_session.get(Session, response.id)
+        assert session.index_blob is None
+        assert session.deck_offsets == [0, 2]
+
+        words = []
+        answers = {
+            "river": "강",
+            "mountain": "wrong",
+            "escape": "탈출하다",
+            "abandon": "wrong",
+            "achieve": "성취하다",
+        }
+        for _ in range(5):
+            word = service.get_prompt(response.id).word
+            words.append(word)
+            with count_queries(db_engine) as log:
+                service.submit_answer(response.id, SubmitRequest(answer=answers[word]))
+            assert log["statements"][0] == "SELECT"
+
+        assert words == ["river", "mountain", "escape", "abandon", "achieve"]
+        assert service.get_wrong_words(other.id) == ["mountain"]
+        assert service.get_wrong_words(create_test_deck.id) == ["abandon"]
+
+        summary = service.get_summary(response.id)
+        assert summary.deck_name == "Nature, Test Deck"
+        assert summary.score == 3
+        assert summary.wrong_words == ["mountain", "abandon"]
+
+    @pytest.mark.unit
+    def test_multi_deck_session_sampled(self, db_session, create_test_deck):
+        """Test sampling a multi-deck session and including next prompts."""
+        service = SessionService(db_session)
+
+        response = service.start_multi_deck_session(
+            MultiDeckSessionRequest(deck_ids=[create_test_deck.id], sample_size=2)
+        )
+        assert response.deck_ids is None
+        assert response.total_questions == 2
+
+        first = service.get_prompt(response.id)
+        result = service.submit_answer(
+            response.id, SubmitRequest(answer="x"), include_next=True
+        )
+        assert result.next.word != first.word
+
+        with pytest.raises(ValueError, match="Deck 999 not found"):
+            service.start_multi_deck_session(
+                MultiDeckSessionRequest(deck_ids=[create_test_deck.id, 999])
+            )
+
+    @pytest.mark.unit
+    def test_retried_submit_is_answered_once(
+        self, db_session, db_engine, create_test_deck
+    ):
+        """Test a retry with the same request_id replays the first response."""
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id)
+        )
+        request = SubmitRequest(answer="탈출하다", request_id="r-1")
+
+        first = service.submit_answer(session.id, request)
+        with count_queries(db_engine) as log:
+            again = service.submit_answer(session.id, request)
+
+        assert again == first
+        assert log == {"statements": [], "commits": 0}
+        assert first.score == 1
+        assert first.progress == "1/3"
+        assert (
+            db_session.query(Answer).filter(Answer.session_id == session.id).count()
+            == 1
+        )
+
+        second = service.submit_answer(
+            session.id, SubmitRequest(answer="버리다", request_id="r-2")
+        )
+        assert second.progress == "2/3"
+
+    @pytest.mark.unit
+    def test_retry_replayed_from_database(self, db_session, create_test_deck):
+        """Test a retry reaching a process without the response in memory."""
+        from app.services.session_state import session_state_cache
+
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id)
+        )
+        first = service.submit_answer(
+            session.id,
+            SubmitRequest(answer="wrong", request_id="r-1"),
+            include_next=True,
+        )
+        service.submit_answer(session.id, SubmitRequest(answer="버리다", request_id="r-2"))
+        session_state_cache.flush(db_session)
+        db_session.commit()
+        session_state_cache.clear()
+
+        replay = service.submit_answer(
+            session.id, SubmitRequest(answer="wrong", request_id="r-1")
+        )
+
+        assert replay == first
+        assert replay.next.word == "abandon"
+        state = session_state_cache.get(db_session, session.id)
+        assert (state.current_index, state.score) == (2, 1)
+        assert service.get_wrong_words(create_test_deck.id) == ["escape"]
+
+    @pytest.mark.unit
+    def test_retry_after_completion(self, db_session, create_test_deck):
+        """Test the last answer can be retried once the session is completed."""
+        from app.services.session_state import session_state_cache
+
+        service = SessionService(db_session)
+        session = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id, word_indices=[0])
+        )
+        last = service.submit_answer(
+            session.id, SubmitRequest(answer="탈출하다", request_id="end")
+        )
+        session_state_cache.clear()
+
+        assert (
+            service.submit_answer(
+                session.id, SubmitRequest(answer="탈출하다", request_id="end")
+            )
+            == last
+        )
+        with pytest.raises(ValueError, match="already completed"):
+            service.submit_answer(
+                session.id, SubmitRequest(answer="탈출하다", request_id="new")
+            )
+
     @pytest.mark.unit
     def test_update_wrong_stats_creates_new(self, db_session, create_test_deck):
         """Test that wrong stats are created if not exist."""
@@ -331,6 +969,23 @@ class TestSessionService:
         assert stats is not None
         assert stats.wrong_count == 1
 
+    @pytest.mark.unit
+    def test_update_wrong_stats_is_one_upsert(
+        self, db_session, db_engine, create_test_deck
+    ):
+        """Test wrong stats are created and incremented by a single statement."""
+        service = SessionService(db_session)
+
+        with count_queries(db_engine) as log:
+            service._update_wrong_stats("escape", create_test_deck.id)
+            service._update_wrong_stats("escape", create_test_deck.id)
+        db_session.commit()
+
+        assert log["statements"] == ["INSERT", "INSERT"]
+        stats = db_session.query(WrongStats).filter(WrongStats.word == "escape").one()
+        assert stats.wrong_count == 2
+        assert stats.updated_at is not None
+
     @pytest.mark.unit
     def test_update_wrong_stats_increments_existing(self, db_session, create_test_deck):
         """Test that wrong stats are incremented if exist."""
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the write-behind session state cache.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.session import Session
+from app.schemas.session import SessionStartRequest, SubmitRequest
+from app.services.session_service import SessionService
+from app.services.session_state import (
+    SessionState,
+    SessionStateCache,
+    StaleSessionError,
+    session_state_cache,
+)
+
+
+@pytest.fixture
+def quiz_session(db_session, create_test_deck):
+    """Session row over the three test words."""
+    session = Session(
+        deck_id=create_test_deck.id,
+        word_indices=[0, 1, 2],
+        current_index=0,
+        score=0,
+        total_questions=3,
+    )
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def stored(db_session, session_id: int) -> Session:
+    """Read the sessions row as committed."""
+    db_session.expire_all()
+    return db_session.query(Session).filter(Session.id == session_id).first()
+
+
+class TestSessionStateCache:
+    """Test caching, write-behind and eviction of session state."""
+
+    @pytest.mark.unit
+    def test_loads_from_database(self, db_session, quiz_session):
+        """Test a miss loads the row and later hits reuse the state."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+
+        state = cache.get(db_session, quiz_session.id)
+
+        assert list(state.indices) == [0, 1, 2]
+        assert state.indices == range(3)
+        assert cache.get(db_session, quiz_session.id) is state
+        assert cache.get(db_session, 999) is None
+
+    @pytest.mark.unit
+    def test_writes_behind_until_flush(self, db_session, quiz_session):
+        """Test progress stays in memory until flushed."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+
+        state.advance(True)
+        cache.write_behind(db_session, state)
+        db_session.commit()
+        assert stored(db_session, quiz_session.id).current_index == 0
+
+        assert cache.flush(db_session) == 1
+        db_session.commit()
+        row = stored(db_session, quiz_session.id)
+        assert (row.current_index, row.score) == (1, 1)
+        assert cache.flush(db_session) == 0
+
+    @pytest.mark.unit
+    def test_completion_writes_immediately(self, db_session, quiz_session):
+        """Test the last answer writes the completed session."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+
+        for _ in range(3):
+            state.advance(False)
+            cache.write_behind(db_session, state)
+        db_session.commit()
+
+        row = stored(db_session, quiz_session.id)
+        assert row.is_completed is True
+        assert row.completed_at is not None
+        assert row.current_index == 3
+
+    @pytest.mark.unit
+    def test_interval_flush(self, db_session, quiz_session):
+        """Test an elapsed flush interval writes on the next change."""
+        cache = SessionStateCache(maxsize=8, flush_interval=0)
+        state = cache.get(db_session, quiz_session.id)
+
+        state.advance(True)
+        cache.write_behind(db_session, state)
+        db_session.commit()
+
+        assert stored(db_session, quiz_session.id).current_index == 1
+
+    @pytest.mark.unit
+    def test_eviction_writes_dirty_state(
+        self, db_session, quiz_session, create_test_deck
+    ):
+        """Test the LRU writes a dirty entry back before dropping it."""
+        other = Session(
+            deck_id=create_test_deck.id, word_indices=[0], total_questions=1
+        )
+        db_session.add(other)
+        db_session.commit()
+
+        cache = SessionStateCache(maxsize=1, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+        state.advance(True)
+        cache.write_behind(db_session, state)
+
+        cache.get(db_session, other.id)
+        db_session.commit()
+
+        assert len(cache) == 1
+        assert stored(db_session, quiz_session.id).current_index == 1
+
+    @pytest.mark.unit
+    def test_write_bumps_version(self, db_session, quiz_session):
+        """Test every write-back moves the row version on by one."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+
+        for expected in (1, 2):
+            state.advance(True)
+            cache.write_behind(db_session, state)
+            assert cache.flush(db_session) == 1
+            db_session.commit()
+            assert state.version == expected
+            assert stored(db_session, quiz_session.id).version == expected
+
+    @pytest.mark.unit
+    def test_rolled_back_write_is_retried(self, db_session, quiz_session):
+        """Test a write-back only counts once its transaction commits."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+
+        state.advance(True)
+        assert cache.flush(db_session) == 1
+        db_session.rollback()
+        assert (state.version, state.dirty) == (0, True)
+
+        state.advance(False)
+        assert cache.flush(db_session) == 1
+        db_session.commit()
+
+        assert cache.get(db_session, quiz_session.id) is state
+        assert (state.version, state.dirty) == (1, False)
+        row = stored(db_session, quiz_session.id)
+        assert (row.current_index, row.score, row.version) == (2, 1, 1)
+
+    @pytest.mark.unit
+    def test_eviction_commits(self, db_session, quiz_session, create_test_deck):
+        """Test an eviction is committed by the cache, not left to the caller."""
+        other = Session(
+            deck_id=create_test_deck.id, word_indices=[0], total_questions=1
+        )
+        db_session.add(other)
+        db_session.commit()
+
+        cache = SessionStateCache(maxsize=1, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+        state.advance(True)
+        cache.get(db_session, other.id)
+        db_session.rollback()
+
+        assert (state.version, state.dirty) == (1, False)
+        assert stored(db_session, quiz_session.id).current_index == 1
+
+    @pytest.mark.unit
+    def test_failed_eviction_keeps_state(
+        self, db_session, quiz_session, create_test_deck
+    ):
+        """Test an entry whose eviction fails to commit is cached again."""
+        other = Session(
+            deck_id=create_test_deck.id, word_indices=[0], total_questions=1
+        )
+        db_session.add(other)
+        db_session.commit()
+
+        cache = SessionStateCache(maxsize=1, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+        state.advance(True)
+
+        def fail(session):
+            raise RuntimeError("commit failed")
+
+        event.listen(db_session, "before_commit", fail)
+        try:
+            with pytest.raises(RuntimeError):
+                cache.get(db_session, other.id)
+        finally:
+            event.remove(db_session, "before_commit", fail)
+
+        assert cache.get(db_session, quiz_session.id) is state
+        assert state.dirty is True
+        assert stored(db_session, quiz_session.id).current_index == 0
+
+    @pytest.mark.unit
+    def test_change_after_staging_stays_dirty(self, db_session, quiz_session):
+        """Test progress made after a write-back was staged is written later."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+
+        state.advance(True)
+        cache.flush(db_session)
+        state.advance(True)
+        db_session.commit()
+
+        assert (state.version, state.dirty) == (1, True)
+        assert cache.flush(db_session) == 1
+        db_session.commit()
+        assert stored(db_session, quiz_session.id).current_index == 2
+
+    @pytest.mark.unit
+    def test_stale_write_is_dropped(self, db_session, quiz_session):
+        """Test a state whose row moved on elsewhere doesn't overwrite it."""
+        first = SessionStateCache(maxsize=8, flush_interval=60)
+        second = SessionStateCache(maxsize=8, flush_interval=60)
+        mine = first.get(db_session, quiz_session.id)
+        theirs = second.get(db_session, quiz_session.id)
+
+        theirs.advance(True)
+        theirs.advance(True)
+        second.write_behind(db_session, theirs)
+        second.flush(db_session)
+        mine.advance(False)
+        first.write_behind(db_session, mine)
+
+        assert first.flush(db_session) == 0
+        db_session.commit()
+        assert len(first) == 0
+        row = stored(db_session, quiz_session.id)
+        assert (row.current_index, row.score, row.version) == (2, 2, 1)
+
+    @pytest.mark.unit
+    def test_stale_completion_raises(self, db_session, quiz_session):
+        """Test completing a session whose row moved on elsewhere fails."""
+        cache = SessionStateCache(maxsize=8, flush_interval=60)
+        state = cache.get(db_session, quiz_session.id)
+        db_session.query(Session).filter(Session.id == quiz_session.id).update(
+            {Session.version: 5}
+        )
+
+        state.advance(True)
+        state.advance(True)
+        state.advance(True)
+        with pytest.raises(StaleSessionError):
+            cache.write_behind(db_session, state)
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_checkpoint_rollback(self, quiz_session):
+        """Test rolling back undoes an advance."""
+        state = SessionState(quiz_session)
+        checkpoint = state.checkpoint()
+
+        state.advance(True)
+        state.rollback(checkpoint)
+
+        assert (state.current_index, state.score, state.dirty) == (0, 0, False)
+
+    @pytest.mark.unit
+    def test_state_from_new_session(self, quiz_session):
+        """Test a state built from a row starts clean."""
+        state = SessionState(quiz_session)
+
+        assert state.dirty is False
+        assert state.is_completed is False
+        assert state.total_questions == 3
+
+
+class TestServiceWriteBehind:
+    """Test SessionService keeps quiz state off the sessions table."""
+
+    @pytest.mark.unit
+    def test_quiz_touches_sessions_row_once(
+        self, db_session, db_engine, create_test_deck
+    ):
+        """Test prompts and submits neither read nor update the row mid-quiz."""
+        service = SessionService(db_session)
+        started = service.start_session(
+            SessionStartRequest(deck_id=create_test_deck.id)
+        )
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "sessions" in statement:
+                statements.append(statement.split()[0])
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            for answer in ["탈출하다", "wrong", "성취하다"]:
+                service.get_prompt(started.id)
+                service.submit_answer(started.id, SubmitRequest(answer=answer))
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+
+        # Only on completion: write the row, then aggregate its summary
+        assert statements == ["UPDATE", "SELECT"]
+        summary = service.get_summary(started.id)
+        assert summary.score == 2
+
+    @pytest.mark.unit
+    def test_evicted_progress_survives_requests(
+        self, db_engine, create_test_deck, monkeypatch
+    ):
+        """Test progress evicted by a start or a prompt is saved, one DB session per request."""
+        monkeypatch.setattr(session_state_cache, "maxsize", 1)
+        SessionLocal = sessionmaker(autoflush=False, bind=db_engine)
+        start = SessionStartRequest(deck_id=create_test_deck.id)
+
+        def request(call):
+            # Like get_db: a fresh DB session, closed without committing
+            db = SessionLocal()
+            try:
+                return call(SessionService(db))
+            finally:
+                db.close()
+
+        first = request(lambda service: service.start_session(start)).id
+        for answer in ["탈출하다", "버리다"]:
+            request(
+                lambda service: service.submit_answer(
+                    first, SubmitRequest(answer=answer)
+                )
+            )
+
+        # Another learner's start evicts the first learner's progress
+        second = request(lambda service: service.start_session(start)).id
+        request(
+            lambda service: service.submit_answer(second, SubmitRequest(answer="탈출하다"))
+        )
+
+        # ... and the first learner's prompt evicts the second one's
+        assert request(lambda service: service.get_prompt(first)).word == "achieve"
+        assert request(lambda service: service.get_prompt(second)).word == "abandon"
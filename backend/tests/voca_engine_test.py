@@ -6,7 +6,12 @@ These tests verify the core scoring logic without any external dependencies.
 """
 
 import pytest
-from app.core.voca_engine import VocaTestEngine, VocaRepository
+from app.core.voca_engine import (
+    AnswerKeyCache,
+    VocaTestEngine,
+    VocaRepository,
+    get_session,
+)
 
 
 class TestVocaTestEngine:
@@ -38,6 +43,14 @@ class TestVocaTestEngine:
         assert self.engine.normalize("'hello") == "hello"
         assert self.engine.normalize("hello'") == "hello"
 
+    @pytest.mark.unit
+    def test_normalize_unicode(self):
+        """Test normalization removes Unicode spaces and folds Unicode case."""
+        assert self.engine.normalize("탈출\u00a0하다") == "탈출하다"
+        assert self.engine.normalize("탈출\u3000하다") == "탈출하다"
+        assert self.engine.normalize("École") == "école"
+        assert self.engine.normalize("ΟΔΟΣ") == self.engine.normalize("οδος") == "οδοσ"
+
     @pytest.mark.unit
     def test_is_correct_exact_match(self):
         """Test exact match answers."""
@@ -81,6 +94,27 @@ class TestVocaTestEngine:
         assert self.engine.is_correct("탈출하다", "탈출하다, 도망가다") is True
         assert self.engine.is_correct("도망가다", "탈출하다 , 도망가다") is True
 
+    @pytest.mark.unit
+    def test_is_correct_answer_lists_meanings(self):
+        """Test an answer listing several meanings is correct if all of them are."""
+        assert self.engine.is_correct("도망가다, 탈출하다", "탈출하다,도망가다") is True
+        assert self.engine.is_correct("b,a", "a,b") is True
+        assert self.engine.is_correct("c,d", "a,b") is False
+
+    @pytest.mark.unit
+    def test_is_correct_rejects_listed_guesses(self):
+        """Test listing guesses doesn't pass when only one of them is right."""
+        assert self.engine.is_correct("나,가", "가") is False
+        assert self.engine.is_correct("다,라,마,가", "가") is False
+        assert self.engine.is_correct("탈출하다, 버리다", "탈출하다,도망가다") is False
+
+    @pytest.mark.unit
+    def test_is_correct_ignores_empty_meanings(self):
+        """Test trailing commas don't make an empty answer correct."""
+        assert self.engine.is_correct("", "버리다,") is False
+        assert self.engine.is_correct(",", "버리다") is False
+        assert self.engine.is_correct("버리다", "버리다,") is True
+
     @pytest.mark.unit
     def test_is_correct_wrong_answer(self):
         """Test wrong answers return False."""
@@ -101,6 +135,17 @@ class TestVocaTestEngine:
         assert self.engine.is_correct("answer", "") is False
         assert self.engine.is_correct("", "") is True
 
+    @pytest.mark.unit
+    def test_grade_many(self):
+        """Test batch grading returns one byte per pair."""
+        pairs = [("탈출하다", "탈출하다,도망가다"), ("wrong", "correct"), ("ESCAPE", "escape")]
+
+        result = self.engine.grade_many(pairs)
+
+        assert isinstance(result, bytearray)
+        assert list(result) == [1, 0, 1]
+        assert self.engine.grade_many([]) == bytearray()
+
     @pytest.mark.unit
     def test_is_correct_unicode_normalization(self):
         """Test Korean text normalization."""
@@ -109,6 +154,122 @@ class TestVocaTestEngine:
         assert self.engine.is_correct("성취하다", "성 취 하 다") is True
 
 
+class TestTypoTolerance:
+    """Test typo-tolerant grading."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = VocaTestEngine()
+
+    @pytest.mark.unit
+    def test_is_close_accepts_one_jamo_typo(self):
+        """Test a single wrong vowel is accepted within distance 1."""
+        assert self.engine.is_close("버라다", "버리다", 1) is True
+        assert self.engine.is_close("성취하디", "성취하다, 달성하다", 1) is True
+
+    @pytest.mark.unit
+    def test_is_close_rejects_distant_answers(self):
+        """Test answers beyond the distance are still wrong."""
+        assert self.engine.is_close("버라도", "버리다", 1) is False
+        assert self.engine.is_close("탈출하다", "버리다", 2) is False
+
+    @pytest.mark.unit
+    def test_is_close_requires_most_of_the_meaning(self):
+        """Test short meanings and empty answers don't pass as typos."""
+        assert self.engine.is_close("", "가", 2) is False
+        assert self.engine.is_close("나", "가", 1) is False
+
+    @pytest.mark.unit
+    def test_is_close_rejects_listed_guesses(self):
+        """Test every part of a listed answer must be close to a meaning."""
+        assert self.engine.is_close("버라다, 탈출하다", "버리다", 1) is False
+        assert self.engine.is_close("버라다, 탈출하다", "버리다, 탈출하다", 1) is True
+
+    @pytest.mark.unit
+    def test_is_close_zero_distance_is_exact(self):
+        """Test distance 0 behaves like is_correct."""
+        assert self.engine.is_close("버리다", "버리다", 0) is True
+        assert self.engine.is_close("버라다", "버리다", 0) is False
+
+
+class TestAnswerKeyCache:
+    """Test compiled answer keys and their LRU cache."""
+
+    @pytest.mark.unit
+    def test_compile_answer_key(self):
+        """Test meanings are normalized once into a frozenset."""
+        engine = VocaTestEngine()
+        key = engine.compile_answer_key("탈출 하다, '도망가다', ESCAPE")
+
+        assert key == frozenset({"탈출하다", "도망가다", "escape"})
+
+    @pytest.mark.unit
+    def test_is_correct_key_matches_is_correct(self):
+        """Test compiled grading agrees with is_correct."""
+        engine = VocaTestEngine()
+        correct = "탈출하다 , 도망가다"
+        key = engine.compile_answer_key(correct)
+
+        for answer in ["탈출하다", "도망 가다", "'탈출하다'", "탈출", ""]:
+            assert engine.is_correct_key(answer, key) == engine.is_correct(
+                answer, correct
+            )
+
+    @pytest.mark.unit
+    def test_cache_hint_ladder(self):
+        """Test hint ladders are built once and follow meaning changes."""
+        cache = AnswerKeyCache(maxsize=8)
+        cache.warm([(1, "탈출하다")], "v1", hints=True)
+
+        hints = cache.get_hints(1, "v1", "탈출하다")
+        assert hints[1] == "Hint: 탈___"
+        assert cache.get_hints(1, "v1", "탈출하다") is hints
+        assert cache.get_hints(1, "v1", "버리다")[1] == "Hint: 버__"
+
+    @pytest.mark.unit
+    def test_cache_reuses_compiled_key(self):
+        """Test a second lookup returns the same compiled key."""
+        cache = AnswerKeyCache(maxsize=8)
+
+        first = cache.get(1, "v1", "탈출하다")
+        second = cache.get(1, "v1", "탈출하다")
+
+        assert first is second
+        assert len(cache) == 1
+
+    @pytest.mark.unit
+    def test_cache_recompiles_on_changed_meaning(self):
+        """Test a reused word id with a new meaning is not served stale."""
+        cache = AnswerKeyCache(maxsize=8)
+        cache.get(1, "v1", "탈출하다")
+
+        assert cache.is_correct(1, "v1", "버리다", "버리다") is True
+        assert cache.is_correct(1, "v1", "탈출하다", "버리다") is False
+
+    @pytest.mark.unit
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache stays within maxsize."""
+        cache = AnswerKeyCache(maxsize=2)
+        first = cache.get(1, "v1", "a")
+        cache.get(2, "v1", "b")
+        cache.get(1, "v1", "a")  # Touch 1 so 2 is evicted next
+        cache.get(3, "v1", "c")
+
+        assert len(cache) == 2
+        assert cache.get(1, "v1", "a") is first
+
+    @pytest.mark.unit
+    def test_cache_warm_builds_fuzzy_keys(self):
+        """Test warming a deck precompiles typo-tolerant keys."""
+        cache = AnswerKeyCache(maxsize=8)
+        cache.warm([(1, "버리다"), (2, "탈출하다")], "v1", fuzzy=True)
+        fuzzy = cache.get_fuzzy(1, "v1", "버리다")
+
+        assert len(cache) == 2
+        assert cache.get_fuzzy(1, "v1", "버리다") is fuzzy
+        assert cache.is_close(1, "v1", "버라다", "버리다", 1) is True
+
+
 class TestVocaRepository:
     """Test VocaRepository (simple word storage)."""
 
@@ -177,3 +338,13 @@ class TestVocaEngineIntegration:
         # Test second word
         assert engine.is_correct("버리다", words[1]["meaning"]) is True
         assert engine.is_correct("wrong", words[1]["meaning"]) is False
+
+    @pytest.mark.unit
+    def test_get_session_always_available(self):
+        """Test get_session works with or without the C++ extension."""
+        session = get_session()
+        session.set_words([("escape", "탈출하다")])
+        session.start()
+
+        assert session.is_finished() is False
+        assert "escape" in session.get_prompt_json()
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the pure-Python VocaSession fallback.
+
+Mirrors tests/test_session.cpp so both implementations are held to the
+same behaviour.
+"""
+
+import json
+
+import pytest
+
+from app.core import engine_bench
+from app.core.voca_engine import CppVocaSession
+from app.core import voca_engine
+from app.core.voca_session import VocaSession, load_csv_bytes, make_hint
+
+
+@pytest.fixture
+def session():
+    """Session with two words, started in order."""
+    s = VocaSession()
+    s.set_words([("apple", "사과"), ("banana", "바나나")])
+    s.start()
+    return s
+
+
+class TestVocaSession:
+    """Test quiz flow, retry queue and summary."""
+
+    @pytest.mark.unit
+    def test_wrong_answer_is_retried(self, session):
+        """Test a wrong answer brings the same word back with a hint."""
+        prompt = json.loads(session.get_prompt_json())
+        assert prompt["question_text"] == "apple"
+        assert prompt["attempt"] == 1
+        assert prompt["hint"] == ""
+
+        feedback = json.loads(session.submit_answer("wrong"))
+        assert feedback == {
+            "is_correct": False,
+            "correct_answer": "사과",
+            "next_action": "retry_same",
+            "hint_level": 1,
+        }
+
+        retry = json.loads(session.get_prompt_json())
+        assert retry["question_text"] == "apple"
+        assert retry["question_id"] == "apple"
+        assert retry["attempt"] == 2
+        assert retry["hint"] == "Hint: __ (2 글자)"
+
+    @pytest.mark.unit
+    def test_full_session(self, session):
+        """Test the flow from tests/test_session.cpp."""
+        session.get_prompt_json()
+        session.submit_answer("wrong")
+        session.get_prompt_json()
+        assert json.loads(session.submit_answer("사과"))["is_correct"] is True
+
+        prompt = json.loads(session.get_prompt_json())
+        assert prompt["question_text"] == "banana"
+        assert prompt["progress"] == {"done": 0, "total": 2}
+
+        feedback = json.loads(session.submit_answer("바나나"))
+        assert feedback["next_action"] == "show_summary"
+        assert session.is_finished() is True
+        assert json.loads(session.summary_json()) == {
+            "score": 1,
+            "total": 2,
+            "wrong_count": 1,
+        }
+        assert session.export_wrong_csv() == "apple,사과\n"
+
+    @pytest.mark.unit
+    def test_start_indices_skips_invalid(self):
+        """Test out-of-range indices are ignored."""
+        s = VocaSession()
+        s.set_words([("apple", "사과"), ("banana", "바나나")])
+        s.start_indices([1, 5, -1])
+
+        assert json.loads(s.get_prompt_json())["question_text"] == "banana"
+        assert json.loads(s.summary_json())["total"] == 1
+
+    @pytest.mark.unit
+    def test_finished_session_returns_summary(self):
+        """Test prompts and submits after the end report the summary."""
+        s = VocaSession()
+        s.set_words([])
+        s.start()
+
+        assert s.is_finished() is True
+        assert json.loads(s.get_prompt_json()) == {
+            "score": 0,
+            "total": 0,
+            "wrong_count": 0,
+        }
+        assert json.loads(s.submit_answer("x"))["next_action"] == "show_summary"
+
+    @pytest.mark.unit
+    def test_json_escaping(self):
+        """Test quotes and backslashes in words are escaped."""
+        s = VocaSession()
+        s.set_words([('say "hi"', "인사\\하다")])
+        s.start()
+
+        assert json.loads(s.get_prompt_json())["question_text"] == 'say "hi"'
+        assert json.loads(s.submit_answer("x"))["correct_answer"] == "인사\\하다"
+
+
+class TestNativeResults:
+    """Test prompt()/submit()/summary() against the JSON methods."""
+
+    @pytest.mark.unit
+    def test_native_matches_json(self, session):
+        """Test native results carry exactly the JSON fields."""
+        prompt = session.prompt()
+        assert json.loads(session.get_prompt_json()) == {
+            **prompt._asdict(),
+            "progress": prompt.progress._asdict(),
+        }
+
+        feedback = session.submit("wrong")
+        assert feedback.is_correct is False
+        assert feedback.next_action == "retry_same"
+        assert feedback.hint_level == 1
+
+        assert session.prompt().hint == "Hint: __ (2 글자)"
+        session.submit("사과")
+        session.submit("바나나")
+
+        assert session.prompt() is None
+        assert session.summary()._asdict() == json.loads(session.summary_json())
+        assert session.submit("late").next_action == "show_summary"
+
+    @pytest.mark.unit
+    def test_native_transcript(self):
+        """Test a native quiz ends with the same summary as the JSON one."""
+        words = engine_bench.FALLBACK_WORDS
+        native = engine_bench.play_session_native(VocaSession(), words)
+        transcript = engine_bench.play_session(VocaSession(), words)
+
+        assert native[-1] == tuple(json.loads(transcript[-2]).values())
+
+
+class TestMakeHint:
+    """Test progressive hints."""
+
+    @pytest.mark.unit
+    def test_hint_ladder(self):
+        """Test each wrong attempt reveals more of the answer."""
+        assert make_hint("탈출하다", 1) == "Hint: ____ (4 글자)"
+        assert make_hint("탈출하다", 2) == "Hint: 탈___"
+        assert make_hint("탈출하다", 3) == "Hint: 탈출__"
+        assert make_hint("탈출하다", 4) == "Hint: 탈출하다 (type it again)"
+
+    @pytest.mark.unit
+    def test_hint_ignores_separators_and_quotes(self):
+        """Test commas, spaces and surrounding quotes aren't counted."""
+        assert make_hint('"a, b"', 1) == "Hint: __ (2 글자)"
+        assert make_hint("", 1) == "Hint: (no letters)"
+
+
+class TestLoadCsvBytes:
+    """Test in-memory CSV deck loading."""
+
+    CSV = '"pear","배"\nno comma\nkiwi,키위,참다래\n'.encode("utf-8")
+
+    @pytest.mark.unit
+    def test_loader_rules(self):
+        """Test quote stripping and skipped lines match VocaLoader::loadCSV."""
+        words, count = load_csv_bytes(memoryview(self.CSV))
+
+        assert count == 2
+        assert words == [("pear", "배"), ("kiwi", "키위,참다래")]
+
+    @pytest.mark.unit
+    def test_session_from_repository(self):
+        """Test a session plays a deck loaded from bytes."""
+        repository, count = voca_engine.load_csv_bytes(self.CSV)
+        session = voca_engine.get_session()
+        session.set_repository(repository)
+        session.start()
+
+        assert count == 2
+        assert json.loads(session.get_prompt_json())["question_text"] == "pear"
+        assert json.loads(session.submit_answer("배"))["is_correct"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(CppVocaSession is None, reason="voca_cpp extension not built")
+    def test_matches_cpp_loader(self):
+        """Test the C++ loader parses every corpus file like the fallback."""
+        for path in sorted(engine_bench.WORDS_DIR.glob("*.csv")):
+            data = path.read_bytes()
+            try:
+                expected = load_csv_bytes(data)
+            except UnicodeDecodeError:
+                continue
+            repository, count = voca_engine.voca_cpp.load_csv_bytes(bytearray(data))
+            assert (repository.data(), count) == expected
+
+
+class TestSnapshot:
+    """Test snapshot/restore of session state."""
+
+    @pytest.mark.unit
+    def test_restore_mid_retry(self, session):
+        """Test a restored session continues exactly like the original."""
+        session.get_prompt_json()
+        session.submit_answer("wrong")
+
+        restored = VocaSession.restore(session.snapshot())
+        assert restored.snapshot() == session.snapshot()
+
+        for s in (session, restored):
+            assert json.loads(s.get_prompt_json())["hint"] == "Hint: __ (2 글자)"
+            s.submit_answer("사과")
+            s.get_prompt_json()
+            s.submit_answer("바나나")
+
+        assert restored.summary_json() == session.summary_json()
+        assert restored.export_wrong_csv() == session.export_wrong_csv()
+        assert restored.is_finished()
+
+    @pytest.mark.unit
+    def test_snapshot_is_compact(self, session):
+        """Test queued words are stored as indices, not copies."""
+        words = [(f"word{i}", f"뜻{i}") for i in range(100)]
+        s = VocaSession()
+        s.set_words(words)
+        s.start()
+        words_only = VocaSession()
+        words_only.set_words(words)
+
+        assert len(s.snapshot()) - len(words_only.snapshot()) < 2 * len(words) + 8
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "data", [b"", b"XYZ\x01", b"VSS\x01\x05", b"VSS\x01" + b"\x00" * 9]
+    )
+    def test_rejects_malformed(self, data):
+        """Test truncated, mislabeled or trailing-data snapshots raise."""
+        with pytest.raises(ValueError):
+            VocaSession.restore(data)
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(CppVocaSession is None, reason="voca_cpp extension not built")
+    def test_interchangeable_with_cpp(self, session):
+        """Test Python and C++ snapshots are byte-identical and cross-restorable."""
+        cpp = CppVocaSession()
+        cpp.set_words([("apple", "사과"), ("banana", "바나나")])
+        cpp.start()
+        for s in (session, cpp):
+            s.get_prompt_json()
+            s.submit_answer("wrong")
+
+        assert bytes(cpp.snapshot()) == session.snapshot()
+
+        from_cpp = VocaSession.restore(cpp.snapshot())
+        to_cpp = CppVocaSession.restore(session.snapshot())
+        assert from_cpp.get_prompt_json() == to_cpp.get_prompt_json()
+
+
+class TestSessionParity:
+    """Test the fallback against the C++ session."""
+
+    @pytest.mark.unit
+    def test_play_session_transcript(self):
+        """Test a deterministic quiz ends with the expected summary."""
+        transcript = engine_bench.play_session(
+            VocaSession(), engine_bench.FALLBACK_WORDS
+        )
+
+        summary = json.loads(transcript[-2])
+        assert summary["total"] == len(engine_bench.FALLBACK_WORDS)
+        assert summary["score"] == summary["total"] - summary["wrong_count"]
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(CppVocaSession is None, reason="voca_cpp extension not built")
+    def test_transcripts_match_cpp(self):
+        """Test both implementations produce identical JSON and native results."""
+        words = engine_bench.load_corpus_words()
+        report = engine_bench.bench_sessions(words, count=1)
+
+        assert report["parity"] is True
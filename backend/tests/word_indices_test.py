@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for compact session word indices.
+"""
+
+import pytest
+
+from app.core.word_indices import locate_index, pack_indices, unpack_indices
+from app.models.session import Session
+
+
+class TestPackIndices:
+    """Test range and packed int32 encodings."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("indices", [range(5000), [3, 4, 5], []])
+    def test_contiguous_is_a_range(self, indices):
+        """Test contiguous indices store no per-word data."""
+        start, count, blob = pack_indices(indices)
+
+        assert blob is None
+        assert unpack_indices(start, count, blob) == range(start, start + len(indices))
+
+    @pytest.mark.unit
+    def test_scattered_is_packed(self):
+        """Test other indices are four bytes each and decode with O(1) access."""
+        indices = [7, 0, 2, 99999]
+        start, count, blob = pack_indices(indices)
+
+        assert start is None
+        assert len(blob) == 4 * len(indices)
+        assert blob[:4] == b"\x07\x00\x00\x00"  # Little-endian on every platform
+        view = unpack_indices(start, count, blob)
+        assert len(view) == 4
+        assert view[3] == 99999
+        assert list(view) == indices
+
+
+class TestLocateIndex:
+    """Test mapping virtual indices of multi-deck sessions to decks."""
+
+    @pytest.mark.unit
+    def test_locate_index(self):
+        """Test every index lands in the right deck, skipping empty decks."""
+        offsets = [0, 3, 3, 5]  # decks of 3, 0, 2 and n words
+
+        assert locate_index(offsets, 0) == (0, 0)
+        assert locate_index(offsets, 2) == (0, 2)
+        assert locate_index(offsets, 3) == (2, 0)
+        assert locate_index(offsets, 4) == (2, 1)
+        assert locate_index(offsets, 9) == (3, 4)
+
+
+class TestSessionWordIndices:
+    """Test the Session model keeps the word_indices interface."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, db_session, create_test_deck):
+        """Test both encodings survive a database round trip."""
+        contiguous = Session(
+            deck_id=create_test_deck.id, word_indices=range(3), total_questions=3
+        )
+        scattered = Session(
+            deck_id=create_test_deck.id, word_indices=[2, 0], total_questions=2
+        )
+        db_session.add_all([contiguous, scattered])
+        db_session.commit()
+        db_session.expire_all()
+
+        assert contiguous.word_indices == [0, 1, 2]
+        assert contiguous.index_blob is None
+        assert scattered.word_indices == [2, 0]
+        assert scattered.index_sequence[0] == 2
+
+    @pytest.mark.unit
+    def test_legacy_json_rows(self, db_session, create_test_deck):
+        """Test rows written with the JSON list still read back."""
+        session = Session(deck_id=create_test_deck.id, total_questions=2)
+        session.legacy_word_indices = [1, 0]
+        db_session.add(session)
+        db_session.commit()
+
+        assert session.word_indices == [1, 0]
+        assert session.index_sequence[1] == 0
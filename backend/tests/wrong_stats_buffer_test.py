@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the wrong stats buffer.
+"""
+
+import pytest
+from sqlalchemy import update
+
+from app.models.session import Session
+from app.models.wrong_stats import WrongStats
+from app.schemas.session import SessionStartRequest, SubmitRequest
+from app.services.session_service import SessionService
+from app.services.session_state import StaleSessionError
+from app.services.wrong_stats_buffer import WrongStatsBuffer, wrong_stats_buffer
+from tests.session_service_test import count_queries
+
+
+def wrong_counts(db_session, deck_id: int) -> dict:
+    """Read committed wrong counts of a deck by word."""
+    db_session.expire_all()
+    rows = db_session.query(WrongStats).filter(WrongStats.deck_id == deck_id)
+    return {row.word: row.wrong_count for row in rows}
+
+
+class TestWrongStatsBuffer:
+    """Test buffering and batched write-back of wrong answer counts."""
+
+    @pytest.mark.unit
+    def test_writes_through_without_buffer(self, db_session, create_test_deck):
+        """Test a zero buffer size upserts every wrong answer at once."""
+        buffer = WrongStatsBuffer(max_pending=0)
+
+        buffer.add(db_session, create_test_deck.id, "escape")
+        buffer.add(db_session, create_test_deck.id, "escape")
+        db_session.commit()
+
+        assert len(buffer) == 0
+        assert wrong_counts(db_session, create_test_deck.id) == {"escape": 2}
+
+    @pytest.mark.unit
+    def test_flushes_one_batch_when_full(self, db_session, db_engine, create_test_deck):
+        """Test pending increments are summed and written as one upsert."""
+        buffer = WrongStatsBuffer(max_pending=4, flush_interval=60)
+        deck_id = create_test_deck.id
+
+        with count_queries(db_engine) as log:
+            for word in ["escape", "escape", "abandon"]:
+                buffer.add(db_session, deck_id, word)
+            assert log["statements"] == []
+            assert buffer.pending(deck_id) == {"escape": 2, "abandon": 1}
+
+            buffer.add(db_session, deck_id, "escape")
+            db_session.commit()
+
+        assert log["statements"] == ["INSERT"]
+        assert len(buffer) == 0
+        assert wrong_counts(db_session, deck_id) == {"escape": 3, "abandon": 1}
+
+    @pytest.mark.unit
+    def test_flush_adds_to_stored_counts(self, db_session, create_test_deck):
+        """Test a flush increments existing rows instead of replacing them."""
+        buffer = WrongStatsBuffer(max_pending=100, flush_interval=60)
+        deck_id = create_test_deck.id
+        db_session.add(WrongStats(word="escape", deck_id=deck_id, wrong_count=5))
+        db_session.commit()
+
+        buffer.add(db_session, deck_id, "escape")
+        buffer.add(db_session, deck_id, "escape", user_id=None)
+        assert buffer.flush(db_session) == 1
+        db_session.commit()
+
+        assert wrong_counts(db_session, deck_id) == {"escape": 7}
+        assert buffer.flush(db_session) == 0
+
+    @pytest.mark.unit
+    def test_rolled_back_flush_is_kept(self, db_session, create_test_deck):
+        """Test increments of a rolled-back flush go back into the buffer."""
+        buffer = WrongStatsBuffer(max_pending=100, flush_interval=60)
+        deck_id = create_test_deck.id
+
+        for word in ["escape", "escape", "abandon"]:
+            buffer.add(db_session, deck_id, word)
+        db_session.commit()
+        assert buffer.flush(db_session) == 2
+        db_session.rollback()
+
+        assert buffer.pending(deck_id) == {"escape": 2, "abandon": 1}
+        assert wrong_counts(db_session, deck_id) == {}
+
+        buffer.flush(db_session)
+        db_session.commit()
+        assert len(buffer) == 0
+        assert wrong_counts(db_session, deck_id) == {"escape": 2, "abandon": 1}
+
+    @pytest.mark.unit
+    def test_rolled_back_add_is_dropped(self, db_session, create_test_deck):
+        """Test increments only count once the transaction adding them commits."""
+        buffer = WrongStatsBuffer(max_pending=100, flush_interval=60)
+        deck_id = create_test_deck.id
+
+        buffer.add(db_session, deck_id, "escape")
+        db_session.commit()
+        buffer.add(db_session, deck_id, "escape")
+        buffer.add(db_session, deck_id, "abandon")
+        db_session.rollback()
+        assert buffer.pending(deck_id) == {"escape": 1}
+
+        # Added and flushed in one transaction, then rolled back
+        buffer.add(db_session, deck_id, "abandon")
+        buffer.flush(db_session)
+        db_session.rollback()
+        assert buffer.pending(deck_id) == {"escape": 1}
+
+    @pytest.mark.unit
+    def test_stale_submit_keeps_no_count(
+        self, db_session, create_test_deck, monkeypatch
+    ):
+        """Test a wrong answer whose submit fails with a conflict isn't counted."""
+        monkeypatch.setattr(wrong_stats_buffer, "max_pending", 100)
+        monkeypatch.setattr(wrong_stats_buffer, "flush_interval", 60)
+        deck_id = create_test_deck.id
+        service = SessionService(db_session)
+        session_id = service.start_session(SessionStartRequest(deck_id=deck_id)).id
+        for answer in ["탈출하다", "버리다"]:
+            service.submit_answer(session_id, SubmitRequest(answer=answer))
+
+        # Another writer moves the row on; the completing submit conflicts
+        db_session.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .values(version=Session.version + 1)
+        )
+        db_session.commit()
+        with pytest.raises(StaleSessionError):
+            service.submit_answer(session_id, SubmitRequest(answer="wrong"))
+
+        assert wrong_stats_buffer.pending(deck_id) == {}
+
+    @pytest.mark.unit
+    def test_flush_keeps_users_apart(
+        self, db_session, db_engine, create_test_deck, test_user
+    ):
+        """Test user and anonymous increments are upserted into their own rows."""
+        buffer = WrongStatsBuffer(max_pending=100, flush_interval=60)
+        deck_id = create_test_deck.id
+        user_id = test_user.id
+
+        buffer.add(db_session, deck_id, "escape", user_id)
+        buffer.add(db_session, deck_id, "escape")
+        buffer.add(db_session, deck_id, "escape", user_id)
+        assert buffer.pending(deck_id, user_id) == {"escape": 2}
+
+        with count_queries(db_engine) as log:
+            assert buffer.flush(db_session) == 2
+        db_session.commit()
+
+        assert log["statements"] == ["INSERT", "INSERT"]
+        rows = db_session.query(WrongStats).filter(WrongStats.deck_id == deck_id)
+        assert {(row.user_id, row.wrong_count) for row in rows} == {
+            (user_id, 2),
+            (None, 1),
+        }
+
+    @pytest.mark.unit
+    def test_flushes_after_interval(self, db_session, create_test_deck):
+        """Test a wrong answer after the flush interval writes everything pending."""
+        buffer = WrongStatsBuffer(max_pending=100, flush_interval=0)
+
+        buffer.add(db_session, create_test_deck.id, "escape")
+        db_session.commit()
+
+        assert len(buffer) == 0
+        assert wrong_counts(db_session, create_test_deck.id) == {"escape": 1}
+
+    @pytest.mark.unit
+    def test_wrong_words_include_pending(
+        self, db_session, create_test_deck, monkeypatch
+    ):
+        """Test wrong word lists merge unflushed increments."""
+        monkeypatch.setattr(wrong_stats_buffer, "max_pending", 100)
+        monkeypatch.setattr(wrong_stats_buffer, "flush_interval", 60)
+        deck_id = create_test_deck.id
+        db_session.add(WrongStats(word="escape", deck_id=deck_id, wrong_count=1))
+        db_session.commit()
+        service = SessionService(db_session)
+
+        service._update_wrong_stats("escape", deck_id)
+        service._update_wrong_stats("abandon", deck_id)
+
+        assert wrong_counts(db_session, deck_id) == {"escape": 1}
+        assert sorted(service.get_wrong_words(deck_id, min_wrong_count=2)) == ["escape"]
+        assert sorted(service.get_wrong_words(deck_id)) == ["abandon", "escape"]
@@ -1,6 +1,7 @@
 #pragma once
 
 #include <string>
+#include <utility>
 #include <vector>
 
 namespace voca {
@@ -8,12 +9,12 @@ namespace voca {
 class VocaTestEngine {
 public:
     bool isCorrect(const std::string& answer, const std::string& correct) const;
+    std::vector<unsigned char> gradeMany(
+        const std::vector<std::pair<std::string, std::string>>& pairs) const;
     std::string stripQuotes(const std::string& s) const;
 
 private:
-    std::string removeWhitespace_(const std::string& s) const;
-    bool containsComma_(const std::string& s) const;
-    std::vector<std::string> splitAndSort_(const std::string& input) const;
+    static void normalizeInto_(const std::string& s, std::string& out);
 };
 
 } // namespace voca
@@ -1,6 +1,8 @@
 #pragma once
 
+#include <cstddef>
 #include <string>
+#include <string_view>
 #include <utility>
 #include <vector>
 
@@ -11,8 +13,13 @@ public:
     bool loadCSV(const std::string& base_path,
                  std::vector<std::pair<std::string, std::string>>& out) const;
 
+    // Parse CSV text already in memory (e.g. an uploaded deck) with the same
+    // rules as loadCSV. Returns the number of rows appended to out.
+    std::size_t parseCSV(std::string_view text,
+                         std::vector<std::pair<std::string, std::string>>& out) const;
+
 private:
-    std::string stripQuotes_(const std::string& s) const;
+    static std::string_view stripQuotes_(std::string_view s);
 };
 
 } // namespace voca
@@ -21,6 +21,7 @@ public:
     int total() const;
     const std::vector<WrongVoca>& wrongList() const;
     void reset();
+    void restore(int correct, int total, std::vector<WrongVoca> wrong);
 
 private:
     int correct_ = 0;
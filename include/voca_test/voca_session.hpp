@@ -1,27 +1,70 @@
 #pragma once
 
+#include <array>
 #include <deque>
+#include <optional>
 #include <string>
+#include <unordered_map>
 #include <utility>
 #include <vector>
 
 #include "voca_test/voca_engine.hpp"
+#include "voca_test/voca_repository.hpp"
 #include "voca_test/voca_result.hpp"
 
 namespace voca {
 
+// Native results of the session API; the *Json methods serialize these.
+struct SessionProgress {
+    int done = 0;
+    int total = 0;
+};
+
+struct SessionPrompt {
+    std::string question_id;
+    std::string question_text;
+    std::string direction = "en_to_kr";
+    std::string hint;
+    int attempt = 1;
+    SessionProgress progress;
+};
+
+struct SessionFeedback {
+    bool is_correct = true;
+    std::string correct_answer;
+    std::string next_action = "show_summary";
+    int hint_level = 0;
+};
+
+struct SessionSummary {
+    int score = 0;
+    int total = 0;
+    int wrong_count = 0;
+};
+
 class VocaSession {
 public:
     void setWords(std::vector<std::pair<std::string, std::string>> words);
+    void setRepository(const VocaRepository& repository);
     void start();
     void start(const std::vector<int>& indices);
 
+    // Empty once the quiz is finished
+    std::optional<SessionPrompt> prompt();
+    SessionFeedback submit(const std::string& answer);
+    SessionSummary summary() const;
+
     std::string getPromptJson();
     std::string submitAnswer(const std::string& answer);
     std::string summaryJson() const;
     std::string exportWrongCSV() const;
     bool isFinished() const;
 
+    // Compact binary encoding of the full session state, so a session can
+    // be stored (DB column, file) and resumed by another process.
+    std::string snapshot() const;
+    static VocaSession restore(const std::string& data);
+
 private:
     struct CurrentQuestion {
         std::string word;
@@ -31,7 +74,10 @@ private:
     };
 
     bool ensureCurrent_();
-    std::string makeHint_(const std::string& correct, int wrong_count) const;
+    // Hints for wrong counts 1, 2, 3 and 4+, built once per meaning
+    using HintLadder = std::array<std::string, 4>;
+    const std::string& hint_(const std::string& correct, int wrong_count);
+    static HintLadder buildHintLadder_(const std::string& correct);
     static std::string escapeJson_(const std::string& s);
 
     std::vector<std::pair<std::string, std::string>> words_;
@@ -42,6 +88,7 @@ private:
     int total_ = 0;
     bool has_current_ = false;
     CurrentQuestion current_{};
+    std::unordered_map<std::string, HintLadder> hint_ladders_;
 };
 
 } // namespace voca
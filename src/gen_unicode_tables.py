@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Generate src/unicode_tables.inc for VocaTestEngine's normalizer.
+
+The Python engine (backend/app/core/voca_engine.py) drops characters
+matched by re's \\s and lowercases with str.lower(); the C++ engine reads
+both rules from the tables written here, so the two grade alike. Rerun
+after upgrading Python (its Unicode database):
+
+    python src/gen_unicode_tables.py
+"""
+
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+OUTPUT = Path(__file__).with_name("unicode_tables.inc")
+
+# Lowercased to more than one code point; handled in code
+SPECIAL = {0x0130}
+
+# Final sigma: str.lower() picks it by context, so both engines fold it to σ
+FINAL_SIGMA, SIGMA = 0x03C2, 0x03C3
+
+
+def spaces() -> list[int]:
+    return [cp for cp in range(sys.maxunicode + 1) if re.match(r"\s", chr(cp))]
+
+
+def lower_ranges() -> list[tuple[int, int, int, int]]:
+    """(first, last, delta, stride) runs of code points with a 1:1 lowercase."""
+    ranges = []
+    for cp in range(sys.maxunicode + 1):
+        if 0xD800 <= cp <= 0xDFFF or cp in SPECIAL:
+            continue
+        lower = chr(cp).lower()
+        if cp == FINAL_SIGMA:
+            lower = chr(SIGMA)
+        if lower == chr(cp):
+            continue
+        assert len(lower) == 1, hex(cp)
+        delta = ord(lower) - cp
+        if ranges:
+            first, last, last_delta, stride = ranges[-1]
+            step = cp - last
+            if last_delta == delta and step in (1, 2) and stride in (0, step):
+                ranges[-1] = (first, cp, delta, step)
+                continue
+        ranges.append((cp, cp, delta, 0))
+    return [(first, last, delta, stride or 1) for first, last, delta, stride in ranges]
+
+
+def main():
+    lines = [
+        f"// Generated by src/gen_unicode_tables.py from Python {sys.version.split()[0]}",
+        f"// (Unicode {unicodedata.unidata_version}); do not edit.",
+        "",
+        "// Code points matched by Python's re \\s",
+        "constexpr char32_t kSpaces[] = {",
+    ]
+    lines += [f"    0x{cp:04X}," for cp in spaces()]
+    lines += [
+        "};",
+        "",
+        "// {first, last, delta, stride}: first, first + stride, ..., last lowercase",
+        "// to code point + delta, as str.lower() does (with final sigma folded)",
+        "constexpr LowerRange kLowerRanges[] = {",
+    ]
+    lines += [
+        f"    {{0x{first:04X}, 0x{last:04X}, {delta}, {stride}}},"
+        for first, last, delta, stride in lower_ranges()
+    ]
+    lines.append("};")
+    OUTPUT.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
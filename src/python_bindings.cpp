@@ -8,7 +8,11 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <chrono>
+#include <string_view>
+
 #include "voca_test/voca_engine.hpp"
+#include "voca_test/voca_loader.hpp"
 #include "voca_test/voca_repository.hpp"
 #include "voca_test/voca_result.hpp"
 #include "voca_test/voca_session.hpp"
@@ -31,10 +35,49 @@ PYBIND11_MODULE(voca_cpp, m) {
         .def("is_correct", &voca::VocaTestEngine::isCorrect,
              py::arg("answer"), py::arg("correct"),
              "Check if the answer matches the correct answer(s)")
+        .def("grade_many", [](const voca::VocaTestEngine& self,
+                              const std::vector<std::pair<std::string, std::string>>& pairs) {
+            std::vector<unsigned char> results;
+            {
+                py::gil_scoped_release release;
+                results = self.gradeMany(pairs);
+            }
+            return py::bytearray(reinterpret_cast<const char*>(results.data()),
+                                 results.size());
+        }, py::arg("pairs"),
+             "Grade a list of (answer, correct) pairs, returning a bytearray of 0/1")
         .def("strip_quotes", &voca::VocaTestEngine::stripQuotes,
              py::arg("text"),
              "Remove surrounding quotes from text");
 
+    // Native grading benchmark (no Python/C++ boundary inside the loop)
+    m.def("bench_is_correct", [](const std::vector<std::pair<std::string, std::string>>& cases,
+                                 int iterations) {
+        voca::VocaTestEngine engine;
+        std::size_t matched = 0;
+        std::chrono::steady_clock::duration elapsed{};
+        {
+            py::gil_scoped_release release;
+            const auto start = std::chrono::steady_clock::now();
+            for (int i = 0; i < iterations; ++i) {
+                for (const auto& item : cases) {
+                    matched += engine.isCorrect(item.first, item.second) ? 1 : 0;
+                }
+            }
+            elapsed = std::chrono::steady_clock::now() - start;
+        }
+
+        const double ops = static_cast<double>(cases.size()) * iterations;
+        const double ns = std::chrono::duration<double, std::nano>(elapsed).count();
+        py::dict result;
+        result["ops"] = ops;
+        result["matched"] = matched;
+        result["ns_per_op"] = ops > 0 ? ns / ops : 0.0;
+        result["ops_per_sec"] = ns > 0 ? ops / (ns / 1e9) : 0.0;
+        return result;
+    }, py::arg("cases"), py::arg("iterations") = 1,
+       "Time is_correct over (answer, correct) cases inside C++ and return ops/sec and ns/op");
+
     // VocaRepository class
     py::class_<voca::VocaRepository>(m, "VocaRepository")
         .def(py::init<>())
@@ -48,6 +91,29 @@ PYBIND11_MODULE(voca_cpp, m) {
         .def("data", &voca::VocaRepository::data,
              "Get all word data", py::return_value_policy::reference);
 
+    // Parse CSV straight from a bytes-like object, without building Python
+    // (word, meaning) tuples first
+    m.def("load_csv_bytes", [](const py::buffer& data) {
+        const py::buffer_info info = data.request();
+        if (info.ndim > 1 || (info.ndim == 1 && info.strides[0] != info.itemsize)) {
+            throw py::value_error("load_csv_bytes needs a contiguous buffer");
+        }
+        const std::string_view text(static_cast<const char*>(info.ptr),
+                                    static_cast<std::size_t>(info.size * info.itemsize));
+
+        voca::VocaRepository repository;
+        std::size_t count = 0;
+        {
+            py::gil_scoped_release release;
+            std::vector<std::pair<std::string, std::string>> rows;
+            count = voca::VocaLoader().parseCSV(text, rows);
+            repository.set(std::move(rows));
+        }
+        return py::make_tuple(std::move(repository), count);
+    }, py::arg("data"),
+       "Parse CSV bytes (bytes, bytearray or memoryview) like VocaLoader::loadCSV "
+       "and return (VocaRepository, row count)");
+
     // VocaResult class
     py::class_<voca::VocaResult>(m, "VocaResult")
         .def(py::init<>())
@@ -63,17 +129,50 @@ PYBIND11_MODULE(voca_cpp, m) {
              "Get list of wrong answers", py::return_value_policy::reference)
         .def("reset", &voca::VocaResult::reset, "Reset results");
 
+    // Native session results, returned without a JSON round trip
+    py::class_<voca::SessionProgress>(m, "SessionProgress")
+        .def_readonly("done", &voca::SessionProgress::done)
+        .def_readonly("total", &voca::SessionProgress::total);
+
+    py::class_<voca::SessionPrompt>(m, "SessionPrompt")
+        .def_readonly("question_id", &voca::SessionPrompt::question_id)
+        .def_readonly("question_text", &voca::SessionPrompt::question_text)
+        .def_readonly("direction", &voca::SessionPrompt::direction)
+        .def_readonly("hint", &voca::SessionPrompt::hint)
+        .def_readonly("attempt", &voca::SessionPrompt::attempt)
+        .def_readonly("progress", &voca::SessionPrompt::progress);
+
+    py::class_<voca::SessionFeedback>(m, "SessionFeedback")
+        .def_readonly("is_correct", &voca::SessionFeedback::is_correct)
+        .def_readonly("correct_answer", &voca::SessionFeedback::correct_answer)
+        .def_readonly("next_action", &voca::SessionFeedback::next_action)
+        .def_readonly("hint_level", &voca::SessionFeedback::hint_level);
+
+    py::class_<voca::SessionSummary>(m, "SessionSummary")
+        .def_readonly("score", &voca::SessionSummary::score)
+        .def_readonly("total", &voca::SessionSummary::total)
+        .def_readonly("wrong_count", &voca::SessionSummary::wrong_count);
+
     // VocaSession class - main API for quiz sessions
     py::class_<voca::VocaSession>(m, "VocaSession")
         .def(py::init<>())
         .def("set_words", &voca::VocaSession::setWords, py::arg("words"),
              "Set words as list of (word, meaning) pairs")
+        .def("set_repository", &voca::VocaSession::setRepository,
+             py::arg("repository"),
+             "Set words from a VocaRepository without going through Python objects")
         .def("start", py::overload_cast<>(&voca::VocaSession::start),
              "Start quiz with all words in order")
         .def("start_indices", py::overload_cast<const std::vector<int>&>(
                  &voca::VocaSession::start),
              py::arg("indices"),
              "Start quiz with specific word indices")
+        .def("prompt", &voca::VocaSession::prompt,
+             "Get current question as SessionPrompt, or None when finished")
+        .def("submit", &voca::VocaSession::submit, py::arg("answer"),
+             "Submit answer and get a SessionFeedback")
+        .def("summary", &voca::VocaSession::summary,
+             "Get session summary as SessionSummary")
         .def("get_prompt_json", &voca::VocaSession::getPromptJson,
              "Get current question as JSON string")
         .def("submit_answer", &voca::VocaSession::submitAnswer,
@@ -84,5 +183,12 @@ PYBIND11_MODULE(voca_cpp, m) {
         .def("export_wrong_csv", &voca::VocaSession::exportWrongCSV,
              "Export wrong answers as CSV string")
         .def("is_finished", &voca::VocaSession::isFinished,
-             "Check if quiz is finished");
+             "Check if quiz is finished")
+        .def("snapshot", [](const voca::VocaSession& self) {
+            return py::bytes(self.snapshot());
+        }, "Serialize the full session state to compact bytes")
+        .def_static("restore", [](const py::bytes& data) {
+            return voca::VocaSession::restore(std::string(data));
+        }, py::arg("data"),
+           "Rebuild a session from snapshot() bytes (raises ValueError if malformed)");
 }
@@ -1,41 +1,201 @@
 #include "voca_test/voca_engine.hpp"
 
 #include <algorithm>
-#include <regex>
+#include <cstdint>
+#include <string_view>
 
 namespace voca {
 
-bool VocaTestEngine::isCorrect(const std::string& answer, const std::string& correct) const
+namespace {
+
+struct LowerRange {
+    char32_t first;
+    char32_t last;
+    std::int32_t delta;
+    std::uint8_t stride;
+};
+
+#include "unicode_tables.inc"
+
+constexpr char32_t kCapitalIWithDot = 0x0130;  // Lowercases to "i" + U+0307
+
+// Same set as Python's re \s over ASCII (includes \x1c-\x1f)
+inline bool isAsciiSpace(unsigned char ch)
+{
+    return (ch >= '\t' && ch <= '\r') || (ch >= 0x1C && ch <= ' ');
+}
+
+inline bool isSpace(char32_t cp)
 {
-    std::string normalized_answer = removeWhitespace_(answer);
-    std::string stripped_correct = stripQuotes(correct);
-    std::string normalized_correct = removeWhitespace_(stripped_correct);
+    return std::binary_search(std::begin(kSpaces), std::end(kSpaces), cp);
+}
 
-    if (containsComma_(normalized_correct)) {
-        std::vector<std::string> answers = splitAndSort_(normalized_answer);
-        std::vector<std::string> responses = splitAndSort_(normalized_correct);
+char32_t toLower(char32_t cp)
+{
+    const auto* it = std::upper_bound(
+        std::begin(kLowerRanges), std::end(kLowerRanges), cp,
+        [](char32_t value, const LowerRange& range) { return value < range.first; });
+    if (it == std::begin(kLowerRanges)) {
+        return cp;
+    }
+    --it;
+    if (cp > it->last || (cp - it->first) % it->stride != 0) {
+        return cp;
+    }
+    return static_cast<char32_t>(static_cast<std::int32_t>(cp) + it->delta);
+}
 
-        if (answers == responses) {
-            return true;
+// Decodes the UTF-8 sequence at s[i], advancing i; returns false (and
+// leaves i alone) on malformed input
+bool decodeUtf8(const std::string& s, std::size_t& i, char32_t& cp)
+{
+    const auto lead = static_cast<unsigned char>(s[i]);
+    std::size_t length;
+    char32_t smallest;  // Rejects overlong encodings
+    if ((lead & 0xE0) == 0xC0) {
+        length = 2;
+        cp = lead & 0x1F;
+        smallest = 0x80;
+    } else if ((lead & 0xF0) == 0xE0) {
+        length = 3;
+        cp = lead & 0x0F;
+        smallest = 0x800;
+    } else if ((lead & 0xF8) == 0xF0) {
+        length = 4;
+        cp = lead & 0x07;
+        smallest = 0x10000;
+    } else {
+        return false;
+    }
+    if (s.size() - i < length) {
+        return false;
+    }
+    for (std::size_t k = 1; k < length; ++k) {
+        const auto next = static_cast<unsigned char>(s[i + k]);
+        if ((next & 0xC0) != 0x80) {
+            return false;
         }
+        cp = (cp << 6) | (next & 0x3F);
+    }
+    if (cp < smallest || cp > 0x10FFFF || (cp >= 0xD800 && cp <= 0xDFFF)) {
+        return false;
+    }
+    i += length;
+    return true;
+}
 
-        for (const auto& answer : answers) {
-            for (const auto& resp : responses) {
-                if (answer == resp) {
-                    return true;
-                }
+void appendUtf8(std::string& out, char32_t cp)
+{
+    if (cp < 0x80) {
+        out.push_back(static_cast<char>(cp));
+    } else if (cp < 0x800) {
+        out.push_back(static_cast<char>(0xC0 | (cp >> 6)));
+        out.push_back(static_cast<char>(0x80 | (cp & 0x3F)));
+    } else if (cp < 0x10000) {
+        out.push_back(static_cast<char>(0xE0 | (cp >> 12)));
+        out.push_back(static_cast<char>(0x80 | ((cp >> 6) & 0x3F)));
+        out.push_back(static_cast<char>(0x80 | (cp & 0x3F)));
+    } else {
+        out.push_back(static_cast<char>(0xF0 | (cp >> 18)));
+        out.push_back(static_cast<char>(0x80 | ((cp >> 12) & 0x3F)));
+        out.push_back(static_cast<char>(0x80 | ((cp >> 6) & 0x3F)));
+        out.push_back(static_cast<char>(0x80 | (cp & 0x3F)));
+    }
+}
+
+// Calls fn on each non-empty comma-separated part of s (or once on an
+// empty view if there are none) until fn returns true. Parts are views
+// into s, so splitting never allocates.
+template <typename Fn>
+bool anyPart(std::string_view s, Fn&& fn)
+{
+    bool seen = false;
+    std::size_t start = 0;
+    while (start <= s.size()) {
+        std::size_t end = s.find(',', start);
+        if (end == std::string_view::npos) {
+            end = s.size();
+        }
+        if (end > start) {
+            seen = true;
+            if (fn(s.substr(start, end - start))) {
+                return true;
             }
         }
-        return false;
+        start = end + 1;
     }
+    return !seen && fn(std::string_view{});
+}
+
+// True if fn holds for every part anyPart would visit
+template <typename Fn>
+bool allParts(std::string_view s, Fn&& fn)
+{
+    return !anyPart(s, [&](std::string_view part) { return !fn(part); });
+}
+
+} // namespace
+
+// Both sides are split on commas and normalized (Unicode whitespace and
+// ASCII quotes removed, lowercased as Python's str.lower() with final sigma
+// folded to sigma); the answer is correct if every one of its parts
+// matches a correct meaning, so listing guesses never helps. Must stay in
+// sync with the Python fallback in backend/app/core/voca_engine.py.
+bool VocaTestEngine::isCorrect(const std::string& answer, const std::string& correct) const
+{
+    // Reused per thread, so steady-state grading does not allocate
+    thread_local std::string normalized_answer;
+    thread_local std::string normalized_correct;
+    normalizeInto_(answer, normalized_answer);
+    normalizeInto_(correct, normalized_correct);
 
-    return normalized_answer == normalized_correct;
+    const std::string_view responses(normalized_correct);
+    return allParts(normalized_answer, [&](std::string_view part) {
+        return anyPart(responses, [&](std::string_view resp) { return part == resp; });
+    });
 }
 
-std::string VocaTestEngine::removeWhitespace_(const std::string& s) const
+std::vector<unsigned char> VocaTestEngine::gradeMany(
+    const std::vector<std::pair<std::string, std::string>>& pairs) const
 {
-    static const std::regex pattern("\\s+");
-    return std::regex_replace(s, pattern, "");
+    std::vector<unsigned char> results;
+    results.reserve(pairs.size());
+    for (const auto& pair : pairs) {
+        results.push_back(isCorrect(pair.first, pair.second) ? 1 : 0);
+    }
+    return results;
+}
+
+void VocaTestEngine::normalizeInto_(const std::string& s, std::string& out)
+{
+    out.clear();
+    out.reserve(s.size());
+    std::size_t i = 0;
+    while (i < s.size()) {
+        const auto ch = static_cast<unsigned char>(s[i]);
+        if (ch < 0x80) {
+            ++i;
+            if (isAsciiSpace(ch) || ch == '"' || ch == '\'') {
+                continue;
+            }
+            out.push_back(static_cast<char>(ch >= 'A' && ch <= 'Z' ? ch - 'A' + 'a' : ch));
+            continue;
+        }
+
+        char32_t cp;
+        if (!decodeUtf8(s, i, cp)) {
+            out.push_back(s[i++]);  // Malformed bytes pass through unchanged
+            continue;
+        }
+        if (isSpace(cp)) {
+            continue;
+        }
+        if (cp == kCapitalIWithDot) {
+            out.append("i\xCC\x87");
+            continue;
+        }
+        appendUtf8(out, toLower(cp));
+    }
 }
 
 std::string VocaTestEngine::stripQuotes(const std::string& s) const
@@ -52,22 +212,4 @@ std::string VocaTestEngine::stripQuotes(const std::string& s) const
     return s;
 }
 
-bool VocaTestEngine::containsComma_(const std::string& s) const
-{
-    return s.find(',') != std::string::npos;
-}
-
-std::vector<std::string> VocaTestEngine::splitAndSort_(const std::string& input) const
-{
-    std::vector<std::string> result;
-    std::regex pattern(",");
-    std::sregex_token_iterator iter(input.begin(), input.end(), pattern, -1);
-    std::sregex_token_iterator end;
-    for (; iter != end; ++iter) {
-        result.push_back(*iter);
-    }
-    std::sort(result.begin(), result.end());
-    return result;
-}
-
 } // namespace voca
@@ -2,6 +2,7 @@
 
 #include <fstream>
 #include <iostream>
+#include <iterator>
 #include <string>
 
 namespace voca {
@@ -9,30 +10,45 @@ namespace voca {
 bool VocaLoader::loadCSV(const std::string& base_path,
                          std::vector<std::pair<std::string, std::string>>& out) const
 {
-    std::ifstream file(base_path + ".csv");
+    std::ifstream file(base_path + ".csv", std::ios::binary);
     if (!file.is_open()) {
         std::cout << base_path + " not found.\n";
         return false;
     }
 
-    std::string line;
-    while (std::getline(file, line)) {
-        std::size_t pos = line.find(",");
-        if (pos != std::string::npos) {
-            std::string word = line.substr(0, pos);
-            std::string correct = line.substr(pos + 1);
+    const std::string text((std::istreambuf_iterator<char>(file)),
+                           std::istreambuf_iterator<char>());
+    parseCSV(text, out);
+    return true;
+}
 
-            word = stripQuotes_(word);
-            correct = stripQuotes_(correct);
+std::size_t VocaLoader::parseCSV(std::string_view text,
+                                 std::vector<std::pair<std::string, std::string>>& out) const
+{
+    const std::size_t before = out.size();
+    std::size_t start = 0;
 
-            out.emplace_back(word, correct);
+    while (start < text.size()) {
+        std::size_t end = text.find('\n', start);
+        if (end == std::string_view::npos) {
+            end = text.size();
         }
+
+        const std::string_view line = text.substr(start, end - start);
+        const std::size_t pos = line.find(',');
+        if (pos != std::string_view::npos) {
+            const std::string_view word = stripQuotes_(line.substr(0, pos));
+            const std::string_view correct = stripQuotes_(line.substr(pos + 1));
+            out.emplace_back(std::string(word), std::string(correct));
+        }
+
+        start = end + 1;
     }
 
-    return true;
+    return out.size() - before;
 }
 
-std::string VocaLoader::stripQuotes_(const std::string& s) const
+std::string_view VocaLoader::stripQuotes_(std::string_view s)
 {
     if (s.size() >= 2 && s.front() == '"' && s.back() == '"') {
         return s.substr(1, s.size() - 2);
@@ -59,4 +59,11 @@ void VocaResult::reset()
     wrong_.clear();
 }
 
+void VocaResult::restore(int correct, int total, std::vector<WrongVoca> wrong)
+{
+    correct_ = correct;
+    total_ = total;
+    wrong_ = std::move(wrong);
+}
+
 } // namespace voca
@@ -1,14 +1,112 @@
 #include "voca_test/voca_session.hpp"
 
+#include <algorithm>
+#include <cstdint>
 #include <sstream>
+#include <stdexcept>
 
 namespace voca {
 
+namespace {
+
+// Snapshot format, version 1 (all integers are unsigned LEB128 varints,
+// strings are a varint length followed by the raw bytes):
+//   "VSS" 0x01
+//   words:        count, then (word, meaning) strings
+//   main queue:   count, then word indices
+//   retry queue:  count, then (word, correct) strings
+//   result:       correct, total, wrong count, then (word, correct, wrong_count)
+//   total
+//   current:      flag byte, then (word, correct, question_id, from_retry byte)
+constexpr char kSnapshotMagic[] = {'V', 'S', 'S', 0x01};
+
+void putVarint(std::string& out, std::uint64_t value)
+{
+    while (value >= 0x80) {
+        out.push_back(static_cast<char>((value & 0x7F) | 0x80));
+        value >>= 7;
+    }
+    out.push_back(static_cast<char>(value));
+}
+
+void putString(std::string& out, const std::string& s)
+{
+    putVarint(out, s.size());
+    out.append(s);
+}
+
+class SnapshotReader {
+public:
+    explicit SnapshotReader(const std::string& data) : data_(data) {}
+
+    std::uint64_t varint()
+    {
+        std::uint64_t value = 0;
+        for (int shift = 0; shift < 64; shift += 7) {
+            unsigned char byte = static_cast<unsigned char>(take(1)[0]);
+            value |= static_cast<std::uint64_t>(byte & 0x7F) << shift;
+            if ((byte & 0x80) == 0) {
+                return value;
+            }
+        }
+        throw std::invalid_argument("invalid snapshot: varint too long");
+    }
+
+    int integer()
+    {
+        std::uint64_t value = varint();
+        if (value > 0x7FFFFFFF) {
+            throw std::invalid_argument("invalid snapshot: integer out of range");
+        }
+        return static_cast<int>(value);
+    }
+
+    std::string string()
+    {
+        std::uint64_t size = varint();
+        if (size > data_.size() - pos_) {
+            throw std::invalid_argument("invalid snapshot: truncated");
+        }
+        return std::string(take(static_cast<std::size_t>(size)), static_cast<std::size_t>(size));
+    }
+
+    bool flag()
+    {
+        return take(1)[0] != 0;
+    }
+
+    const char* take(std::size_t n)
+    {
+        if (n > data_.size() - pos_) {
+            throw std::invalid_argument("invalid snapshot: truncated");
+        }
+        const char* p = data_.data() + pos_;
+        pos_ += n;
+        return p;
+    }
+
+    bool done() const
+    {
+        return pos_ == data_.size();
+    }
+
+private:
+    const std::string& data_;
+    std::size_t pos_ = 0;
+};
+
+} // namespace
+
 void VocaSession::setWords(std::vector<std::pair<std::string, std::string>> words)
 {
     words_ = std::move(words);
 }
 
+void VocaSession::setRepository(const VocaRepository& repository)
+{
+    words_ = repository.data();
+}
+
 void VocaSession::start()
 {
     std::vector<int> indices;
@@ -36,32 +134,29 @@ void VocaSession::start(const std::vector<int>& indices)
     total_ = static_cast<int>(main_queue_.size());
 }
 
-std::string VocaSession::getPromptJson()
+std::optional<SessionPrompt> VocaSession::prompt()
 {
     if (!ensureCurrent_()) {
-        return summaryJson();
+        return std::nullopt;
     }
 
     int wrong_count = result_.wrongCount(current_.word, current_.correct);
-    std::string hint = wrong_count > 0 ? makeHint_(current_.correct, wrong_count) : "";
-    int attempt = wrong_count + 1;
 
-    std::ostringstream out;
-    out << "{"
-        << "\"question_id\":\"" << escapeJson_(current_.question_id) << "\","
-        << "\"question_text\":\"" << escapeJson_(current_.word) << "\","
-        << "\"direction\":\"en_to_kr\","
-        << "\"hint\":\"" << escapeJson_(hint) << "\","
-        << "\"attempt\":" << attempt << ","
-        << "\"progress\":{\"done\":" << result_.score() << ",\"total\":" << total_ << "}"
-        << "}";
-    return out.str();
+    SessionPrompt out;
+    out.question_id = current_.question_id;
+    out.question_text = current_.word;
+    if (wrong_count > 0) {
+        out.hint = hint_(current_.correct, wrong_count);
+    }
+    out.attempt = wrong_count + 1;
+    out.progress = {result_.score(), total_};
+    return out;
 }
 
-std::string VocaSession::submitAnswer(const std::string& answer)
+SessionFeedback VocaSession::submit(const std::string& answer)
 {
     if (!ensureCurrent_()) {
-        return "{\"is_correct\":true,\"correct_answer\":\"\",\"next_action\":\"show_summary\",\"hint_level\":0}";
+        return {};
     }
 
     bool correct = engine_.isCorrect(answer, current_.correct);
@@ -75,19 +170,11 @@ std::string VocaSession::submitAnswer(const std::string& answer)
         }
 
         int next_count = result_.wrongCount(current_.word, current_.correct);
-        int hint_level = next_count >= 4 ? 4 : next_count;
 
         retry_queue_.push_front({current_.word, current_.correct});
         has_current_ = false;
 
-        std::ostringstream out;
-        out << "{"
-            << "\"is_correct\":false,"
-            << "\"correct_answer\":\"" << escapeJson_(current_.correct) << "\","
-            << "\"next_action\":\"retry_same\","
-            << "\"hint_level\":" << hint_level
-            << "}";
-        return out.str();
+        return {false, current_.correct, "retry_same", next_count >= 4 ? 4 : next_count};
     }
 
     if (!current_.from_retry) {
@@ -100,23 +187,57 @@ std::string VocaSession::submitAnswer(const std::string& answer)
         ? "show_summary"
         : "next_question";
 
+    return {true, current_.correct, next_action, wrong_count};
+}
+
+SessionSummary VocaSession::summary() const
+{
+    return {result_.score(), total_, static_cast<int>(result_.wrongList().size())};
+}
+
+std::string VocaSession::getPromptJson()
+{
+    std::optional<SessionPrompt> prompt_data = prompt();
+    if (!prompt_data) {
+        return summaryJson();
+    }
+
+    const SessionPrompt& p = *prompt_data;
+    std::ostringstream out;
+    out << "{"
+        << "\"question_id\":\"" << escapeJson_(p.question_id) << "\","
+        << "\"question_text\":\"" << escapeJson_(p.question_text) << "\","
+        << "\"direction\":\"" << p.direction << "\","
+        << "\"hint\":\"" << escapeJson_(p.hint) << "\","
+        << "\"attempt\":" << p.attempt << ","
+        << "\"progress\":{\"done\":" << p.progress.done << ",\"total\":" << p.progress.total << "}"
+        << "}";
+    return out.str();
+}
+
+std::string VocaSession::submitAnswer(const std::string& answer)
+{
+    SessionFeedback f = submit(answer);
+
     std::ostringstream out;
     out << "{"
-        << "\"is_correct\":true,"
-        << "\"correct_answer\":\"" << escapeJson_(current_.correct) << "\","
-        << "\"next_action\":\"" << next_action << "\","
-        << "\"hint_level\":" << wrong_count
+        << "\"is_correct\":" << (f.is_correct ? "true" : "false") << ","
+        << "\"correct_answer\":\"" << escapeJson_(f.correct_answer) << "\","
+        << "\"next_action\":\"" << f.next_action << "\","
+        << "\"hint_level\":" << f.hint_level
         << "}";
     return out.str();
 }
 
 std::string VocaSession::summaryJson() const
 {
+    SessionSummary s = summary();
+
     std::ostringstream out;
     out << "{"
-        << "\"score\":" << result_.score() << ","
-        << "\"total\":" << total_ << ","
-        << "\"wrong_count\":" << static_cast<int>(result_.wrongList().size())
+        << "\"score\":" << s.score << ","
+        << "\"total\":" << s.total << ","
+        << "\"wrong_count\":" << s.wrong_count
         << "}";
     return out.str();
 }
@@ -135,6 +256,113 @@ bool VocaSession::isFinished() const
     return !has_current_ && main_queue_.empty() && retry_queue_.empty();
 }
 
+std::string VocaSession::snapshot() const
+{
+    std::string out(kSnapshotMagic, sizeof(kSnapshotMagic));
+
+    putVarint(out, words_.size());
+    for (const auto& item : words_) {
+        putString(out, item.first);
+        putString(out, item.second);
+    }
+
+    putVarint(out, main_queue_.size());
+    for (int idx : main_queue_) {
+        putVarint(out, static_cast<std::uint64_t>(idx));
+    }
+
+    putVarint(out, retry_queue_.size());
+    for (const auto& item : retry_queue_) {
+        putString(out, item.word);
+        putString(out, item.correct);
+    }
+
+    putVarint(out, static_cast<std::uint64_t>(result_.score()));
+    putVarint(out, static_cast<std::uint64_t>(result_.total()));
+    putVarint(out, result_.wrongList().size());
+    for (const auto& item : result_.wrongList()) {
+        putString(out, item.word);
+        putString(out, item.correct);
+        putVarint(out, static_cast<std::uint64_t>(item.wrong_count));
+    }
+
+    putVarint(out, static_cast<std::uint64_t>(total_));
+
+    out.push_back(has_current_ ? 1 : 0);
+    if (has_current_) {
+        putString(out, current_.word);
+        putString(out, current_.correct);
+        putString(out, current_.question_id);
+        out.push_back(current_.from_retry ? 1 : 0);
+    }
+
+    return out;
+}
+
+VocaSession VocaSession::restore(const std::string& data)
+{
+    SnapshotReader in(data);
+    if (std::string(in.take(sizeof(kSnapshotMagic)), sizeof(kSnapshotMagic))
+        != std::string(kSnapshotMagic, sizeof(kSnapshotMagic))) {
+        throw std::invalid_argument("invalid snapshot: bad header");
+    }
+
+    VocaSession session;
+
+    std::uint64_t word_count = in.varint();
+    for (std::uint64_t i = 0; i < word_count; ++i) {
+        std::string word = in.string();
+        std::string meaning = in.string();
+        session.words_.emplace_back(std::move(word), std::move(meaning));
+    }
+
+    std::uint64_t main_count = in.varint();
+    for (std::uint64_t i = 0; i < main_count; ++i) {
+        int idx = in.integer();
+        if (static_cast<std::size_t>(idx) >= session.words_.size()) {
+            throw std::invalid_argument("invalid snapshot: word index out of range");
+        }
+        session.main_queue_.push_back(idx);
+    }
+
+    std::uint64_t retry_count = in.varint();
+    for (std::uint64_t i = 0; i < retry_count; ++i) {
+        WrongVoca item;
+        item.word = in.string();
+        item.correct = in.string();
+        session.retry_queue_.push_back(std::move(item));
+    }
+
+    int correct = in.integer();
+    int total = in.integer();
+    std::vector<WrongVoca> wrong;
+    std::uint64_t wrong_count = in.varint();
+    for (std::uint64_t i = 0; i < wrong_count; ++i) {
+        WrongVoca item;
+        item.word = in.string();
+        item.correct = in.string();
+        item.wrong_count = in.integer();
+        wrong.push_back(std::move(item));
+    }
+    session.result_.restore(correct, total, std::move(wrong));
+
+    session.total_ = in.integer();
+
+    session.has_current_ = in.flag();
+    if (session.has_current_) {
+        session.current_.word = in.string();
+        session.current_.correct = in.string();
+        session.current_.question_id = in.string();
+        session.current_.from_retry = in.flag();
+    }
+
+    if (!in.done()) {
+        throw std::invalid_argument("invalid snapshot: trailing data");
+    }
+
+    return session;
+}
+
 bool VocaSession::ensureCurrent_()
 {
     if (has_current_) {
@@ -163,7 +391,16 @@ bool VocaSession::ensureCurrent_()
     return false;
 }
 
-std::string VocaSession::makeHint_(const std::string& correct, int wrong_count) const
+const std::string& VocaSession::hint_(const std::string& correct, int wrong_count)
+{
+    auto it = hint_ladders_.find(correct);
+    if (it == hint_ladders_.end()) {
+        it = hint_ladders_.emplace(correct, buildHintLadder_(correct)).first;
+    }
+    return it->second[static_cast<std::size_t>(std::min(wrong_count, 4) - 1)];
+}
+
+VocaSession::HintLadder VocaSession::buildHintLadder_(const std::string& correct)
 {
     std::string hint = correct;
     if (hint.size() >= 2 && hint.front() == '"' && hint.back() == '"') {
@@ -210,27 +447,22 @@ std::string VocaSession::makeHint_(const std::string& correct, int wrong_count)
     const auto units = splitUtf8(compact);
     std::size_t len = units.size();
     if (len == 0) {
-        return "Hint: (no letters)";
+        const std::string none = "Hint: (no letters)";
+        return {none, none, none, none};
     }
 
-    if (wrong_count == 1) {
-        return "Hint: " + std::string(len, '_') + " (" + std::to_string(len) + " 글자)";
+    std::size_t reveal = std::min<std::size_t>(2, len - 1);
+    std::string prefix;
+    for (std::size_t i = 0; i < reveal; ++i) {
+        prefix += units[i];
     }
 
-    if (wrong_count == 2) {
-        return "Hint: " + units[0] + std::string(len - 1, '_');
-    }
-
-    if (wrong_count == 3) {
-        std::size_t reveal = std::min<std::size_t>(2, len > 0 ? len - 1 : 0);
-        std::string prefix;
-        for (std::size_t i = 0; i < reveal; ++i) {
-            prefix += units[i];
-        }
-        return "Hint: " + prefix + std::string(len - reveal, '_');
-    }
-
-    return "Hint: " + hint + " (type it again)";
+    return {
+        "Hint: " + std::string(len, '_') + " (" + std::to_string(len) + " 글자)",
+        "Hint: " + units[0] + std::string(len - 1, '_'),
+        "Hint: " + prefix + std::string(len - reveal, '_'),
+        "Hint: " + hint + " (type it again)",
+    };
 }
 
 std::string VocaSession::escapeJson_(const std::string& s)
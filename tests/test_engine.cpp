@@ -10,6 +10,30 @@ int main()
     assert(engine.isCorrect("a,b", "b,a"));
     assert(engine.isCorrect(" dog ", "\"dog\""));
     assert(!engine.isCorrect("cat", "dog"));
+    assert(engine.isCorrect("ESCAPE", "escape"));
+    assert(engine.isCorrect("'탈출 하다'", "탈출하다, 도망가다"));
+    assert(engine.isCorrect("도망가다,", "탈출하다,도망가다"));
+    assert(!engine.isCorrect("탈출", "탈출하다"));
+    assert(!engine.isCorrect("나,가", "가"));
+    assert(!engine.isCorrect("탈출하다,버리다", "탈출하다,도망가다"));
+    assert(!engine.isCorrect("", "apple,"));
+    assert(engine.isCorrect("", ""));
+
+    // Unicode spaces and case, as Python's re \s and str.lower()
+    assert(engine.isCorrect("탈출\u00A0하다", "탈출하다"));
+    assert(engine.isCorrect("탈출\u3000하다", "탈출하다"));
+    assert(engine.isCorrect("\x1C dog", "dog"));
+    assert(engine.isCorrect("ÉCOLE", "école"));
+    assert(engine.isCorrect("ΟΔΟΣ", "οδος"));
+    assert(engine.isCorrect("İ", "i\u0307"));
+    assert(!engine.isCorrect("STRASSE", "straße"));
+
+    auto graded = engine.gradeMany({{"apple", "apple"}, {"cat", "dog"}, {"b,a", "a,b"}});
+    assert(graded.size() == 3);
+    assert(graded[0] == 1);
+    assert(graded[1] == 0);
+    assert(graded[2] == 1);
+    assert(engine.gradeMany({}).empty());
 
     std::cout << "test_engine passed\n";
     return 0;
@@ -2,6 +2,7 @@
 
 #include <cassert>
 #include <iostream>
+#include <stdexcept>
 
 int main()
 {
@@ -33,6 +34,51 @@ int main()
     assert(summary.find("\"score\":1") != std::string::npos);
     assert(summary.find("\"total\":2") != std::string::npos);
 
+    // Native results carry the same data as the JSON strings
+    voca::VocaSession native;
+    native.setWords({{"apple", "사과"}, {"banana", "바나나"}});
+    native.start();
+    assert(native.prompt()->question_text == "apple");
+    voca::SessionFeedback wrong = native.submit("wrong");
+    assert(!wrong.is_correct);
+    assert(wrong.next_action == "retry_same");
+    assert(wrong.hint_level == 1);
+    std::optional<voca::SessionPrompt> retry = native.prompt();
+    assert(retry->attempt == 2);
+    assert(retry->hint == "Hint: __ (2 글자)");
+    assert(native.submit("사과").is_correct);
+    assert(native.prompt()->progress.total == 2);
+    assert(native.submit("바나나").next_action == "show_summary");
+    assert(!native.prompt().has_value());
+    assert(native.summary().score == 1);
+    assert(native.summary().total == 2);
+    assert(native.summary().wrong_count == 1);
+    assert(native.submit("anything").next_action == "show_summary");
+
+    // Snapshot mid-retry and resume in a fresh session
+    voca::VocaSession original;
+    original.setWords({{"apple", "사과"}, {"banana", "바나나"}, {"cherry", "체리"}});
+    original.start();
+    original.getPromptJson();
+    original.submitAnswer("wrong");
+    std::string retry_prompt = original.getPromptJson();
+
+    voca::VocaSession restored = voca::VocaSession::restore(original.snapshot());
+    assert(restored.snapshot() == original.snapshot());
+    assert(restored.getPromptJson() == retry_prompt);
+    assert(restored.submitAnswer("사과") == original.submitAnswer("사과"));
+    assert(restored.getPromptJson() == original.getPromptJson());
+    assert(restored.summaryJson() == original.summaryJson());
+    assert(restored.exportWrongCSV() == original.exportWrongCSV());
+
+    bool rejected = false;
+    try {
+        voca::VocaSession::restore("VSS");
+    } catch (const std::invalid_argument&) {
+        rejected = true;
+    }
+    assert(rejected);
+
     std::cout << "test_session passed\n";
     return 0;
 }